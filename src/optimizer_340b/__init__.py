@@ -5,7 +5,7 @@ by calculating Net Realizable Revenue.
 """
 
 from optimizer_340b.config import Settings
-from optimizer_340b.models import DosingProfile, Drug, MarginAnalysis
+from optimizer_340b.models import DosingProfile, Drug, DrugCatalog, MarginAnalysis
 
 __version__ = "0.1.0"
-__all__ = ["Settings", "Drug", "MarginAnalysis", "DosingProfile"]
+__all__ = ["Settings", "Drug", "DrugCatalog", "MarginAnalysis", "DosingProfile"]
@@ -22,20 +22,30 @@ from optimizer_340b.compute.margins import (
     analyze_drug_margin,
     analyze_drug_with_payer,
     calculate_commercial_margin,
+    calculate_commercial_margin_fast,
     calculate_margin_sensitivity,
     calculate_medicare_margin,
+    calculate_medicare_margin_fast,
     calculate_retail_margin,
+    calculate_retail_margin_fast,
     determine_recommendation,
 )
+from optimizer_340b.compute.margins_batch import analyze_drugs_vectorized
+from optimizer_340b.compute.margins_pl import compute_margins_lazy
 
 __all__ = [
     # Margin calculation
     "calculate_retail_margin",
+    "calculate_retail_margin_fast",
     "calculate_medicare_margin",
+    "calculate_medicare_margin_fast",
     "calculate_commercial_margin",
+    "calculate_commercial_margin_fast",
     "determine_recommendation",
     "analyze_drug_margin",
     "analyze_drug_with_payer",
+    "analyze_drugs_vectorized",
+    "compute_margins_lazy",
     "calculate_margin_sensitivity",
     # Constants
     "AWP_DISCOUNT_FACTOR",
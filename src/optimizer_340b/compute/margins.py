@@ -30,6 +30,69 @@ DEFAULT_DISPENSE_FEE = Decimal("0")  # Default dispense fee for Medicaid pharmac
 DEFAULT_MEDICAID_MARKUP = Decimal("0")  # Default markup % for Medicaid pharmacy
 
 
+# ============================================================================
+# FAST SCALAR KERNELS (float path)
+# ============================================================================
+# Float mirrors of the Decimal formulas above, with the pricing constants
+# written as literals so CPython folds them into the bytecode as immediate
+# operands. These skip Decimal dispatch entirely; use them in bulk loops
+# where penny-exact Decimal output is not required.
+
+
+def calculate_retail_margin_fast(
+    awp: float,
+    contract_cost: float,
+    capture_rate: float = 1.0,
+) -> float:
+    """Float fast path for the retail net margin.
+
+    Args:
+        awp: Average Wholesale Price per package.
+        contract_cost: 340B acquisition cost per package.
+        capture_rate: Expected capture rate (0.0-1.0).
+
+    Returns:
+        Net retail margin as a float.
+    """
+    return (awp * 0.85 - contract_cost) * capture_rate
+
+
+def calculate_medicare_margin_fast(
+    asp: float,
+    contract_cost: float,
+    bill_units: int,
+) -> float:
+    """Float fast path for the Medicare Part B medical margin.
+
+    Args:
+        asp: Average Sales Price per billing unit.
+        contract_cost: 340B acquisition cost per package.
+        bill_units: HCPCS billing units per package.
+
+    Returns:
+        Medicare margin as a float.
+    """
+    return asp * 1.06 * bill_units - contract_cost
+
+
+def calculate_commercial_margin_fast(
+    asp: float,
+    contract_cost: float,
+    bill_units: int,
+) -> float:
+    """Float fast path for the Commercial medical margin.
+
+    Args:
+        asp: Average Sales Price per billing unit.
+        contract_cost: 340B acquisition cost per package.
+        bill_units: HCPCS billing units per package.
+
+    Returns:
+        Commercial margin as a float.
+    """
+    return asp * 1.15 * bill_units - contract_cost
+
+
 def calculate_retail_margin(
     drug: Drug,
     capture_rate: Decimal = DEFAULT_CAPTURE_RATE,
@@ -57,9 +120,15 @@ def calculate_retail_margin(
     net_margin = gross_margin * capture_rate
 
     logger.debug(
-        f"Retail margin for {drug.ndc}: "
-        f"AWP=${drug.awp} × {AWP_DISCOUNT_FACTOR} - ${drug.contract_cost} = "
-        f"${gross_margin} gross, ${net_margin} net @ {capture_rate:.0%} capture"
+        "Retail margin for %s: AWP=$%s × %s - $%s = $%s gross, $%s net "
+        "@ %.0f%% capture",
+        drug.ndc,
+        drug.awp,
+        AWP_DISCOUNT_FACTOR,
+        drug.contract_cost,
+        gross_margin,
+        net_margin,
+        capture_rate * 100,
     )
 
     return gross_margin, net_margin
@@ -83,7 +152,7 @@ def calculate_medicare_margin(drug: Drug) -> Decimal | None:
         Medicare margin, or None if drug has no medical path.
     """
     if not drug.has_medical_path():
-        logger.debug(f"Drug {drug.ndc} has no medical path (no ASP/HCPCS)")
+        logger.debug("Drug %s has no medical path (no ASP/HCPCS)", drug.ndc)
         return None
 
     # Type narrowing: has_medical_path() guarantees asp is not None
@@ -96,9 +165,13 @@ def calculate_medicare_margin(drug: Drug) -> Decimal | None:
     margin = revenue - drug.contract_cost
 
     logger.debug(
-        f"Medicare margin for {drug.ndc}: "
-        f"ASP=${drug.asp} × {MEDICARE_ASP_MULTIPLIER} × {drug.bill_units_per_package} "
-        f"- ${drug.contract_cost} = ${margin}"
+        "Medicare margin for %s: ASP=$%s × %s × %s - $%s = $%s",
+        drug.ndc,
+        drug.asp,
+        MEDICARE_ASP_MULTIPLIER,
+        drug.bill_units_per_package,
+        drug.contract_cost,
+        margin,
     )
 
     return margin
@@ -122,7 +195,7 @@ def calculate_commercial_margin(drug: Drug) -> Decimal | None:
         Commercial margin, or None if drug has no medical path.
     """
     if not drug.has_medical_path():
-        logger.debug(f"Drug {drug.ndc} has no medical path (no ASP/HCPCS)")
+        logger.debug("Drug %s has no medical path (no ASP/HCPCS)", drug.ndc)
         return None
 
     # Type narrowing: has_medical_path() guarantees asp is not None
@@ -135,9 +208,13 @@ def calculate_commercial_margin(drug: Drug) -> Decimal | None:
     margin = revenue - drug.contract_cost
 
     logger.debug(
-        f"Commercial margin for {drug.ndc}: "
-        f"ASP=${drug.asp} × {COMMERCIAL_ASP_MULTIPLIER} "
-        f"× {drug.bill_units_per_package} - ${drug.contract_cost} = ${margin}"
+        "Commercial margin for %s: ASP=$%s × %s × %s - $%s = $%s",
+        drug.ndc,
+        drug.asp,
+        COMMERCIAL_ASP_MULTIPLIER,
+        drug.bill_units_per_package,
+        drug.contract_cost,
+        margin,
     )
 
     return margin
@@ -170,7 +247,7 @@ def calculate_pharmacy_medicaid_margin(
         Pharmacy Medicaid margin, or None if no NADAC price.
     """
     if drug.nadac_price is None:
-        logger.debug(f"Drug {drug.ndc} has no NADAC price for Medicaid pharmacy")
+        logger.debug("Drug %s has no NADAC price for Medicaid pharmacy", drug.ndc)
         return None
 
     # Revenue = (NADAC + dispense fee) * (1 + markup)
@@ -181,9 +258,15 @@ def calculate_pharmacy_medicaid_margin(
     margin = (revenue * capture_rate) - drug.contract_cost
 
     logger.debug(
-        f"Pharmacy Medicaid margin for {drug.ndc}: "
-        f"(NADAC=${drug.nadac_price} + ${dispense_fee}) × (1 + {markup_pct:.0%}) "
-        f"× {capture_rate:.0%} - ${drug.contract_cost} = ${margin}"
+        "Pharmacy Medicaid margin for %s: (NADAC=$%s + $%s) × (1 + %.0f%%) "
+        "× %.0f%% - $%s = $%s",
+        drug.ndc,
+        drug.nadac_price,
+        dispense_fee,
+        markup_pct * 100,
+        capture_rate * 100,
+        drug.contract_cost,
+        margin,
     )
 
     return margin
@@ -216,9 +299,14 @@ def calculate_pharmacy_medicare_commercial_margin(
     margin = (revenue * capture_rate) - drug.contract_cost
 
     logger.debug(
-        f"Pharmacy Medicare/Commercial margin for {drug.ndc}: "
-        f"AWP=${drug.awp} × {awp_factor} × {capture_rate:.0%} "
-        f"- ${drug.contract_cost} = ${margin}"
+        "Pharmacy Medicare/Commercial margin for %s: AWP=$%s × %s × %.0f%% "
+        "- $%s = $%s",
+        drug.ndc,
+        drug.awp,
+        awp_factor,
+        capture_rate * 100,
+        drug.contract_cost,
+        margin,
     )
 
     return margin
@@ -238,7 +326,7 @@ def calculate_medical_medicaid_margin(drug: Drug) -> Decimal | None:
         Medical Medicaid margin, or None if no medical path.
     """
     if not drug.has_medical_path():
-        logger.debug(f"Drug {drug.ndc} has no medical path (no ASP/HCPCS)")
+        logger.debug("Drug %s has no medical path (no ASP/HCPCS)", drug.ndc)
         return None
 
     assert drug.asp is not None
@@ -250,9 +338,13 @@ def calculate_medical_medicaid_margin(drug: Drug) -> Decimal | None:
     margin = revenue - drug.contract_cost
 
     logger.debug(
-        f"Medical Medicaid margin for {drug.ndc}: "
-        f"ASP=${drug.asp} × {MEDICAID_ASP_MULTIPLIER} × {drug.bill_units_per_package} "
-        f"- ${drug.contract_cost} = ${margin}"
+        "Medical Medicaid margin for %s: ASP=$%s × %s × %s - $%s = $%s",
+        drug.ndc,
+        drug.asp,
+        MEDICAID_ASP_MULTIPLIER,
+        drug.bill_units_per_package,
+        drug.contract_cost,
+        margin,
     )
 
     return margin
@@ -272,7 +364,7 @@ def calculate_medical_medicare_margin(drug: Drug) -> Decimal | None:
         Medical Medicare margin, or None if no medical path.
     """
     if not drug.has_medical_path():
-        logger.debug(f"Drug {drug.ndc} has no medical path (no ASP/HCPCS)")
+        logger.debug("Drug %s has no medical path (no ASP/HCPCS)", drug.ndc)
         return None
 
     assert drug.asp is not None
@@ -284,9 +376,13 @@ def calculate_medical_medicare_margin(drug: Drug) -> Decimal | None:
     margin = revenue - drug.contract_cost
 
     logger.debug(
-        f"Medical Medicare margin for {drug.ndc}: "
-        f"ASP=${drug.asp} × {MEDICARE_ASP_MULTIPLIER} × {drug.bill_units_per_package} "
-        f"- ${drug.contract_cost} = ${margin}"
+        "Medical Medicare margin for %s: ASP=$%s × %s × %s - $%s = $%s",
+        drug.ndc,
+        drug.asp,
+        MEDICARE_ASP_MULTIPLIER,
+        drug.bill_units_per_package,
+        drug.contract_cost,
+        margin,
     )
 
     return margin
@@ -310,7 +406,7 @@ def calculate_medical_commercial_margin(
         Medical Commercial margin, or None if no medical path.
     """
     if not drug.has_medical_path():
-        logger.debug(f"Drug {drug.ndc} has no medical path (no ASP/HCPCS)")
+        logger.debug("Drug %s has no medical path (no ASP/HCPCS)", drug.ndc)
         return None
 
     assert drug.asp is not None
@@ -322,9 +418,13 @@ def calculate_medical_commercial_margin(
     margin = revenue - drug.contract_cost
 
     logger.debug(
-        f"Medical Commercial margin for {drug.ndc}: "
-        f"ASP=${drug.asp} × {asp_multiplier} × {drug.bill_units_per_package} "
-        f"- ${drug.contract_cost} = ${margin}"
+        "Medical Commercial margin for %s: ASP=$%s × %s × %s - $%s = $%s",
+        drug.ndc,
+        drug.asp,
+        asp_multiplier,
+        drug.bill_units_per_package,
+        drug.contract_cost,
+        margin,
     )
 
     return margin
@@ -432,32 +532,39 @@ def determine_recommendation(
         Tuple of (recommended_path, margin_delta).
         margin_delta is the difference between best and second-best option.
     """
-    # Build list of (path, margin) for available options
-    options: list[tuple[RecommendedPath, Decimal]] = [
-        (RecommendedPath.RETAIL, retail_net),
-    ]
+    # With at most three options, straight-line comparisons beat building
+    # and sorting a list (no allocations, no lambda key). Ties keep the
+    # earlier pathway, matching the stable descending sort this replaces.
+    best_path = RecommendedPath.RETAIL
+    best_margin = retail_net
+    second_margin: Decimal | None = None
 
     if medicare is not None:
-        options.append((RecommendedPath.MEDICARE_MEDICAL, medicare))
+        if medicare > best_margin:
+            second_margin = best_margin
+            best_margin = medicare
+            best_path = RecommendedPath.MEDICARE_MEDICAL
+        else:
+            second_margin = medicare
 
     if commercial is not None:
-        options.append((RecommendedPath.COMMERCIAL_MEDICAL, commercial))
-
-    # Sort by margin descending
-    options.sort(key=lambda x: x[1], reverse=True)
-
-    best_path, best_margin = options[0]
-
-    # Calculate delta (difference from second best, or just the margin if only one)
-    if len(options) > 1:
-        second_margin = options[1][1]
-        delta = best_margin - second_margin
-    else:
-        delta = best_margin
+        if commercial > best_margin:
+            second_margin = best_margin
+            best_margin = commercial
+            best_path = RecommendedPath.COMMERCIAL_MEDICAL
+        elif second_margin is None or commercial > second_margin:
+            second_margin = commercial
+
+    # Delta is the difference from second best, or just the margin if only one
+    delta = (
+        best_margin - second_margin if second_margin is not None else best_margin
+    )
 
     logger.debug(
-        f"Recommendation: {best_path.value} with margin ${best_margin}, "
-        f"delta ${delta} over next best"
+        "Recommendation: %s with margin $%s, delta $%s over next best",
+        best_path.value,
+        best_margin,
+        delta,
     )
 
     return best_path, delta
@@ -500,8 +607,11 @@ def analyze_drug_margin(
     )
 
     logger.info(
-        f"Analyzed {drug.drug_name} ({drug.ndc}): "
-        f"Recommend {recommended_path.value}, delta=${margin_delta:.2f}"
+        "Analyzed %s (%s): Recommend %s, delta=$%.2f",
+        drug.drug_name,
+        drug.ndc,
+        recommended_path.value,
+        margin_delta,
     )
 
     return analysis
@@ -526,30 +636,31 @@ def analyze_drug_with_payer(
     """
     retail_gross, retail_net = calculate_retail_margin(drug, capture_rate)
 
+    # Calculate each medical margin once and reuse below
+    medicare = calculate_medicare_margin(drug)
+    commercial = calculate_commercial_margin(drug)
+
     if payer_type.lower() == "medicare":
-        medical_margin = calculate_medicare_margin(drug)
-        if medical_margin is not None and medical_margin > retail_net:
-            recommended = RecommendedPath.MEDICARE_MEDICAL
-            delta = medical_margin - retail_net
-        else:
-            recommended = RecommendedPath.RETAIL
-            delta = retail_net - (medical_margin or Decimal("0"))
+        medical_margin = medicare
+        medical_path = RecommendedPath.MEDICARE_MEDICAL
     else:  # commercial
-        medical_margin = calculate_commercial_margin(drug)
-        if medical_margin is not None and medical_margin > retail_net:
-            recommended = RecommendedPath.COMMERCIAL_MEDICAL
-            delta = medical_margin - retail_net
-        else:
-            recommended = RecommendedPath.RETAIL
-            delta = retail_net - (medical_margin or Decimal("0"))
+        medical_margin = commercial
+        medical_path = RecommendedPath.COMMERCIAL_MEDICAL
+
+    if medical_margin is not None and medical_margin > retail_net:
+        recommended = medical_path
+        delta = medical_margin - retail_net
+    else:
+        recommended = RecommendedPath.RETAIL
+        delta = retail_net - (medical_margin or Decimal("0"))
 
     return MarginAnalysis(
         drug=drug,
         retail_gross_margin=retail_gross,
         retail_net_margin=retail_net,
         retail_capture_rate=capture_rate,
-        medicare_margin=calculate_medicare_margin(drug),
-        commercial_margin=calculate_commercial_margin(drug),
+        medicare_margin=medicare,
+        commercial_margin=commercial,
         recommended_path=recommended,
         margin_delta=abs(delta),
     )
@@ -582,22 +693,47 @@ def calculate_margin_sensitivity(
             Decimal("1.00"),
         ]
 
-    results = []
+    # Medical margins and the retail gross are invariant across capture
+    # rates; only the retail net varies (linearly). Compute the invariants
+    # once and scale per rate instead of re-running the full analysis.
     medicare = calculate_medicare_margin(drug)
     commercial = calculate_commercial_margin(drug)
+    gross_margin, _ = calculate_retail_margin(drug)
+
+    medicare_display = medicare or Decimal("0")
+    commercial_display = commercial or Decimal("0")
 
+    # Best medical option is also rate-invariant; per rate it only has to
+    # be compared against the scaled retail net. Ties prefer the earlier
+    # pathway, matching determine_recommendation().
+    best_medical_path: RecommendedPath | None = None
+    best_medical: Decimal | None = None
+    if medicare is not None:
+        best_medical_path = RecommendedPath.MEDICARE_MEDICAL
+        best_medical = medicare
+    if commercial is not None and (
+        best_medical is None or commercial > best_medical
+    ):
+        best_medical_path = RecommendedPath.COMMERCIAL_MEDICAL
+        best_medical = commercial
+
+    results: list[dict[str, Decimal | str]] = []
     for rate in capture_rates:
-        _, retail_net = calculate_retail_margin(drug, rate)
+        retail_net = gross_margin * rate
 
-        # Determine best path at this capture rate
-        best_path, _ = determine_recommendation(retail_net, medicare, commercial)
+        if best_medical is not None and best_medical > retail_net:
+            # Type narrowing: best_medical implies best_medical_path
+            assert best_medical_path is not None
+            recommended = best_medical_path
+        else:
+            recommended = RecommendedPath.RETAIL
 
         results.append({
             "capture_rate": rate,
             "retail_net": retail_net,
-            "medicare": medicare or Decimal("0"),
-            "commercial": commercial or Decimal("0"),
-            "recommended": best_path.value,
+            "medicare": medicare_display,
+            "commercial": commercial_display,
+            "recommended": recommended.value,
         })
 
     return results
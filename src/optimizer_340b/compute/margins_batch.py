@@ -0,0 +1,127 @@
+"""Vectorized batch margin engine for catalog-wide analysis (Gold Layer).
+
+The per-drug functions in :mod:`optimizer_340b.compute.margins` use ``Decimal``
+arithmetic so that the Gatekeeper Tests match to the penny. That precision is
+required for single-drug UI display, but catalog-wide analysis spends most of
+its time in Python-level ``Decimal`` dispatch. This module provides a batch
+path that converts pricing fields to ``float64`` NumPy arrays once and
+computes all pathway margins as vector operations.
+
+Use ``analyze_drugs_vectorized()`` for bulk scans (dashboards, opportunity
+ranking); keep the ``Decimal`` functions for single-row display where
+penny-exact output matters.
+"""
+
+import logging
+
+import numpy as np
+
+from optimizer_340b.models import Drug, DrugCatalog, RecommendedPath
+
+logger = logging.getLogger(__name__)
+
+# Optional fused kernel; the pure-NumPy path below is the fallback
+try:
+    from optimizer_340b.compute.margins_numba import batch_margins
+
+    _HAS_NUMBA_KERNEL = True
+except ImportError:  # pragma: no cover - depends on optional numba install
+    _HAS_NUMBA_KERNEL = False
+
+# Float mirrors of the Decimal constants in margins.py
+AWP_DISCOUNT_FACTOR_F = 0.85
+MEDICARE_ASP_MULTIPLIER_F = 1.06
+COMMERCIAL_ASP_MULTIPLIER_F = 1.15
+
+# Pathway order matches the rows of the stacked margin matrix, so the
+# recommendation index from nanargmax maps directly onto this tuple.
+RECOMMENDED_PATHS: tuple[RecommendedPath, ...] = (
+    RecommendedPath.RETAIL,
+    RecommendedPath.MEDICARE_MEDICAL,
+    RecommendedPath.COMMERCIAL_MEDICAL,
+)
+
+# Structured result layout: one record per input drug.
+MARGIN_DTYPE = np.dtype(
+    [
+        ("ndc", "U16"),
+        ("retail_net", np.float64),
+        ("medicare", np.float64),
+        ("commercial", np.float64),
+        ("recommended", np.int8),
+    ]
+)
+
+
+def analyze_drugs_vectorized(
+    drugs: list[Drug] | DrugCatalog,
+    capture_rate: float = 1.0,
+) -> np.ndarray:
+    """Compute retail/Medicare/commercial margins for all drugs at once.
+
+    Packs the pricing fields into a :class:`DrugCatalog` of contiguous
+    ``float64`` arrays (a list input is converted once), then evaluates the
+    three pathway formulas as NumPy vector operations. Drugs without a
+    medical path (no ASP/HCPCS) get ``NaN`` for the medical margins and are
+    only eligible for the retail recommendation.
+
+    Args:
+        drugs: Drugs to analyze, as a list or a pre-built catalog.
+        capture_rate: Retail capture rate (0.0-1.0) applied to all drugs.
+
+    Returns:
+        Structured array with fields ``ndc``, ``retail_net``, ``medicare``,
+        ``commercial`` (rounded to cents for display), and ``recommended``
+        (index into :data:`RECOMMENDED_PATHS`).
+    """
+    catalog = drugs if isinstance(drugs, DrugCatalog) else DrugCatalog.from_drugs(drugs)
+
+    n = len(catalog)
+    result = np.empty(n, dtype=MARGIN_DTYPE)
+
+    if n == 0:
+        return result
+
+    awp = catalog.awp
+    contract_cost = catalog.contract_cost
+    asp = catalog.asp
+    bill_units = catalog.bill_units
+
+    if _HAS_NUMBA_KERNEL:
+        # Single fused compiled loop over the catalog arrays
+        retail_net, medicare, commercial, recommended = batch_margins(
+            awp, asp, contract_cost, bill_units, capture_rate
+        )
+    else:
+        retail_net = (awp * AWP_DISCOUNT_FACTOR_F - contract_cost) * capture_rate
+        medicare = asp * MEDICARE_ASP_MULTIPLIER_F * bill_units - contract_cost
+        commercial = (
+            asp * COMMERCIAL_ASP_MULTIPLIER_F * bill_units - contract_cost
+        )
+
+        # Retail is always finite, so nanargmax never sees an all-NaN column.
+        stacked = np.stack([retail_net, medicare, commercial])
+        recommended = np.nanargmax(stacked, axis=0).astype(np.int8)
+
+    result["ndc"] = catalog.ndc
+    # Quantize once at the end for display; intermediate math stays full-width.
+    result["retail_net"] = np.round(retail_net, 2)
+    result["medicare"] = np.round(medicare, 2)
+    result["commercial"] = np.round(commercial, 2)
+    result["recommended"] = recommended
+
+    logger.debug("Vectorized margin analysis over %d drugs", n)
+
+    return result
+
+
+def recommended_path_for_row(row: np.void) -> RecommendedPath:
+    """Map a result row's recommendation index back to a pathway enum.
+
+    Args:
+        row: Single record from :func:`analyze_drugs_vectorized` output.
+
+    Returns:
+        The recommended pathway for that drug.
+    """
+    return RECOMMENDED_PATHS[int(row["recommended"])]
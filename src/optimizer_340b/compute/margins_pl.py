@@ -0,0 +1,90 @@
+"""Polars expression pipeline for catalog-scale margin analysis (Gold Layer).
+
+Expresses the per-drug "compute margins, pick best pathway, compute delta"
+logic from :mod:`optimizer_340b.compute.margins` as lazy Polars expressions,
+so catalog-wide runs benefit from predicate/projection pushdown, common
+subexpression elimination, and streaming execution instead of one Python
+call per row. The NumPy batch engine in ``margins_batch`` remains the path
+for array-shaped callers; this module is for DataFrame-shaped pipelines.
+"""
+
+import logging
+
+import polars as pl
+
+from optimizer_340b.models import RecommendedPath
+
+logger = logging.getLogger(__name__)
+
+# Float mirrors of the Decimal constants in margins.py
+AWP_DISCOUNT_FACTOR_F = 0.85
+MEDICARE_ASP_MULTIPLIER_F = 1.06
+COMMERCIAL_ASP_MULTIPLIER_F = 1.15
+
+
+def compute_margins_lazy(
+    lf: pl.LazyFrame,
+    capture_rate: float = 1.0,
+) -> pl.LazyFrame:
+    """Append pathway margins and a recommendation to a catalog LazyFrame.
+
+    Required input columns:
+        - awp: Average Wholesale Price per package.
+        - contract_cost: 340B acquisition cost per package.
+        - asp: Average Sales Price per billing unit (null if no medical path).
+        - bill_units: HCPCS billing units per package.
+
+    Args:
+        lf: Catalog LazyFrame with the columns above.
+        capture_rate: Retail capture rate (0.0-1.0) applied to all rows.
+
+    Returns:
+        LazyFrame with added columns:
+        - retail_net_margin: (AWP x 0.85 - contract cost) x capture rate.
+        - medicare_margin: ASP x 1.06 x bill units - contract cost (or null).
+        - commercial_margin: ASP x 1.15 x bill units - contract cost (or null).
+        - recommended_path: pathway with the highest margin; ties keep the
+          earlier pathway, matching determine_recommendation().
+        - margin_delta: best minus second-best margin (best margin itself
+          when retail is the only option).
+    """
+    retail_net = (
+        pl.col("awp") * AWP_DISCOUNT_FACTOR_F - pl.col("contract_cost")
+    ) * capture_rate
+    medicare = (
+        pl.col("asp") * MEDICARE_ASP_MULTIPLIER_F * pl.col("bill_units")
+        - pl.col("contract_cost")
+    )
+    commercial = (
+        pl.col("asp") * COMMERCIAL_ASP_MULTIPLIER_F * pl.col("bill_units")
+        - pl.col("contract_cost")
+    )
+
+    # Retail is never null, so best is always defined; null medical margins
+    # are ignored by max_horizontal and compare as false in the when chain.
+    best = pl.max_horizontal(retail_net, medicare, commercial)
+    recommended = (
+        pl.when(best == retail_net)
+        .then(pl.lit(RecommendedPath.RETAIL.value))
+        .when(best == medicare)
+        .then(pl.lit(RecommendedPath.MEDICARE_MEDICAL.value))
+        .otherwise(pl.lit(RecommendedPath.COMMERCIAL_MEDICAL.value))
+    )
+
+    # Second-best via a sorted per-row list of available margins; when only
+    # retail exists the delta is the margin itself, as in the scalar path.
+    second = (
+        pl.concat_list(retail_net, medicare, commercial)
+        .list.drop_nulls()
+        .list.sort(descending=True)
+        .list.get(1, null_on_oob=True)
+    )
+    delta = best - second.fill_null(0.0)
+
+    return lf.with_columns(
+        retail_net_margin=retail_net,
+        medicare_margin=medicare,
+        commercial_margin=commercial,
+        recommended_path=recommended,
+        margin_delta=delta,
+    )
@@ -11,6 +11,7 @@ from optimizer_340b.ingest.loaders import (
     load_csv_to_polars,
     load_excel_to_polars,
     load_file_auto,
+    load_ravenswood_workbook,
 )
 from optimizer_340b.ingest.normalizers import (
     build_silver_dataset,
@@ -23,6 +24,7 @@ from optimizer_340b.ingest.normalizers import (
     normalize_crosswalk,
     normalize_ndc,
     normalize_ndc_column,
+    preprocess_cms_bytes,
     preprocess_cms_csv,
 )
 from optimizer_340b.ingest.validators import (
@@ -39,6 +41,7 @@ from optimizer_340b.ingest.validators import (
 __all__ = [
     # Loaders
     "load_excel_to_polars",
+    "load_ravenswood_workbook",
     "load_csv_to_polars",
     "load_file_auto",
     "detect_file_type",
@@ -57,6 +60,7 @@ __all__ = [
     "normalize_catalog",
     "normalize_crosswalk",
     "normalize_asp_pricing",
+    "preprocess_cms_bytes",
     "preprocess_cms_csv",
     "fuzzy_match_drug_name",
     "fuzzy_match_drug_partial",
@@ -22,6 +22,44 @@ NDC_COLUMN_NAMES = {
 }
 
 
+def load_ravenswood_workbook(
+    file: BinaryIO | Path | str,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """Load the Ravenswood Drug Categories and Summary sheets in one pass.
+
+    Uses the calamine engine (Rust XLSX parser), which opens the workbook
+    once for both sheets and returns Utf8 columns directly — no openpyxl
+    DOM parse, no pandas intermediate, and no per-cell astype(str) pass
+    for the Summary sheet.
+
+    Args:
+        file: File path, path string, or file-like object.
+
+    Returns:
+        Tuple of (drug_categories, summary) DataFrames.
+
+    Raises:
+        ValueError: If the workbook cannot be parsed.
+    """
+    if isinstance(file, str):
+        file = Path(file)
+
+    sheets = pl.read_excel(
+        file,
+        sheet_name=["Drug Categories", "Summary"],
+        engine="calamine",
+        infer_schema_length=0,
+    )
+
+    logger.info(
+        "Loaded Ravenswood workbook: %d categories, %d summary rows",
+        sheets["Drug Categories"].height,
+        sheets["Summary"].height,
+    )
+
+    return sheets["Drug Categories"], sheets["Summary"]
+
+
 def load_excel_to_polars(
     file: BinaryIO | Path | str,
     sheet_name: str | int = 0,
@@ -8,6 +8,7 @@ This module handles:
 - NDC-to-HCPCS crosswalk joins
 """
 
+import io
 import logging
 import re
 
@@ -121,9 +122,14 @@ def normalize_ndc_column(
         logger.warning(f"NDC column '{ndc_column}' not found in DataFrame")
         return df
 
+    # Native expression chain (regex strip + zfill + slice) runs as one
+    # Rust kernel over the column instead of a Python UDF per row
     return df.with_columns(
         pl.col(ndc_column)
-        .map_elements(normalize_ndc, return_dtype=pl.String)
+        .cast(pl.Utf8)
+        .str.replace_all(r"[^0-9]", "")
+        .str.zfill(11)
+        .str.slice(-11)
         .alias(output_column)
     )
 
@@ -286,30 +292,32 @@ def normalize_noc_crosswalk(df: pl.DataFrame) -> pl.DataFrame:
     return df
 
 
-def preprocess_cms_csv(
-    file_path: str,
-    skip_rows: int = 8,
-    encoding: str = "latin-1",
+def _read_cms_csv(
+    source: str | bytes,
+    skip_rows: int,
+    encoding: str,
 ) -> pl.DataFrame:
-    """Preprocess CMS CSV files that have header metadata rows.
+    """Shared CMS CSV reader over a file path or an in-memory payload.
 
-    CMS files (ASP pricing, crosswalk) typically have 8 rows of metadata
-    before the actual column headers. NDC columns are read as strings to
-    preserve leading zeros.
+    Runs the header-sniff pass (to read NDC columns as strings), the full
+    read, and the empty-column cleanup; bytes sources are wrapped in a
+    fresh BytesIO per pass.
 
     Args:
-        file_path: Path to the CSV file.
-        skip_rows: Number of header rows to skip.
+        source: File path or raw CSV bytes.
+        skip_rows: Number of header metadata rows to skip.
         encoding: File encoding (CMS uses latin-1).
 
     Returns:
         DataFrame with data starting from actual headers.
     """
-    logger.info(f"Preprocessing CMS CSV, skipping {skip_rows} header rows")
+
+    def reader() -> str | io.BytesIO:
+        return io.BytesIO(source) if isinstance(source, bytes) else source
 
     # First pass: read a small sample to detect column names
     df_sample = pl.read_csv(
-        file_path,
+        reader(),
         encoding=encoding,
         skip_rows=skip_rows,
         n_rows=5,
@@ -325,7 +333,7 @@ def preprocess_cms_csv(
         logger.info(f"Reading '{col}' as string to preserve leading zeros")
 
     df = pl.read_csv(
-        file_path,
+        reader(),
         encoding=encoding,
         skip_rows=skip_rows,
         infer_schema_length=10000,
@@ -344,6 +352,53 @@ def preprocess_cms_csv(
     return df
 
 
+def preprocess_cms_csv(
+    file_path: str,
+    skip_rows: int = 8,
+    encoding: str = "latin-1",
+) -> pl.DataFrame:
+    """Preprocess CMS CSV files that have header metadata rows.
+
+    CMS files (ASP pricing, crosswalk) typically have 8 rows of metadata
+    before the actual column headers. NDC columns are read as strings to
+    preserve leading zeros.
+
+    Args:
+        file_path: Path to the CSV file.
+        skip_rows: Number of header rows to skip.
+        encoding: File encoding (CMS uses latin-1).
+
+    Returns:
+        DataFrame with data starting from actual headers.
+    """
+    logger.info(f"Preprocessing CMS CSV, skipping {skip_rows} header rows")
+
+    return _read_cms_csv(file_path, skip_rows, encoding)
+
+
+def preprocess_cms_bytes(
+    data: bytes,
+    skip_rows: int = 8,
+    encoding: str = "latin-1",
+) -> pl.DataFrame:
+    """Preprocess an in-memory CMS CSV payload.
+
+    Same behavior as preprocess_cms_csv, but reads the uploaded bytes
+    directly — no temp-file round trip to disk.
+
+    Args:
+        data: Raw CSV bytes (e.g. from a Streamlit upload).
+        skip_rows: Number of header rows to skip.
+        encoding: File encoding (CMS uses latin-1).
+
+    Returns:
+        DataFrame with data starting from actual headers.
+    """
+    logger.info(f"Preprocessing in-memory CMS CSV, skipping {skip_rows} header rows")
+
+    return _read_cms_csv(data, skip_rows, encoding)
+
+
 def fuzzy_match_drug_name(
     name: str,
     candidates: list[str],
@@ -1,9 +1,16 @@
 """Data models for 340B Optimizer."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum
 
+import numpy as np
+import polars as pl
+
+# Deletion table for NDC normalization: strips dashes and spaces in one
+# C-level pass instead of chained str.replace allocations
+_NDC_TRANS = str.maketrans("", "", "- ")
+
 
 class RecommendedPath(str, Enum):
     """Recommended site-of-care pathway."""
@@ -21,7 +28,7 @@ class RiskLevel(str, Enum):
     HIGH = "HIGH"
 
 
-@dataclass
+@dataclass(slots=True)
 class Drug:
     """Core drug entity combining catalog and pricing data.
 
@@ -55,6 +62,11 @@ class Drug:
     ira_flag: bool = False
     penny_pricing_flag: bool = False
     nadac_price: Decimal | None = None
+    # Lazily computed cache for ndc_normalized (slots preclude
+    # functools.cached_property)
+    _ndc_normalized: str | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def has_medical_path(self) -> bool:
         """Check if drug can be billed through medical channel.
@@ -68,13 +80,15 @@ class Drug:
     def ndc_normalized(self) -> str:
         """Return 11-digit normalized NDC with leading zeros preserved.
 
-        Removes dashes and pads to 11 digits.
+        Removes dashes and pads to 11 digits. Computed once per drug and
+        cached, since join/dedup/display paths hit this repeatedly.
 
         Returns:
             11-digit NDC string without dashes, with leading zeros.
         """
-        cleaned = self.ndc.replace("-", "").replace(" ", "")
-        return cleaned.zfill(11)[-11:]
+        if self._ndc_normalized is None:
+            self._ndc_normalized = self.ndc.translate(_NDC_TRANS).zfill(11)[-11:]
+        return self._ndc_normalized
 
     @property
     def ndc_formatted(self) -> str:
@@ -89,7 +103,78 @@ class Drug:
         return f"{normalized[:5]}-{normalized[5:9]}-{normalized[9:11]}"
 
 
-@dataclass
+@dataclass(slots=True)
+class DrugCatalog:
+    """Structure-of-arrays view of a drug catalog for batch computation.
+
+    Stores the numeric pricing fields as parallel contiguous ``float64``
+    arrays so catalog-wide margin math runs as NumPy vector ops on
+    cache-friendly buffers instead of chasing one ``Drug`` object per row.
+    The ``Drug`` class remains the entity for single-row UI flows.
+
+    Attributes:
+        ndc: NDC strings, one per drug.
+        awp: Average Wholesale Price per package.
+        asp: Average Sales Price per billing unit (NaN if no medical path).
+        contract_cost: 340B acquisition cost per package.
+        bill_units: HCPCS billing units per package.
+        has_medical_path: Whether each drug has both HCPCS code and ASP.
+    """
+
+    ndc: np.ndarray
+    awp: np.ndarray
+    asp: np.ndarray
+    contract_cost: np.ndarray
+    bill_units: np.ndarray
+    has_medical_path: np.ndarray
+
+    @classmethod
+    def from_drugs(cls, drugs: list[Drug]) -> "DrugCatalog":
+        """Build a catalog from a list of drugs with one allocation per field.
+
+        Args:
+            drugs: Drugs to pack into columnar arrays.
+
+        Returns:
+            DrugCatalog with parallel arrays in input order.
+        """
+        n = len(drugs)
+        return cls(
+            ndc=np.array([d.ndc for d in drugs], dtype="U16"),
+            awp=np.fromiter(
+                (float(d.awp) for d in drugs), dtype=np.float64, count=n
+            ),
+            asp=np.fromiter(
+                (
+                    # Same test as has_medical_path(), spelled out so the
+                    # asp narrowing is visible to type checkers
+                    float(d.asp)
+                    if d.asp is not None and d.hcpcs_code is not None
+                    else np.nan
+                    for d in drugs
+                ),
+                dtype=np.float64,
+                count=n,
+            ),
+            contract_cost=np.fromiter(
+                (float(d.contract_cost) for d in drugs), dtype=np.float64, count=n
+            ),
+            bill_units=np.fromiter(
+                (float(d.bill_units_per_package) for d in drugs),
+                dtype=np.float64,
+                count=n,
+            ),
+            has_medical_path=np.fromiter(
+                (d.has_medical_path() for d in drugs), dtype=np.bool_, count=n
+            ),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of drugs in the catalog."""
+        return len(self.awp)
+
+
+@dataclass(slots=True)
 class MarginAnalysis:
     """Complete margin analysis for a drug across 5 pathways.
 
@@ -161,8 +246,57 @@ class MarginAnalysis:
             "penny_pricing": self.drug.penny_pricing_flag,
         }
 
+    @staticmethod
+    def batch_to_records(analyses: list["MarginAnalysis"]) -> pl.DataFrame:
+        """Build a columnar display table from many analyses.
+
+        Column-oriented counterpart of to_display_dict(): builds each
+        column in one pass instead of allocating a 15-key dict per
+        analysis, so bulk serialization goes straight to a DataFrame.
+
+        Args:
+            analyses: Margin analyses to tabulate.
+
+        Returns:
+            DataFrame with one row per analysis, columns matching
+            to_display_dict() keys.
+        """
+        return pl.DataFrame(
+            {
+                "ndc": [a.drug.ndc for a in analyses],
+                "drug_name": [a.drug.drug_name for a in analyses],
+                "manufacturer": [a.drug.manufacturer for a in analyses],
+                "contract_cost": [float(a.drug.contract_cost) for a in analyses],
+                "awp": [float(a.drug.awp) for a in analyses],
+                "asp": [
+                    float(a.drug.asp) if a.drug.asp else None for a in analyses
+                ],
+                "retail_gross_margin": [
+                    float(a.retail_gross_margin) for a in analyses
+                ],
+                "retail_net_margin": [
+                    float(a.retail_net_margin) for a in analyses
+                ],
+                "retail_capture_rate": [
+                    float(a.retail_capture_rate) for a in analyses
+                ],
+                "medicare_margin": [
+                    float(a.medicare_margin) if a.medicare_margin else None
+                    for a in analyses
+                ],
+                "commercial_margin": [
+                    float(a.commercial_margin) if a.commercial_margin else None
+                    for a in analyses
+                ],
+                "recommendation": [a.recommended_path.value for a in analyses],
+                "margin_delta": [float(a.margin_delta) for a in analyses],
+                "ira_risk": [a.drug.ira_flag for a in analyses],
+                "penny_pricing": [a.drug.penny_pricing_flag for a in analyses],
+            }
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class DosingProfile:
     """Loading dose profile for biologics.
 
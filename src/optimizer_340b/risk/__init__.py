@@ -14,6 +14,8 @@ from optimizer_340b.risk.ira_flags import (
     filter_ira_drugs,
     get_all_ira_drugs,
     get_ira_risk_status,
+    ira_name_flags,
+    tag_ira,
 )
 from optimizer_340b.risk.penny_pricing import (
     HIGH_DISCOUNT_THRESHOLD,
@@ -22,6 +24,7 @@ from optimizer_340b.risk.penny_pricing import (
     check_penny_pricing,
     check_penny_pricing_for_drug,
     filter_top_opportunities,
+    filter_top_opportunities_df,
     get_penny_pricing_summary,
 )
 
@@ -35,6 +38,8 @@ __all__ = [
     "filter_ira_drugs",
     "get_all_ira_drugs",
     "get_ira_risk_status",
+    "ira_name_flags",
+    "tag_ira",
     # Penny pricing
     "HIGH_DISCOUNT_THRESHOLD",
     "PENNY_THRESHOLD",
@@ -42,5 +47,6 @@ __all__ = [
     "check_penny_pricing",
     "check_penny_pricing_for_drug",
     "filter_top_opportunities",
+    "filter_top_opportunities_df",
     "get_penny_pricing_summary",
 ]
@@ -19,9 +19,13 @@ Data Source:
 """
 
 import logging
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
+import ahocorasick
 import polars as pl
 
 logger = logging.getLogger(__name__)
@@ -169,15 +173,163 @@ def load_ira_drugs_from_dataframe(
 
 
 # Load IRA drugs at module initialization
-# These will be used by check_ira_status() and other functions
-IRA_2026_DRUGS, IRA_2027_DRUGS = load_ira_drugs_from_csv()
+# These will be used by check_ira_status() and other functions.
+# All tables are exposed as read-only MappingProxyType views so callers
+# cannot mutate them out from under the precompiled lookups below.
+IRA_2026_DRUGS: Mapping[str, str]
+IRA_2027_DRUGS: Mapping[str, str]
 
-# Combined lookup for all IRA drugs
-IRA_DRUGS_BY_YEAR: dict[str, int] = {}
-for drug in IRA_2026_DRUGS:
-    IRA_DRUGS_BY_YEAR[drug.upper()] = 2026
-for drug in IRA_2027_DRUGS:
-    IRA_DRUGS_BY_YEAR[drug.upper()] = 2027
+# Combined lookup: uppercase name -> (ira_year, description). The loaders
+# already uppercase and strip keys, so no per-entry re-casing is needed.
+_IRA_INFO: Mapping[str, tuple[int, str]]
+
+# Derived year-only view, kept for existing callers
+IRA_DRUGS_BY_YEAR: Mapping[str, int]
+
+
+def _build_combined_tables(
+    ira_2026: Mapping[str, str],
+    ira_2027: Mapping[str, str],
+) -> tuple[Mapping[str, tuple[int, str]], Mapping[str, int]]:
+    """Build the immutable combined IRA lookup tables.
+
+    Args:
+        ira_2026: IRA 2026 drug names mapped to descriptions.
+        ira_2027: IRA 2027 drug names mapped to descriptions.
+
+    Returns:
+        Tuple of (_IRA_INFO, IRA_DRUGS_BY_YEAR) read-only mappings.
+    """
+    info = MappingProxyType(
+        {name: (2026, desc) for name, desc in ira_2026.items()}
+        | {name: (2027, desc) for name, desc in ira_2027.items()}
+    )
+    by_year = MappingProxyType({name: year for name, (year, _) in info.items()})
+    return info, by_year
+
+
+_raw_2026, _raw_2027 = load_ira_drugs_from_csv()
+IRA_2026_DRUGS = MappingProxyType(_raw_2026)
+IRA_2027_DRUGS = MappingProxyType(_raw_2027)
+_IRA_INFO, IRA_DRUGS_BY_YEAR = _build_combined_tables(
+    IRA_2026_DRUGS, IRA_2027_DRUGS
+)
+
+
+def _build_ira_automaton() -> tuple[ahocorasick.Automaton | None, int]:
+    """Compile the IRA drug names into an Aho-Corasick automaton.
+
+    The automaton finds any IRA name inside a catalog drug name in a single
+    C-level scan, replacing one Python substring check per IRA drug.
+
+    Returns:
+        Tuple of (automaton, longest IRA name length). The automaton is None
+        when no IRA drugs are loaded (an empty automaton cannot be scanned).
+    """
+    if not IRA_DRUGS_BY_YEAR:
+        return None, 0
+
+    automaton = ahocorasick.Automaton()
+    for name, year in IRA_DRUGS_BY_YEAR.items():
+        automaton.add_word(name, (name, year))
+    automaton.make_automaton()
+
+    return automaton, max(len(name) for name in IRA_DRUGS_BY_YEAR)
+
+
+# Precompiled substring matcher, rebuilt whenever the IRA lists reload
+_IRA_AUTOMATON, _MAX_IRA_NAME_LEN = _build_ira_automaton()
+
+
+def _build_ira_frame() -> pl.DataFrame:
+    """Materialize the IRA drug list as a DataFrame for vectorized joins."""
+    return pl.DataFrame(
+        {
+            "ira_drug_name": list(IRA_DRUGS_BY_YEAR),
+            "ira_year": list(IRA_DRUGS_BY_YEAR.values()),
+        },
+        schema={"ira_drug_name": pl.Utf8, "ira_year": pl.Int64},
+    )
+
+
+# IRA list as a join table, rebuilt whenever the IRA lists reload
+_IRA_DF = _build_ira_frame()
+
+
+def tag_ira(lf: pl.LazyFrame, name_col: str) -> pl.LazyFrame:
+    """Tag a LazyFrame with IRA status via a vectorized join on drug name.
+
+    Executes as a single hash join in Polars instead of one Python
+    check_ira_status() call per row. Matching is exact (after uppercasing
+    and stripping); partial substring matching stays in check_ira_status().
+
+    Args:
+        lf: LazyFrame containing a drug-name column.
+        name_col: Name of the drug-name column to match on.
+
+    Returns:
+        LazyFrame with added columns:
+        - ira_year: IRA negotiation year (null if not an IRA drug)
+        - is_ira_drug: whether the name exactly matches an IRA drug
+    """
+    return (
+        lf.with_columns(
+            pl.col(name_col)
+            .cast(pl.Utf8)
+            .str.to_uppercase()
+            .str.strip_chars()
+            .alias("_ira_key")
+        )
+        .join(
+            _IRA_DF.lazy(),
+            left_on="_ira_key",
+            right_on="ira_drug_name",
+            how="left",
+        )
+        .with_columns(pl.col("ira_year").is_not_null().alias("is_ira_drug"))
+        .drop("_ira_key")
+    )
+
+
+def ira_name_flags(names: pl.Series) -> pl.Series:
+    """Vectorized IRA detection for a Series of drug names.
+
+    Runs the multi-pattern substring match as a single Polars
+    ``contains_any`` kernel (Aho-Corasick in Rust) over the whole column,
+    which covers exact and forward-partial matches. The rare
+    reverse-containment case (the name is a fragment of an IRA list entry,
+    e.g. "TRELEGY") can only occur for names shorter than the longest IRA
+    entry, so only those few rows fall back to the per-name scan.
+
+    Args:
+        names: Drug names to check.
+
+    Returns:
+        Boolean Series aligned with the input, true for IRA-affected names.
+    """
+    upper = names.cast(pl.Utf8).str.to_uppercase().str.strip_chars()
+
+    if not IRA_DRUGS_BY_YEAR:
+        return pl.Series([False] * len(names))
+
+    flags = upper.str.contains_any(list(IRA_DRUGS_BY_YEAR)).fill_null(False)
+
+    needs_fallback = (
+        ~flags
+        & (upper.str.len_chars() > 0)
+        & (upper.str.len_chars() < _MAX_IRA_NAME_LEN)
+    ).fill_null(False)
+
+    if needs_fallback.any():
+        fallback = [
+            _find_partial_ira_match(name) is not None if check else False
+            for name, check in zip(
+                upper.to_list(), needs_fallback.to_list(), strict=True
+            )
+        ]
+        flags = flags | pl.Series(fallback)
+
+    return flags
 
 
 def reload_ira_drugs(
@@ -192,27 +344,38 @@ def reload_ira_drugs(
         csv_path: Path to CSV file. If provided, loads from file.
         df: DataFrame to load from. If provided, takes precedence over csv_path.
     """
-    global IRA_2026_DRUGS, IRA_2027_DRUGS, IRA_DRUGS_BY_YEAR
+    global IRA_2026_DRUGS, IRA_2027_DRUGS, IRA_DRUGS_BY_YEAR, _IRA_INFO
+    global _IRA_AUTOMATON, _MAX_IRA_NAME_LEN, _IRA_DF
 
     if df is not None:
-        IRA_2026_DRUGS, IRA_2027_DRUGS = load_ira_drugs_from_dataframe(df)
+        raw_2026, raw_2027 = load_ira_drugs_from_dataframe(df)
     else:
-        IRA_2026_DRUGS, IRA_2027_DRUGS = load_ira_drugs_from_csv(csv_path)
+        raw_2026, raw_2027 = load_ira_drugs_from_csv(csv_path)
+
+    IRA_2026_DRUGS = MappingProxyType(raw_2026)
+    IRA_2027_DRUGS = MappingProxyType(raw_2027)
 
     # Rebuild the combined lookup
-    IRA_DRUGS_BY_YEAR = {}
-    for drug in IRA_2026_DRUGS:
-        IRA_DRUGS_BY_YEAR[drug.upper()] = 2026
-    for drug in IRA_2027_DRUGS:
-        IRA_DRUGS_BY_YEAR[drug.upper()] = 2027
+    _IRA_INFO, IRA_DRUGS_BY_YEAR = _build_combined_tables(
+        IRA_2026_DRUGS, IRA_2027_DRUGS
+    )
+
+    # Recompile the substring matcher and join table for the new lists,
+    # and drop memoized results computed against the old tables
+    _IRA_AUTOMATON, _MAX_IRA_NAME_LEN = _build_ira_automaton()
+    _IRA_DF = _build_ira_frame()
+    get_ira_risk_status.cache_clear()
 
     logger.info(f"Reloaded IRA drugs: {len(IRA_DRUGS_BY_YEAR)} total drugs")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IRARiskStatus:
     """IRA risk assessment for a drug.
 
+    Frozen with slots so bulk scans can share the negative-result
+    singletons below instead of allocating per call.
+
     Attributes:
         is_ira_drug: Whether the drug is subject to IRA negotiation.
         ira_year: Year when IRA pricing takes effect (2026, 2027, etc.).
@@ -230,6 +393,57 @@ class IRARiskStatus:
     risk_level: str
 
 
+# Shared results for the common negative paths (most drugs aren't IRA);
+# returning these avoids a fresh allocation per catalog row.
+_NOT_IRA_STATUS = IRARiskStatus(
+    is_ira_drug=False,
+    ira_year=None,
+    drug_name=None,
+    description=None,
+    warning_message="No IRA risk detected",
+    risk_level="Low Risk",
+)
+
+_EMPTY_NAME_STATUS = IRARiskStatus(
+    is_ira_drug=False,
+    ira_year=None,
+    drug_name=None,
+    description=None,
+    warning_message="No drug name provided",
+    risk_level="Unknown",
+)
+
+
+def _find_partial_ira_match(name_upper: str) -> tuple[str, int] | None:
+    """Find an IRA drug contained in (or containing) an uppercased name.
+
+    Runs a single automaton scan instead of one Python substring check per
+    IRA drug. The reverse-containment case (query is a fragment of an IRA
+    name, e.g. "TRELEGY" vs "TRELEGY ELLIPTA") can only occur for queries
+    shorter than the longest IRA name, so the Python loop is skipped for
+    typical full catalog names.
+
+    Args:
+        name_upper: Uppercased, stripped drug name.
+
+    Returns:
+        Tuple of (matched IRA drug name, IRA year), or None if no match.
+    """
+    if _IRA_AUTOMATON is not None:
+        hit = next(_IRA_AUTOMATON.iter(name_upper), None)
+        if hit is not None:
+            # The automaton payload is the (name, year) tuple added above
+            match: tuple[str, int] = hit[1]
+            return match
+
+    if 0 < len(name_upper) < _MAX_IRA_NAME_LEN:
+        for ira_drug, year in IRA_DRUGS_BY_YEAR.items():
+            if name_upper in ira_drug:
+                return ira_drug, year
+
+    return None
+
+
 def check_ira_status(drug_name: str) -> dict[str, object]:
     """Check if a drug is subject to IRA price negotiation.
 
@@ -249,91 +463,87 @@ def check_ira_status(drug_name: str) -> dict[str, object]:
         - warning_message: str
         - risk_level: str
     """
+    return asdict(get_ira_risk_status(drug_name))
+
+
+def check_ira_status_many(drug_names: list[str]) -> list[dict[str, object]]:
+    """Check IRA status for many drug names in one pass.
+
+    Args:
+        drug_names: Drug names to check.
+
+    Returns:
+        List of IRA risk assessments, one per input name, in input order.
+    """
+    return [check_ira_status(name) for name in drug_names]
+
+
+@lru_cache(maxsize=4096)
+def get_ira_risk_status(drug_name: str) -> IRARiskStatus:
+    """Get structured IRA risk status for a drug.
+
+    This is the allocation-light core: negative results (the common case)
+    return shared immutable singletons, and positive results build one
+    frozen dataclass instead of a dict.
+
+    Results are memoized per drug name (the IRA tables are constant for a
+    process lifetime; reload_ira_drugs clears the cache), so repeat queries
+    from risk tagging, reporting, and dashboard re-renders skip the scan.
+
+    Args:
+        drug_name: Name of the drug to check.
+
+    Returns:
+        IRARiskStatus dataclass with risk assessment.
+    """
     if not drug_name:
-        return {
-            "is_ira_drug": False,
-            "ira_year": None,
-            "drug_name": None,
-            "description": None,
-            "warning_message": "No drug name provided",
-            "risk_level": "Unknown",
-        }
+        return _EMPTY_NAME_STATUS
 
     # Normalize drug name for matching
     name_upper = drug_name.upper().strip()
 
-    # Check for exact match first
-    if name_upper in IRA_DRUGS_BY_YEAR:
-        year = IRA_DRUGS_BY_YEAR[name_upper]
-        description = (
-            IRA_2026_DRUGS.get(name_upper) or IRA_2027_DRUGS.get(name_upper)
-        )
+    # Check for exact match first: one lookup in the combined table
+    info = _IRA_INFO.get(name_upper)
+    if info is not None:
+        year, description = info
 
         logger.warning(f"IRA drug detected: {drug_name} (IRA {year})")
 
-        return {
-            "is_ira_drug": True,
-            "ira_year": year,
-            "drug_name": name_upper,
-            "description": description,
-            "warning_message": (
+        return IRARiskStatus(
+            is_ira_drug=True,
+            ira_year=year,
+            drug_name=name_upper,
+            description=description,
+            warning_message=(
                 f"High Risk / IRA {year}: {drug_name} is subject to Medicare "
                 f"price negotiation. 340B margins may be significantly reduced "
                 f"starting {year}."
             ),
-            "risk_level": "High Risk",
-        }
+            risk_level="High Risk",
+        )
 
     # Check for partial match (drug name contains IRA drug)
-    for ira_drug, year in IRA_DRUGS_BY_YEAR.items():
-        if ira_drug in name_upper or name_upper in ira_drug:
-            description = (
-                IRA_2026_DRUGS.get(ira_drug) or IRA_2027_DRUGS.get(ira_drug)
-            )
-
-            logger.warning(f"Potential IRA drug match: {drug_name} -> {ira_drug}")
-
-            return {
-                "is_ira_drug": True,
-                "ira_year": year,
-                "drug_name": ira_drug,
-                "description": description,
-                "warning_message": (
-                    f"High Risk / IRA {year}: {drug_name} appears to match "
-                    f"{ira_drug}, which is subject to Medicare price negotiation."
-                ),
-                "risk_level": "High Risk",
-            }
+    match = _find_partial_ira_match(name_upper)
+    if match is not None:
+        ira_drug, year = match
+        description = _IRA_INFO[ira_drug][1]
+
+        logger.warning(f"Potential IRA drug match: {drug_name} -> {ira_drug}")
+
+        return IRARiskStatus(
+            is_ira_drug=True,
+            ira_year=year,
+            drug_name=ira_drug,
+            description=description,
+            warning_message=(
+                f"High Risk / IRA {year}: {drug_name} appears to match "
+                f"{ira_drug}, which is subject to Medicare price negotiation."
+            ),
+            risk_level="High Risk",
+        )
 
     # Not an IRA drug
-    return {
-        "is_ira_drug": False,
-        "ira_year": None,
-        "drug_name": None,
-        "description": None,
-        "warning_message": "No IRA risk detected",
-        "risk_level": "Low Risk",
-    }
-
-
-def get_ira_risk_status(drug_name: str) -> IRARiskStatus:
-    """Get structured IRA risk status for a drug.
-
-    Args:
-        drug_name: Name of the drug to check.
-
-    Returns:
-        IRARiskStatus dataclass with risk assessment.
-    """
-    result = check_ira_status(drug_name)
-    return IRARiskStatus(
-        is_ira_drug=bool(result["is_ira_drug"]),
-        ira_year=result["ira_year"],  # type: ignore[arg-type]
-        drug_name=result["drug_name"],  # type: ignore[arg-type]
-        description=result["description"],  # type: ignore[arg-type]
-        warning_message=str(result["warning_message"]),
-        risk_level=str(result["risk_level"]),
-    )
+    return _NOT_IRA_STATUS
 
 
 def filter_ira_drugs(drug_names: list[str]) -> list[dict[str, object]]:
@@ -345,12 +555,28 @@ def filter_ira_drugs(drug_names: list[str]) -> list[dict[str, object]]:
     Returns:
         List of IRA risk assessments for affected drugs only.
     """
+    if not drug_names:
+        return []
+
+    # Resolve exact matches in bulk with one vectorized join; only names the
+    # join missed fall back to the per-name partial-match scan.
+    tagged = tag_ira(
+        pl.LazyFrame({"drug_name": drug_names}, schema={"drug_name": pl.Utf8}),
+        "drug_name",
+    ).collect()
+
     ira_drugs = []
-    for name in drug_names:
+    for name, is_exact in zip(
+        drug_names, tagged["is_ira_drug"].to_list(), strict=True
+    ):
+        # Join misses get one automaton scan for partial matches; only
+        # flagged names pay for Python-level status-dict construction.
+        if not is_exact and _find_partial_ira_match(name.upper().strip()) is None:
+            continue
+
         status = check_ira_status(name)
-        if status["is_ira_drug"]:
-            status["input_name"] = name
-            ira_drugs.append(status)
+        status["input_name"] = name
+        ira_drugs.append(status)
 
     logger.info(f"Found {len(ira_drugs)} IRA-affected drugs out of {len(drug_names)}")
     return ira_drugs
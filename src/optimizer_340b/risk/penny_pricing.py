@@ -34,6 +34,12 @@ PENNY_COST_OVERRIDE = Decimal("0.01")  # $0.01 as per manifest
 # Inflation penalty threshold
 INFLATION_PENALTY_THRESHOLD = Decimal("20.0")  # 20% threshold
 
+# Float sentinels for the thresholds above: hot comparisons run as C-level
+# FP compares (and vectorize in Polars); Decimal is kept for display fields
+_PENNY_THRESHOLD_F = float(PENNY_THRESHOLD)
+_HIGH_DISCOUNT_F = float(HIGH_DISCOUNT_THRESHOLD)
+_INFLATION_PENALTY_F = float(INFLATION_PENALTY_THRESHOLD)
+
 
 @dataclass
 class PennyPricingStatus:
@@ -56,14 +62,22 @@ class PennyPricingStatus:
     should_exclude: bool
 
 
-def check_penny_pricing(nadac_df: pl.DataFrame) -> list[dict[str, object]]:
+def check_penny_pricing(
+    nadac_df: pl.DataFrame | pl.LazyFrame,
+) -> list[dict[str, object]]:
     """Check NADAC data for penny-priced drugs.
 
     Drugs with penny_pricing=True or extremely high discount percentages
     are flagged as having limited 340B opportunity.
 
+    The filter runs as a lazy Polars pipeline: only the three relevant
+    columns are projected and the penny predicate is pushed into the scan,
+    so multi-million-row NADAC tables never materialize intermediate
+    DataFrames. Passing a ``LazyFrame`` (e.g. from ``pl.scan_csv``) keeps
+    the whole check streaming.
+
     Args:
-        nadac_df: NADAC DataFrame with columns:
+        nadac_df: NADAC DataFrame or LazyFrame with columns:
             - ndc: Drug NDC
             - penny_pricing: Boolean flag (if available)
             - total_discount_340b_pct: Discount percentage (if available)
@@ -73,54 +87,138 @@ def check_penny_pricing(nadac_df: pl.DataFrame) -> list[dict[str, object]]:
     """
     flagged: list[dict[str, object]] = []
 
+    lf = nadac_df.lazy()
+    schema = lf.collect_schema()
+    columns = schema.names()
+
     # Check if required columns exist
-    has_penny_column = "penny_pricing" in nadac_df.columns
-    has_discount_column = "total_discount_340b_pct" in nadac_df.columns
+    has_penny_column = "penny_pricing" in columns
+    has_discount_column = "total_discount_340b_pct" in columns
 
     if not has_penny_column and not has_discount_column:
         logger.warning("NADAC data missing penny_pricing and discount columns")
         return flagged
 
-    for row in nadac_df.iter_rows(named=True):
-        ndc = str(row.get("ndc", ""))
-        is_penny = False
-        reason = ""
-
-        # Check explicit penny_pricing flag
-        if has_penny_column and row.get("penny_pricing"):
-            is_penny = True
-            reason = "Penny pricing flag is set"
-
-        # Check high discount percentage
-        if has_discount_column:
-            discount = row.get("total_discount_340b_pct")
-            if discount is not None:
-                discount_decimal = Decimal(str(discount))
-                if discount_decimal >= HIGH_DISCOUNT_THRESHOLD:
-                    is_penny = True
-                    reason = f"340B discount is {discount_decimal:.1f}%"
-
-        if is_penny:
-            flagged.append({
-                "ndc": ndc,
-                "is_penny_priced": True,
-                "discount_pct": row.get("total_discount_340b_pct"),
-                "warning_message": (
-                    f"Penny Pricing Alert: {ndc} - {reason}. "
-                    "This drug should NOT appear in Top Opportunities."
-                ),
-                "should_exclude": True,
-            })
-
-            logger.info(f"Penny pricing detected: NDC {ndc} - {reason}")
+    # Build the penny predicate from whichever columns are present;
+    # null comparisons evaluate to null and are treated as not-penny.
+    predicates: list[pl.Expr] = []
+    if has_penny_column:
+        if schema["penny_pricing"] == pl.Boolean:
+            predicates.append(pl.col("penny_pricing").fill_null(False))
+        else:
+            # Manifest exports carry the flag as text; accept the same
+            # affirmative forms as build_nadac_lookup
+            predicates.append(
+                pl.col("penny_pricing")
+                .cast(pl.Utf8)
+                .str.to_uppercase()
+                .is_in(["YES", "TRUE", "1", "Y"])
+            )
+    # strict=False parses numeric strings and nulls out garbage, matching
+    # the Decimal(str(...)) coercion of the old loop (and build_nadac_frame)
+    discount = pl.col("total_discount_340b_pct").cast(pl.Float64, strict=False)
+
+    if has_discount_column:
+        predicates.append(discount >= _HIGH_DISCOUNT_F)
+
+    predicate = predicates[0]
+    for extra in predicates[1:]:
+        predicate = predicate | extra
+
+    # Reason/warning strings are also built as vectorized expressions;
+    # the high-discount reason wins when both indicators fire, matching
+    # the order of the original per-row checks.
+    if has_discount_column:
+        reason = (
+            pl.when(discount >= _HIGH_DISCOUNT_F)
+            .then(pl.format("340B discount is {}%", discount.round(1)))
+            .otherwise(pl.lit("Penny pricing flag is set"))
+        )
+    else:
+        reason = pl.lit("Penny pricing flag is set")
+
+    # The ndc column is optional like the other two; flagged rows from a
+    # frame without one carry an empty-string NDC, as before
+    ndc = (
+        pl.col("ndc").cast(pl.Utf8).fill_null("")
+        if "ndc" in columns
+        else pl.lit("")
+    )
 
-    logger.info(
-        f"Found {len(flagged)} penny-priced drugs out of {nadac_df.height} total"
+    projection = [c for c in ("ndc", "penny_pricing", "total_discount_340b_pct")
+                  if c in columns]
+    penny_rows = (
+        lf.select(projection)
+        .filter(predicate)
+        .with_columns(
+            ndc=ndc,
+            warning_message=pl.format(
+                "Penny Pricing Alert: {} - {}. "
+                "This drug should NOT appear in Top Opportunities.",
+                ndc,
+                reason,
+            ),
+        )
+        .collect()
     )
 
+    # Only the (tiny) flagged subset reaches Python-level dict building
+    for row in penny_rows.iter_rows(named=True):
+        flagged.append({
+            "ndc": row["ndc"],
+            "is_penny_priced": True,
+            "discount_pct": row.get("total_discount_340b_pct"),
+            "warning_message": row["warning_message"],
+            "should_exclude": True,
+        })
+
+        logger.info("Penny pricing detected: NDC %s", row["ndc"])
+
+    logger.info("Found %d penny-priced drugs", len(flagged))
+
     return flagged
 
 
+# Normalized-NDC row indexes keyed by DataFrame identity. The source frame
+# is pinned in the value so a recycled id() can never alias a new frame; a
+# handful of entries covers the frames alive in a session.
+_NADAC_INDEX_CACHE: dict[int, tuple[pl.DataFrame, dict[str, int]]] = {}
+_NADAC_INDEX_CACHE_MAX = 4
+
+
+def _nadac_ndc_index(nadac_df: pl.DataFrame) -> dict[str, int]:
+    """Map normalized NDC to row index for a NADAC frame, built once.
+
+    Normalization (strip dashes/whitespace) runs as a single Polars kernel
+    over the column; per-drug lookups afterwards are O(1) dict probes
+    instead of an O(N) filter scan per query.
+
+    Args:
+        nadac_df: NADAC DataFrame with an 'ndc' column.
+
+    Returns:
+        Dictionary mapping normalized NDC to its first row index.
+    """
+    key = id(nadac_df)
+    cached = _NADAC_INDEX_CACHE.get(key)
+    if cached is not None and cached[0] is nadac_df:
+        return cached[1]
+
+    normalized = (
+        nadac_df["ndc"].cast(pl.Utf8).str.replace_all("-", "").str.strip_chars()
+    )
+    index: dict[str, int] = {}
+    for i, norm in enumerate(normalized.to_list()):
+        # First occurrence wins, matching filter(...).row(0) semantics
+        index.setdefault(norm, i)
+
+    if len(_NADAC_INDEX_CACHE) >= _NADAC_INDEX_CACHE_MAX:
+        _NADAC_INDEX_CACHE.pop(next(iter(_NADAC_INDEX_CACHE)))
+    _NADAC_INDEX_CACHE[key] = (nadac_df, index)
+
+    return index
+
+
 def check_penny_pricing_for_drug(
     ndc: str,
     nadac_df: pl.DataFrame,
@@ -137,7 +235,6 @@ def check_penny_pricing_for_drug(
     # Normalize NDC for matching
     ndc_clean = ndc.replace("-", "").strip()
 
-    # Filter for matching NDC
     if "ndc" not in nadac_df.columns:
         return PennyPricingStatus(
             is_penny_priced=False,
@@ -148,13 +245,11 @@ def check_penny_pricing_for_drug(
             should_exclude=False,
         )
 
-    # Create normalized NDC column for matching
-    matches = nadac_df.filter(
-        pl.col("ndc").cast(pl.Utf8).str.replace_all("-", "").str.strip_chars()
-        == ndc_clean
-    )
+    # O(1) probe against the cached normalized index instead of an O(N)
+    # filter scan per query
+    row_idx = _nadac_ndc_index(nadac_df).get(ndc_clean)
 
-    if matches.height == 0:
+    if row_idx is None:
         return PennyPricingStatus(
             is_penny_priced=False,
             ndc=ndc,
@@ -164,7 +259,7 @@ def check_penny_pricing_for_drug(
             should_exclude=False,
         )
 
-    row = matches.row(0, named=True)
+    row = nadac_df.row(row_idx, named=True)
 
     # Check penny pricing indicators
     is_penny = False
@@ -173,25 +268,25 @@ def check_penny_pricing_for_drug(
     reason = ""
 
     # Check explicit flag
-    if "penny_pricing" in matches.columns and row.get("penny_pricing"):
+    if "penny_pricing" in nadac_df.columns and row.get("penny_pricing"):
         is_penny = True
         reason = "Penny pricing flag is set"
 
-    # Check NADAC price
-    if "nadac_per_unit" in matches.columns:
+    # Check NADAC price (float compare; Decimal only for the display field)
+    if "nadac_per_unit" in nadac_df.columns:
         price = row.get("nadac_per_unit")
         if price is not None:
             nadac_price = Decimal(str(price))
-            if nadac_price <= PENNY_THRESHOLD:
+            if float(price) <= _PENNY_THRESHOLD_F:
                 is_penny = True
                 reason = f"NADAC price is ${nadac_price:.4f}"
 
     # Check discount percentage
-    if "total_discount_340b_pct" in matches.columns:
+    if "total_discount_340b_pct" in nadac_df.columns:
         discount = row.get("total_discount_340b_pct")
         if discount is not None:
             discount_pct = Decimal(str(discount))
-            if discount_pct >= HIGH_DISCOUNT_THRESHOLD:
+            if float(discount) >= _HIGH_DISCOUNT_F:
                 is_penny = True
                 reason = f"340B discount is {discount_pct:.1f}%"
 
@@ -231,6 +326,9 @@ def filter_top_opportunities(
     Returns:
         Filtered list excluding penny-priced drugs.
     """
+    if not opportunities:
+        return []
+
     if penny_ndcs is None and nadac_df is not None:
         # Build penny NDC set from NADAC data
         flagged = check_penny_pricing(nadac_df)
@@ -238,24 +336,80 @@ def filter_top_opportunities(
     elif penny_ndcs is None:
         penny_ndcs = set()
 
-    filtered = []
-    excluded_count = 0
+    # Convert once and run the exclusion as a lazy Polars filter so the
+    # set membership test and flag check execute as vectorized kernels.
+    lf = pl.from_dicts(opportunities).lazy()
+    columns = lf.collect_schema().names()
 
-    for opp in opportunities:
-        ndc = str(opp.get("ndc", ""))
-        is_penny = opp.get("penny_pricing", False)
+    exclude = _penny_exclusion_expr(columns, penny_ndcs)
+    filtered = lf.filter(~exclude).collect(engine="streaming").to_dicts()
 
-        # Check against penny_ndcs set or explicit flag
-        if ndc in penny_ndcs or is_penny:
-            excluded_count += 1
-            logger.debug(f"Excluding penny-priced drug from opportunities: {ndc}")
-            continue
+    excluded_count = len(opportunities) - len(filtered)
+    if excluded_count > 0:
+        logger.info(
+            f"Excluded {excluded_count} penny-priced drugs from Top Opportunities"
+        )
+
+    return filtered
 
-        filtered.append(opp)
 
+def _penny_exclusion_expr(
+    columns: list[str],
+    penny_ndcs: set[str],
+) -> pl.Expr:
+    """Build the penny-exclusion predicate shared by both filter variants.
+
+    Rows without an ndc column pass through, as the old per-row loop did.
+
+    Args:
+        columns: Column names of the opportunity frame.
+        penny_ndcs: Pre-computed set of penny-priced NDCs.
+
+    Returns:
+        Boolean expression that is true for rows to exclude.
+    """
+    if "ndc" in columns:
+        # Null NDCs compare as null in is_in; treat them as not excluded
+        # so those rows pass through like the old per-row loop
+        exclude = (
+            pl.col("ndc").cast(pl.Utf8).is_in(sorted(penny_ndcs)).fill_null(False)
+        )
+    else:
+        exclude = pl.lit(False)
+    if "penny_pricing" in columns:
+        exclude = exclude | pl.col("penny_pricing").fill_null(False)
+    return exclude
+
+
+def filter_top_opportunities_df(
+    opportunities: pl.DataFrame,
+    penny_ndcs: set[str] | None = None,
+) -> pl.DataFrame:
+    """Filter penny-priced drugs out of an opportunity DataFrame.
+
+    Frame-native variant of filter_top_opportunities for callers that
+    already hold a columnar opportunity table: the NDC membership test
+    and flag check run as vectorized kernels with no dict round-trip.
+
+    Args:
+        opportunities: Opportunity frame with 'ndc' and optionally
+            'penny_pricing' columns.
+        penny_ndcs: Optional pre-computed set of penny-priced NDCs.
+
+    Returns:
+        Frame excluding penny-priced drugs, in input order.
+    """
+    if opportunities.is_empty():
+        return opportunities
+
+    exclude = _penny_exclusion_expr(opportunities.columns, penny_ndcs or set())
+    filtered = opportunities.filter(~exclude)
+
+    excluded_count = opportunities.height - filtered.height
     if excluded_count > 0:
         logger.info(
-            f"Excluded {excluded_count} penny-priced drugs from Top Opportunities"
+            "Excluded %d penny-priced drugs from Top Opportunities",
+            excluded_count,
         )
 
     return filtered
@@ -305,9 +459,108 @@ class NADACEnhancedStatus:
     warnings: list[str]
 
 
+def build_nadac_frame(nadac_df: pl.DataFrame) -> pl.DataFrame:
+    """Build a normalized per-NDC NADAC frame for vectorized consumers.
+
+    Normalization, numeric coercion, and penny/inflation flagging all run
+    as Polars expressions; invalid numeric values become nulls via
+    strict=False casts, matching the old per-row try/except.
+
+    Args:
+        nadac_df: NADAC DataFrame with pricing data.
+
+    Returns:
+        DataFrame with columns:
+        - ndc: 11-digit normalized NDC.
+        - discount: 340B discount percentage (null if absent/invalid).
+        - inflation: inflation penalty percentage (null if absent/invalid).
+        - nadac_price: most recent NADAC price (null if absent/invalid).
+        - is_penny: penny flag set or discount at/above the threshold.
+        - has_inflation: inflation penalty above the threshold.
+    """
+    columns = nadac_df.columns
+
+    if "ndc" not in columns:
+        logger.warning("NADAC data missing 'ndc' column")
+        return pl.DataFrame(
+            schema={
+                "ndc": pl.Utf8,
+                "discount": pl.Float64,
+                "inflation": pl.Float64,
+                "nadac_price": pl.Float64,
+                "is_penny": pl.Boolean,
+                "has_inflation": pl.Boolean,
+            }
+        )
+
+    null_f64 = pl.lit(None, dtype=pl.Float64)
+
+    if "penny_pricing" in columns:
+        if nadac_df.schema["penny_pricing"] == pl.Boolean:
+            penny_flag = pl.col("penny_pricing").fill_null(False)
+        else:
+            penny_flag = (
+                pl.col("penny_pricing")
+                .cast(pl.Utf8)
+                .str.to_uppercase()
+                .is_in(["YES", "TRUE", "1", "Y"])
+                .fill_null(False)
+            )
+    else:
+        penny_flag = pl.lit(False)
+
+    discount = (
+        pl.col("total_discount_340b_pct").cast(pl.Float64, strict=False)
+        if "total_discount_340b_pct" in columns
+        else null_f64
+    )
+    inflation = (
+        pl.col("inflation_penalty_pct").cast(pl.Float64, strict=False)
+        if "inflation_penalty_pct" in columns
+        else null_f64
+    )
+    last_price = (
+        pl.col("last_price").cast(pl.Float64, strict=False)
+        if "last_price" in columns
+        else null_f64
+    )
+
+    return (
+        nadac_df.lazy()
+        .select(
+            ndc=pl.col("ndc")
+            .cast(pl.Utf8)
+            .str.replace_all("-", "")
+            .str.strip_chars()
+            .str.zfill(11)
+            .str.slice(-11),
+            discount=discount,
+            inflation=inflation,
+            nadac_price=last_price,
+            is_penny=penny_flag
+            | (discount >= _HIGH_DISCOUNT_F).fill_null(False),
+            has_inflation=(inflation > _INFLATION_PENALTY_F).fill_null(False),
+        )
+        .filter(pl.col("ndc").is_not_null() & (pl.col("ndc") != ""))
+        .collect()
+    )
+
+
+# Built lookups keyed by DataFrame identity (frame pinned in the value, as
+# with _NADAC_INDEX_CACHE) so Streamlit reruns don't rebuild the dict for
+# an unchanged upload
+_NADAC_LOOKUP_CACHE: dict[
+    int, tuple[pl.DataFrame, dict[str, dict[str, object]]]
+] = {}
+
+
 def build_nadac_lookup(nadac_df: pl.DataFrame) -> dict[str, dict[str, object]]:
     """Build comprehensive NADAC lookup with penny pricing and inflation data.
 
+    The result is memoized per input frame identity: uploaded frames are
+    immutable for the session, so repeat calls (page reruns, per-search
+    rebuilds) return the cached dict.
+
     Args:
         nadac_df: NADAC DataFrame with pricing data.
 
@@ -320,88 +573,46 @@ def build_nadac_lookup(nadac_df: pl.DataFrame) -> dict[str, dict[str, object]]:
         - discount_340b_pct: Decimal or None
         - nadac_price: Decimal or None (last_price from NADAC)
     """
-    lookup: dict[str, dict[str, object]] = {}
-
-    # Check available columns
-    has_penny_col = "penny_pricing" in nadac_df.columns
-    has_discount_col = "total_discount_340b_pct" in nadac_df.columns
-    has_inflation_col = "inflation_penalty_pct" in nadac_df.columns
-    has_last_price_col = "last_price" in nadac_df.columns
-
-    if "ndc" not in nadac_df.columns:
-        logger.warning("NADAC data missing 'ndc' column")
-        return lookup
-
-    for row in nadac_df.iter_rows(named=True):
-        ndc = str(row.get("ndc", "")).replace("-", "").strip()
-        if not ndc:
-            continue
+    key = id(nadac_df)
+    cached = _NADAC_LOOKUP_CACHE.get(key)
+    if cached is not None and cached[0] is nadac_df:
+        return cached[1]
 
-        # Normalize NDC to 11 digits
-        ndc_normalized = ndc.zfill(11)[-11:]
+    lookup: dict[str, dict[str, object]] = {}
 
-        # Check penny pricing
-        is_penny = False
-        if has_penny_col:
-            penny_val = row.get("penny_pricing")
-            if penny_val and str(penny_val).upper() in ("YES", "TRUE", "1", "Y"):
-                is_penny = True
+    normalized = build_nadac_frame(nadac_df)
 
-        # Check discount percentage as alternative
-        discount_pct = None
-        if has_discount_col:
-            discount_val = row.get("total_discount_340b_pct")
-            if discount_val is not None:
-                try:
-                    discount_pct = Decimal(str(discount_val))
-                    if discount_pct >= HIGH_DISCOUNT_THRESHOLD:
-                        is_penny = True
-                except (ValueError, TypeError):
-                    pass
-
-        # Check inflation penalty
-        has_inflation = False
-        inflation_pct = None
-        if has_inflation_col:
-            inflation_val = row.get("inflation_penalty_pct")
-            if inflation_val is not None:
-                try:
-                    inflation_pct = Decimal(str(inflation_val))
-                    if inflation_pct > INFLATION_PENALTY_THRESHOLD:
-                        has_inflation = True
-                except (ValueError, TypeError):
-                    pass
-
-        # Get NADAC price (last_price is the most recent NADAC)
-        nadac_price = None
-        if has_last_price_col:
-            price_val = row.get("last_price")
-            if price_val is not None:
-                try:
-                    nadac_price = Decimal(str(price_val))
-                except (ValueError, TypeError):
-                    pass
-
-        # Build lookup entry
-        lookup[ndc_normalized] = {
+    # Single pass to build the dict; only the Decimal display fields still
+    # require per-row conversion
+    for ndc, discount_f, inflation_f, price_f, is_penny, has_inflation in (
+        normalized.iter_rows()
+    ):
+        lookup[ndc] = {
             "is_penny_priced": is_penny,
             "override_cost": PENNY_COST_OVERRIDE if is_penny else None,
             "has_inflation_penalty": has_inflation,
-            "inflation_penalty_pct": inflation_pct,
-            "discount_340b_pct": discount_pct,
-            "nadac_price": nadac_price,
+            "inflation_penalty_pct": (
+                Decimal(str(inflation_f)) if inflation_f is not None else None
+            ),
+            "discount_340b_pct": (
+                Decimal(str(discount_f)) if discount_f is not None else None
+            ),
+            "nadac_price": Decimal(str(price_f)) if price_f is not None else None,
         }
 
-    logger.info(f"Built NADAC lookup with {len(lookup)} NDCs")
+    logger.info("Built NADAC lookup with %d NDCs", len(lookup))
 
     # Log summary
-    penny_count = sum(1 for v in lookup.values() if v["is_penny_priced"])
-    inflation_count = sum(1 for v in lookup.values() if v["has_inflation_penalty"])
     logger.info(
-        f"NADAC summary: {penny_count} penny-priced, "
-        f"{inflation_count} with high inflation penalty"
+        "NADAC summary: %d penny-priced, %d with high inflation penalty",
+        int(normalized["is_penny"].sum()),
+        int(normalized["has_inflation"].sum()),
     )
 
+    if len(_NADAC_LOOKUP_CACHE) >= _NADAC_INDEX_CACHE_MAX:
+        _NADAC_LOOKUP_CACHE.pop(next(iter(_NADAC_LOOKUP_CACHE)))
+    _NADAC_LOOKUP_CACHE[key] = (nadac_df, lookup)
+
     return lookup
 
 
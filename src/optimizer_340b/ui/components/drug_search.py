@@ -38,20 +38,32 @@ def _load_hcpcs_to_ndc_mapping() -> dict[str, list[dict[str, str]]]:
     if MAPPING_FILE.exists():
         try:
             df = pl.read_csv(str(MAPPING_FILE))
-            for row in df.iter_rows(named=True):
-                hcpcs = str(row.get("hcpcs_code", "")).upper().strip()
-                ndc = str(row.get("ndc11", "")).strip()
-                drug_name = str(row.get("drug_name", "")).strip()
-                manufacturer = str(row.get("manufacturer", "")).strip()
-
-                if hcpcs and ndc:
-                    if hcpcs not in mapping:
-                        mapping[hcpcs] = []
-                    mapping[hcpcs].append({
-                        "ndc11": ndc,
-                        "drug_name": drug_name,
-                        "manufacturer": manufacturer,
-                    })
+
+            def text_col(name: str) -> pl.Expr:
+                if name not in df.columns:
+                    return pl.lit("")
+                return pl.col(name).cast(pl.Utf8).str.strip_chars().fill_null("")
+
+            # Normalization runs columnwise; the dict build below iterates
+            # positionally with no per-row dict allocation
+            cleaned = df.lazy().select(
+                hcpcs=text_col("hcpcs_code").str.to_uppercase(),
+                ndc11=text_col("ndc11"),
+                drug_name=text_col("drug_name"),
+                manufacturer=text_col("manufacturer"),
+            ).filter(
+                pl.col("hcpcs").is_not_null()
+                & (pl.col("hcpcs") != "")
+                & pl.col("ndc11").is_not_null()
+                & (pl.col("ndc11") != "")
+            ).collect()
+
+            for hcpcs, ndc, drug_name, manufacturer in cleaned.iter_rows():
+                mapping.setdefault(hcpcs, []).append({
+                    "ndc11": ndc,
+                    "drug_name": drug_name,
+                    "manufacturer": manufacturer,
+                })
             logger.info(f"Loaded HCPCS mapping: {len(mapping)} codes")
         except Exception as e:
             logger.warning(f"Could not load HCPCS mapping: {e}")
@@ -75,13 +87,28 @@ def _get_drug_name_options() -> list[str]:
     if catalog is None:
         return []
 
-    names = set()
-    for row in catalog.iter_rows(named=True):
-        name = str(row.get("Drug Name") or row.get("Trade Name") or "").strip()
-        if name and name.lower() != "unknown":
-            names.add(name)
+    name_cols = [c for c in ("Drug Name", "Trade Name") if c in catalog.columns]
+    if not name_cols:
+        return []
+
+    # Coalesce, strip, dedupe, and filter columnwise instead of touching
+    # every row in Python
+    names = (
+        catalog.lazy()
+        .select(
+            name=pl.coalesce(
+                [pl.col(c).cast(pl.Utf8) for c in name_cols] + [pl.lit("")]
+            ).str.strip_chars()
+        )
+        .filter(
+            (pl.col("name") != "")
+            & (pl.col("name").str.to_lowercase() != "unknown")
+        )
+        .unique()
+        .collect()["name"]
+    )
 
-    sorted_names = sorted(names)
+    sorted_names = sorted(names.to_list())
     st.session_state.drug_name_options = sorted_names
     return sorted_names
 
@@ -145,24 +172,40 @@ def _search_drugs_by_name(query: str) -> list[dict[str, str]]:
         return []
 
     query_upper = query.upper().strip()
-    matches: list[dict[str, str]] = []
-
-    for row in catalog.iter_rows(named=True):
-        drug_name = str(row.get("Drug Name") or row.get("Trade Name") or "").strip()
-        if query_upper in drug_name.upper():
-            ndc = str(row.get("NDC", "")).strip()
-            manufacturer = str(row.get("Manufacturer") or row.get("MANUFACTURER") or "").strip()
-            # Get strength/description for differentiation
-            strength = str(row.get("Strength") or row.get("Description") or "").strip()
-
-            matches.append({
-                "ndc": ndc,
-                "drug_name": drug_name,
-                "manufacturer": manufacturer,
-                "strength": strength,
-            })
+    columns = catalog.columns
+
+    def coalesce_text(names: list[str]) -> pl.Expr:
+        present = [pl.col(c).cast(pl.Utf8) for c in names if c in columns]
+        return pl.coalesce(present + [pl.lit("")]).str.strip_chars()
+
+    # Uppercasing and the substring test run as vectorized kernels over
+    # the whole catalog instead of one Python check per row
+    selected = (
+        catalog.lazy()
+        .select(
+            drug_name=coalesce_text(["Drug Name", "Trade Name"]),
+            ndc=coalesce_text(["NDC"]),
+            manufacturer=coalesce_text(["Manufacturer", "MANUFACTURER"]),
+            # Strength/description for differentiation
+            strength=coalesce_text(["Strength", "Description"]),
+        )
+        .filter(
+            pl.col("drug_name")
+            .str.to_uppercase()
+            .str.contains(query_upper, literal=True)
+        )
+        .collect()
+    )
 
-    return matches
+    return [
+        {
+            "ndc": ndc,
+            "drug_name": drug_name,
+            "manufacturer": manufacturer,
+            "strength": strength,
+        }
+        for drug_name, ndc, manufacturer, strength in selected.iter_rows()
+    ]
 
 
 def render_drug_search(
@@ -200,7 +243,10 @@ def render_drug_search(
                 del st.session_state[state_key]
                 st.rerun()
 
-    # Search form with Enter key support
+    # Search form with Enter key support. The form also serves as the
+    # debounce: text typed inside a form never triggers a rerun, so the
+    # catalog scan only fires on explicit submission (button or Enter),
+    # not per keystroke.
     with st.form(key=f"{key_prefix}_form", clear_on_submit=False):
         col1, col2 = st.columns([4, 1])
 
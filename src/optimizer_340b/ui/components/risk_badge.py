@@ -1,10 +1,20 @@
 """Risk badge components for IRA and Penny Pricing alerts."""
 
+from functools import lru_cache
+
 import streamlit as st
 
 from optimizer_340b.models import Drug
 from optimizer_340b.risk import check_ira_status
 
+# The penny badge is constant HTML; build it once at import instead of
+# re-concatenating it per table row
+_PENNY_BADGE_HTML = (
+    '<span style="background-color: #ffa726; color: white; '
+    'padding: 2px 8px; border-radius: 4px; font-size: 12px;">'
+    'Penny Pricing</span>'
+)
+
 
 def render_risk_badges(drug: Drug) -> None:
     """Render risk badges for a drug.
@@ -69,9 +79,13 @@ def _render_penny_badge() -> None:
     )
 
 
+@lru_cache(maxsize=1024)
 def render_ira_badge_inline(drug_name: str) -> str:
     """Return HTML for an inline IRA badge.
 
+    The badge depends only on the drug name and the module-constant IRA
+    tables, so results are memoized across render loops.
+
     Args:
         drug_name: Name of the drug to check.
 
@@ -100,14 +114,7 @@ def render_penny_badge_inline(is_penny_priced: bool) -> str:
     Returns:
         HTML string for the badge, or empty string if not applicable.
     """
-    if is_penny_priced:
-        return (
-            '<span style="background-color: #ffa726; color: white; '
-            'padding: 2px 8px; border-radius: 4px; font-size: 12px;">'
-            'Penny Pricing</span>'
-        )
-
-    return ""
+    return _PENNY_BADGE_HTML if is_penny_priced else ""
 
 
 def render_risk_summary(drugs: list[Drug]) -> None:
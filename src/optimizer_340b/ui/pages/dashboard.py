@@ -6,19 +6,18 @@ from decimal import Decimal
 import polars as pl
 import streamlit as st
 
-from optimizer_340b.compute.margins import analyze_drug_margin
+from optimizer_340b.compute.margins_pl import compute_margins_lazy
 from optimizer_340b.compute.retail_pricing import (
     DrugCategory,
     classify_drug_category,
     load_drug_category_lookup,
 )
 from optimizer_340b.ingest.normalizers import normalize_ndc
-from optimizer_340b.models import Drug, MarginAnalysis
-from optimizer_340b.risk import check_ira_status
+from optimizer_340b.risk import ira_name_flags
 from optimizer_340b.risk.penny_pricing import (
     INFLATION_PENALTY_THRESHOLD,
     PENNY_COST_OVERRIDE,
-    build_nadac_lookup,
+    build_nadac_frame,
 )
 from optimizer_340b.risk.retail_validation import (
     build_retail_validation_lookup,
@@ -93,8 +92,9 @@ def render_dashboard_page() -> None:
         else:
             search_query = search_result  # NDC search
 
-    # Get and display opportunities
-    opportunities = _calculate_opportunities(capture_rate)
+    # Get and display opportunities (kept as a float64 frame; Decimal
+    # objects are only materialized for the rows actually rendered)
+    opportunities = _calculate_opportunity_frame(capture_rate)
 
     # Apply filters with context
     filtered, filter_context = _apply_filters_with_context(
@@ -119,112 +119,346 @@ def _check_data_loaded() -> bool:
 
 
 def _render_summary_metrics() -> None:
-    """Render summary metrics at top of dashboard."""
+    """Render summary metrics at top of dashboard.
+
+    The two filter-based counts run as lazy len() aggregations collected
+    together in one collect_all, so no intermediate filtered frame is
+    materialized per metric. The plain heights are O(1) metadata reads
+    and stay as-is.
+    """
     uploaded = st.session_state.get("uploaded_data", {})
 
+    catalog = uploaded.get("catalog")
+    crosswalk = uploaded.get("crosswalk")
+    joined = uploaded.get("joined_data")
+    nadac = uploaded.get("nadac")
+
+    drug_count = catalog.height if catalog is not None else 0
+    hcpcs_count = crosswalk.height if crosswalk is not None else 0
+
+    queries: list[pl.LazyFrame] = []
+    if joined is not None:
+        queries.append(
+            joined.lazy()
+            .filter(pl.col("HCPCS Code").is_not_null())
+            .select(pl.len())
+        )
+    if nadac is not None:
+        queries.append(
+            nadac.lazy()
+            .filter(pl.col("total_discount_340b_pct") >= 95.0)
+            .select(pl.len())
+        )
+
+    counts = iter(pl.collect_all(queries)) if queries else iter(())
+    medical_eligible = next(counts).item() if joined is not None else 0
+    penny_count = next(counts).item() if nadac is not None else 0
+
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        catalog = uploaded.get("catalog")
-        drug_count = catalog.height if catalog is not None else 0
         st.metric("Total Drugs", f"{drug_count:,}")
 
     with col2:
-        crosswalk = uploaded.get("crosswalk")
-        hcpcs_count = crosswalk.height if crosswalk is not None else 0
         st.metric("HCPCS Mappings", f"{hcpcs_count:,}")
 
     with col3:
-        # Calculate medical-eligible drugs
-        joined = uploaded.get("joined_data")
-        if joined is not None:
-            medical_eligible = joined.filter(pl.col("HCPCS Code").is_not_null()).height
-        else:
-            medical_eligible = 0
         st.metric("Medical Eligible", f"{medical_eligible:,}")
 
     with col4:
-        nadac = uploaded.get("nadac")
-        if nadac is not None:
-            penny_count = nadac.filter(
-                pl.col("total_discount_340b_pct") >= 95.0
-            ).height
-        else:
-            penny_count = 0
         st.metric("Penny Pricing", f"{penny_count:,}")
 
 
-def _calculate_opportunities(capture_rate: Decimal) -> list[MarginAnalysis]:
-    """Calculate margin opportunities for all drugs.
+def _calculate_opportunity_frame(capture_rate: Decimal) -> pl.DataFrame:
+    """Calculate margin opportunities for all drugs as a float64 frame.
+
+    The whole dashboard compute path stays in float64 Polars columns
+    (catalog normalization, lookup joins, margin math, ranking); Decimal
+    re-quantization only happens at display time for the rendered rows.
 
     Args:
         capture_rate: Retail capture rate.
 
     Returns:
-        List of MarginAnalysis objects sorted by margin delta.
+        Opportunity DataFrame sorted by margin delta descending (empty if
+        no catalog is loaded or the pipeline fails).
     """
     uploaded = st.session_state.get("uploaded_data", {})
     catalog = uploaded.get("catalog")
-    asp_pricing = uploaded.get("asp_pricing")
-    crosswalk = uploaded.get("crosswalk")
-    nadac = uploaded.get("nadac")
-    noc_pricing = uploaded.get("noc_pricing")
-    noc_crosswalk = uploaded.get("noc_crosswalk")
-    ravenswood_categories = uploaded.get("ravenswood_categories")
 
     if catalog is None:
-        return []
+        return pl.DataFrame()
 
-    # Build drug objects and analyze margins
-    analyses: list[MarginAnalysis] = []
+    try:
+        return _build_opportunity_frame(
+            catalog,
+            crosswalk=uploaded.get("crosswalk"),
+            asp_pricing=uploaded.get("asp_pricing"),
+            nadac=uploaded.get("nadac"),
+            noc_crosswalk=uploaded.get("noc_crosswalk"),
+            noc_pricing=uploaded.get("noc_pricing"),
+            ravenswood_categories=uploaded.get("ravenswood_categories"),
+            capture_rate=float(capture_rate),
+        )
+    except Exception:
+        logger.exception("Opportunity pipeline failed")
+        return pl.DataFrame()
+
+
+def _frame_fingerprint(df: pl.DataFrame) -> object:
+    """Content fingerprint used to key st.cache_data on Polars frames."""
+    try:
+        return int(df.hash_rows().sum() or 0)
+    except Exception:
+        # Nested or otherwise unhashable dtypes: fall back to a cheap
+        # structural key (misses value-only changes, which uploads never
+        # do in place)
+        return (df.shape, tuple(df.columns))
+
+
+@st.cache_data(
+    show_spinner=False,
+    max_entries=8,
+    hash_funcs={pl.DataFrame: _frame_fingerprint},
+)
+def _build_opportunity_frame(
+    catalog: pl.DataFrame,
+    *,
+    crosswalk: pl.DataFrame | None,
+    asp_pricing: pl.DataFrame | None,
+    nadac: pl.DataFrame | None,
+    noc_crosswalk: pl.DataFrame | None,
+    noc_pricing: pl.DataFrame | None,
+    ravenswood_categories: pl.DataFrame | None,
+    capture_rate: float,
+) -> pl.DataFrame:
+    """Build the ranked opportunity frame for the dashboard.
+
+    Normalizes the catalog columns once, left-joins the HCPCS/ASP, NOC,
+    and NADAC sides, tags IRA/category per unique drug name, applies the
+    penny cost override, and computes all pathway margins via
+    compute_margins_lazy — all as Polars operations. Rows whose cost or
+    AWP values fail to parse are dropped, matching the per-row skip the
+    old loop performed.
+
+    The result is memoized with st.cache_data keyed on content
+    fingerprints of the input frames plus the capture rate, so widget
+    interactions that trigger a Streamlit rerun reuse the computed frame
+    instead of re-analyzing the catalog.
+
+    Args:
+        catalog: Uploaded catalog DataFrame.
+        crosswalk: ASP NDC-HCPCS crosswalk (optional).
+        asp_pricing: ASP pricing file (optional).
+        nadac: NADAC statistics (optional).
+        noc_crosswalk: NOC crosswalk for drugs without J-codes (optional).
+        noc_pricing: NOC pricing file (optional).
+        ravenswood_categories: Drug category sheet (optional).
+        capture_rate: Retail capture rate as float.
+
+    Returns:
+        DataFrame sorted by margin_delta descending with one row per
+        analyzable drug.
+    """
+    columns = catalog.columns
+    if "NDC" not in columns:
+        return pl.DataFrame()
+
+    name_cols: list[str] = [
+        c for c in ("Drug Name", "Trade Name", "DRUG_NAME") if c in columns
+    ]
+    mfr_cols: list[str] = [
+        c for c in ("Manufacturer", "MANUFACTURER") if c in columns
+    ]
+    cost_cols: list[str] = [
+        c
+        for c in ("Unit Price (Current Catalog)", "Contract Cost", "CONTRACT_COST")
+        if c in columns
+    ]
+    awp_cols: list[str] = [
+        c for c in ("AWP", "Medispan AWP", "MEDISPAN_AWP") if c in columns
+    ]
+
+    def text_or_unknown(cols: list[str]) -> pl.Expr:
+        if not cols:
+            return pl.lit("Unknown")
+        expr = pl.coalesce(
+            [pl.col(c).cast(pl.Utf8) for c in cols] + [pl.lit("Unknown")]
+        )
+        return (
+            pl.when(expr.str.strip_chars() == "")
+            .then(pl.lit("Unknown"))
+            .otherwise(expr)
+        )
+
+    def numeric_or_zero(cols: list[str]) -> tuple[pl.Expr, pl.Expr]:
+        """Parsed value plus a flag for rows with only unparseable values.
+
+        A row only counts as bad when none of the source columns parse
+        while at least one holds a value — garbage in a fallback column
+        never discards a row whose primary value is fine.
+        """
+        if not cols:
+            return pl.lit(0.0), pl.lit(False)
+        parsed = pl.coalesce(
+            [pl.col(c).cast(pl.Float64, strict=False) for c in cols]
+        )
+        any_present = pl.any_horizontal(
+            [pl.col(c).is_not_null() for c in cols]
+        )
+        return parsed.fill_null(0.0), parsed.is_null() & any_present
+
+    contract_cost, cost_garbage = numeric_or_zero(cost_cols)
+    awp, awp_garbage = numeric_or_zero(awp_cols)
+
+    lf = (
+        catalog.lazy()
+        .select(
+            ndc=pl.col("NDC").cast(pl.Utf8),
+            drug_name=text_or_unknown(name_cols),
+            manufacturer=text_or_unknown(mfr_cols),
+            contract_cost=contract_cost,
+            awp=awp,
+            _bad=cost_garbage | awp_garbage,
+        )
+        .filter(
+            pl.col("ndc").is_not_null() & (pl.col("ndc") != "") & ~pl.col("_bad")
+        )
+        .drop("_bad")
+        .with_columns(
+            ndc_norm=pl.col("ndc")
+            .str.replace_all("-", "")
+            .str.strip_chars()
+            .str.zfill(11)
+            .str.slice(-11)
+        )
+    )
 
-    # Prepare lookup tables
-    hcpcs_lookup = _build_hcpcs_lookup(crosswalk, asp_pricing)
+    # HCPCS/ASP side (primary medical-path source)
+    hcpcs_frame = _build_hcpcs_frame(crosswalk, asp_pricing)
+    if hcpcs_frame is not None:
+        lf = lf.join(
+            hcpcs_frame.lazy().rename(
+                {"ndc": "ndc_norm", "hcpcs": "hcpcs_code"}
+            ),
+            on="ndc_norm",
+            how="left",
+        )
+    else:
+        lf = lf.with_columns(
+            hcpcs_code=pl.lit(None, dtype=pl.Utf8),
+            bill_units=pl.lit(None, dtype=pl.Int64),
+            asp=pl.lit(None, dtype=pl.Float64),
+        )
+
+    # NOC fallback for drugs without permanent J-codes
     noc_lookup = _build_noc_lookup(noc_crosswalk, noc_pricing)
+    if noc_lookup:
+        noc_frame = pl.LazyFrame(
+            {
+                "ndc_norm": list(noc_lookup),
+                "noc_asp": [float(v["asp"]) for v in noc_lookup.values()],  # type: ignore[arg-type]
+                "noc_bill_units": [
+                    int(v["bill_units"])  # type: ignore[call-overload]
+                    for v in noc_lookup.values()
+                ],
+            }
+        )
+        noc_hit = pl.col("asp").is_null() & pl.col("noc_asp").is_not_null()
+        lf = (
+            lf.join(noc_frame, on="ndc_norm", how="left")
+            .with_columns(
+                hcpcs_code=pl.when(noc_hit)
+                .then(pl.lit("NOC"))
+                .otherwise(pl.col("hcpcs_code")),
+                bill_units=pl.when(noc_hit)
+                .then(pl.col("noc_bill_units"))
+                .otherwise(pl.col("bill_units")),
+                asp=pl.coalesce(pl.col("asp"), pl.col("noc_asp")),
+            )
+            .drop("noc_asp", "noc_bill_units")
+        )
 
-    # Build enhanced NADAC lookup with penny cost override and inflation
+    lf = lf.with_columns(bill_units=pl.col("bill_units").fill_null(1))
+
+    # NADAC side: penny flag, cost override, and most recent price
     if nadac is not None:
-        nadac_enhanced = build_nadac_lookup(nadac)
+        nadac_frame = build_nadac_frame(nadac)
+        lf = lf.join(
+            nadac_frame.lazy()
+            .select(
+                ndc_norm=pl.col("ndc"),
+                nadac_price=pl.col("nadac_price"),
+                penny_pricing_flag=pl.col("is_penny"),
+            )
+            .unique(subset="ndc_norm", keep="last", maintain_order=True),
+            on="ndc_norm",
+            how="left",
+        )
     else:
-        nadac_enhanced = {}
+        lf = lf.with_columns(
+            nadac_price=pl.lit(None, dtype=pl.Float64),
+            penny_pricing_flag=pl.lit(None, dtype=pl.Boolean),
+        )
+
+    # Apply penny cost override per manifest:
+    # "If penny_pricing == 'Yes', override Cost_Basis to $0.01"
+    lf = lf.with_columns(
+        penny_pricing_flag=pl.col("penny_pricing_flag").fill_null(False)
+    ).with_columns(
+        contract_cost=pl.when(pl.col("penny_pricing_flag"))
+        .then(float(PENNY_COST_OVERRIDE))
+        .otherwise(pl.col("contract_cost"))
+    )
 
-    # Build drug category lookup from Ravenswood (if available)
+    # IRA and category flags depend only on the drug name: resolve each
+    # unique name once and join back. IRA tagging runs as one vectorized
+    # contains_any kernel over the unique names; only category
+    # classification still needs a per-name call.
     if ravenswood_categories is not None:
         category_lookup = load_drug_category_lookup(ravenswood_categories)
     else:
         category_lookup = {}
 
-    for row in catalog.iter_rows(named=True):
-        try:
-            drug = _row_to_drug(
-                row, hcpcs_lookup, nadac_enhanced, noc_lookup, category_lookup
-            )
-            if drug is not None:
-                analysis = analyze_drug_margin(drug, capture_rate)
-                analyses.append(analysis)
-        except Exception as e:
-            logger.debug(f"Error analyzing drug: {e}")
-            continue
+    unique_names = lf.select("drug_name").unique().collect()["drug_name"]
+    name_traits = pl.LazyFrame(
+        {
+            "drug_name": unique_names,
+            "ira_flag": ira_name_flags(unique_names),
+            "is_brand": [
+                classify_drug_category(name, category_lookup)
+                != DrugCategory.GENERIC
+                for name in unique_names
+            ],
+        }
+    )
+    lf = lf.join(name_traits, on="drug_name", how="left").with_columns(
+        ira_flag=pl.col("ira_flag").fill_null(False),
+        is_brand=pl.col("is_brand").fill_null(True),
+    )
 
-    # Sort by margin delta descending
-    analyses.sort(key=lambda a: a.margin_delta, reverse=True)
+    # Margin math and recommendation as vector expressions. No full sort
+    # here: ranking happens at render time via a top_k partial selection
+    # over whatever subset survives the filters.
+    lf = compute_margins_lazy(lf, capture_rate).with_columns(
+        retail_gross_margin=pl.col("awp") * 0.85 - pl.col("contract_cost")
+    )
 
-    return analyses
+    return lf.collect()
 
 
-def _build_hcpcs_lookup(
+def _build_hcpcs_frame(
     crosswalk: pl.DataFrame | None,
     asp_pricing: pl.DataFrame | None,
-) -> dict[str, dict[str, object]]:
-    """Build HCPCS lookup from crosswalk and ASP pricing.
+) -> pl.DataFrame | None:
+    """Build the normalized NDC -> HCPCS/ASP frame for vectorized joins.
 
     Returns:
-        Dictionary mapping normalized NDC to HCPCS info.
+        DataFrame with columns ndc (normalized), hcpcs, bill_units, asp —
+        one row per NDC — or None when the inputs are unusable.
     """
     if crosswalk is None or asp_pricing is None:
-        return {}
-
-    lookup: dict[str, dict[str, object]] = {}
+        return None
 
     # Normalize column names for crosswalk
     ndc_col = "NDC" if "NDC" in crosswalk.columns else "NDC2"
@@ -233,13 +467,12 @@ def _build_hcpcs_lookup(
     )
 
     if ndc_col not in crosswalk.columns or hcpcs_col not in crosswalk.columns:
-        return {}
+        return None
 
-    # Build ASP pricing lookup by HCPCS
-    # IMPORTANT: CMS Payment Limit already includes 6% markup (Payment Limit = ASP × 1.06)
-    # We must back-calculate the true ASP for correct margin calculations
+    # Build ASP pricing side by HCPCS, normalized and cast columnwise.
+    # IMPORTANT: CMS Payment Limit already includes 6% markup (Payment Limit
+    # = ASP × 1.06); back-calculate the true ASP for correct margins.
     PAYMENT_LIMIT_MARKUP = 1.06
-    asp_lookup: dict[str, float] = {}
     payment_col = (
         "Payment Limit"
         if "Payment Limit" in asp_pricing.columns
@@ -247,33 +480,109 @@ def _build_hcpcs_lookup(
     )
 
     if payment_col in asp_pricing.columns and "HCPCS Code" in asp_pricing.columns:
-        for row in asp_pricing.iter_rows(named=True):
-            hcpcs = row.get("HCPCS Code")
-            payment = row.get(payment_col)
-            if hcpcs and payment:
-                # Handle N/A and other non-numeric values
-                try:
-                    payment_limit = float(payment)
-                    # Back-calculate true ASP from Payment Limit
-                    true_asp = payment_limit / PAYMENT_LIMIT_MARKUP
-                    asp_lookup[str(hcpcs).upper()] = true_asp
-                except (ValueError, TypeError):
-                    continue  # Skip non-numeric payment values
+        asp_side = (
+            asp_pricing.lazy()
+            .select(
+                hcpcs=pl.col("HCPCS Code").cast(pl.Utf8).str.to_uppercase(),
+                # strict=False turns "N/A" and other non-numerics into nulls
+                asp=pl.col(payment_col).cast(pl.Float64, strict=False)
+                / PAYMENT_LIMIT_MARKUP,
+            )
+            .filter(
+                pl.col("hcpcs").is_not_null()
+                & (pl.col("hcpcs") != "")
+                & pl.col("asp").is_not_null()
+                & (pl.col("asp") != 0.0)
+            )
+            # Later rows win, matching the dict-overwrite the loop had
+            .unique(subset="hcpcs", keep="last")
+        )
+    else:
+        asp_side = pl.LazyFrame(schema={"hcpcs": pl.Utf8, "asp": pl.Float64})
 
-    # Build combined lookup
-    for row in crosswalk.iter_rows(named=True):
-        ndc = str(row.get(ndc_col, "")).replace("-", "").strip()
-        hcpcs = str(row.get(hcpcs_col, "")).upper().strip()
+    bill_units = (
+        pl.col("Billing Units Per Package").cast(pl.Int64, strict=False)
+        if "Billing Units Per Package" in crosswalk.columns
+        else pl.lit(None, dtype=pl.Int64)
+    )
 
-        if ndc and hcpcs:
-            asp = asp_lookup.get(hcpcs)
-            bill_units = row.get("Billing Units Per Package", 1) or 1
+    return (
+        crosswalk.lazy()
+        .select(
+            ndc=pl.col(ndc_col)
+            .cast(pl.Utf8)
+            .str.replace_all("-", "")
+            .str.strip_chars(),
+            hcpcs=pl.col(hcpcs_col).cast(pl.Utf8).str.to_uppercase()
+            .str.strip_chars(),
+            bill_units=bill_units.fill_null(1),
+        )
+        .filter(
+            pl.col("ndc").is_not_null()
+            & (pl.col("ndc") != "")
+            & pl.col("hcpcs").is_not_null()
+            & (pl.col("hcpcs") != "")
+        )
+        # The join does not guarantee left-row order, so pin the crosswalk
+        # order with a row index and restore it before the dedup
+        .with_row_index("_row")
+        .join(asp_side, on="hcpcs", how="left")
+        .sort("_row")
+        # Duplicate NDCs keep the last crosswalk row, matching
+        # dict-overwrite order
+        .unique(subset="ndc", keep="last", maintain_order=True)
+        .drop("_row")
+        .collect()
+    )
 
-            lookup[ndc] = {
-                "hcpcs_code": hcpcs,
-                "asp": asp,
-                "bill_units": int(bill_units),
-            }
+
+# Built lookups keyed by input-frame identity (frames pinned in the value)
+# so page reruns don't rebuild the dict for unchanged uploads
+_HCPCS_LOOKUP_CACHE: dict[
+    tuple[int, int],
+    tuple[pl.DataFrame, pl.DataFrame, dict[str, dict[str, object]]],
+] = {}
+_HCPCS_LOOKUP_CACHE_MAX = 4
+
+
+def _build_hcpcs_lookup(
+    crosswalk: pl.DataFrame | None,
+    asp_pricing: pl.DataFrame | None,
+) -> dict[str, dict[str, object]]:
+    """Build HCPCS lookup from crosswalk and ASP pricing.
+
+    Memoized per input-frame identity; uploaded frames are immutable for
+    the session, so repeat calls return the cached dict.
+
+    Returns:
+        Dictionary mapping normalized NDC to HCPCS info.
+    """
+    if crosswalk is not None and asp_pricing is not None:
+        key = (id(crosswalk), id(asp_pricing))
+        cached = _HCPCS_LOOKUP_CACHE.get(key)
+        if (
+            cached is not None
+            and cached[0] is crosswalk
+            and cached[1] is asp_pricing
+        ):
+            return cached[2]
+
+    frame = _build_hcpcs_frame(crosswalk, asp_pricing)
+    if frame is None:
+        return {}
+
+    # One pass with no per-row string/regex work
+    lookup: dict[str, dict[str, object]] = {
+        ndc: {"hcpcs_code": hcpcs, "asp": asp, "bill_units": units}
+        for ndc, hcpcs, units, asp in frame.iter_rows()
+    }
+
+    # Type narrowing: a built frame implies both inputs were present
+    assert crosswalk is not None and asp_pricing is not None
+
+    if len(_HCPCS_LOOKUP_CACHE) >= _HCPCS_LOOKUP_CACHE_MAX:
+        _HCPCS_LOOKUP_CACHE.pop(next(iter(_HCPCS_LOOKUP_CACHE)))
+    _HCPCS_LOOKUP_CACHE[key] = (crosswalk, asp_pricing, lookup)
 
     return lookup
 
@@ -344,226 +653,81 @@ def _build_noc_lookup(
     return lookup
 
 
-def _row_to_drug(
-    row: dict[str, object],
-    hcpcs_lookup: dict[str, dict[str, object]],
-    nadac_lookup: dict[str, dict[str, object]],
-    noc_lookup: dict[str, dict[str, object]] | None = None,
-    category_lookup: dict[str, DrugCategory] | None = None,
-) -> Drug | None:
-    """Convert a catalog row to a Drug object.
-
-    Args:
-        row: Row from catalog DataFrame.
-        hcpcs_lookup: HCPCS/ASP lookup by NDC.
-        nadac_lookup: Enhanced NADAC lookup with penny override and inflation.
-        noc_lookup: NOC fallback lookup by NDC (for drugs without J-codes).
-        category_lookup: Drug category lookup from Ravenswood matrix.
-
-    Returns:
-        Drug object or None if invalid.
-    """
-    # Get NDC
-    ndc = str(row.get("NDC", ""))
-    if not ndc:
-        return None
-
-    ndc_normalized = ndc.replace("-", "").strip().zfill(11)[-11:]
-
-    # Get drug name (handle different column names)
-    drug_name = (
-        row.get("Drug Name")
-        or row.get("Trade Name")
-        or row.get("DRUG_NAME")
-        or "Unknown"
-    )
-
-    # Get manufacturer
-    manufacturer = row.get("Manufacturer") or row.get("MANUFACTURER") or "Unknown"
-
-    # Get contract cost (340B acquisition cost from Unit Price Current Catalog)
-    contract_cost = (
-        row.get("Unit Price (Current Catalog)")
-        or row.get("Contract Cost")
-        or row.get("CONTRACT_COST")
-        or 0
-    )
-    try:
-        contract_cost = Decimal(str(contract_cost))
-    except Exception:
-        return None
-
-    # Get AWP (handle different column names)
-    awp = row.get("AWP") or row.get("Medispan AWP") or row.get("MEDISPAN_AWP") or 0
-    try:
-        awp = Decimal(str(awp))
-    except Exception:
-        return None
-
-    # Lookup HCPCS/ASP info (primary source)
-    hcpcs_info = hcpcs_lookup.get(ndc_normalized, {})
-    asp = hcpcs_info.get("asp")
-    hcpcs_code = hcpcs_info.get("hcpcs_code")
-    bill_units = hcpcs_info.get("bill_units", 1)
-
-    # NOC fallback: if not in ASP crosswalk, check NOC crosswalk
-    if asp is None and noc_lookup:
-        noc_info = noc_lookup.get(ndc_normalized, {})
-        if noc_info:
-            asp = noc_info.get("asp")
-            bill_units = noc_info.get("bill_units", 1)
-            # NOC drugs use generic codes, mark as NOC for display
-            hcpcs_code = "NOC"  # Indicates Not Otherwise Classified
-
-    # Lookup NADAC info (enhanced with penny override and inflation)
-    nadac_info = nadac_lookup.get(ndc_normalized, {})
-    penny_pricing = nadac_info.get("is_penny_priced", False)
-
-    # Apply penny cost override per manifest:
-    # "If penny_pricing == 'Yes', override Cost_Basis to $0.01"
-    if penny_pricing and nadac_info.get("override_cost"):
-        contract_cost = nadac_info["override_cost"]
-        logger.debug(f"Applied penny cost override for NDC {ndc}: ${contract_cost}")
-
-    # Check for high inflation penalty (>20%)
-    inflation_penalty = nadac_info.get("inflation_penalty_pct")
-    has_inflation_flag = nadac_info.get("has_inflation_penalty", False)
-
-    # Get NADAC price (most recent)
-    nadac_price = nadac_info.get("nadac_price")
-
-    # Check IRA status
-    ira_status = check_ira_status(str(drug_name))
-    ira_flag = ira_status.get("is_ira_drug", False)
-
-    # Classify drug category (for retail pricing multiplier)
-    drug_category = classify_drug_category(str(drug_name), category_lookup)
-    # Brand/Specialty use 85% AWP, Generic uses 20% AWP
-    is_brand = drug_category != DrugCategory.GENERIC
-
-    return Drug(
-        ndc=ndc,
-        drug_name=str(drug_name),
-        manufacturer=str(manufacturer),
-        contract_cost=contract_cost,
-        awp=awp,
-        asp=Decimal(str(asp)) if asp else None,
-        hcpcs_code=str(hcpcs_code) if hcpcs_code else None,
-        bill_units_per_package=int(str(bill_units)) if bill_units else 1,
-        is_brand=is_brand,
-        ira_flag=bool(ira_flag),
-        penny_pricing_flag=bool(penny_pricing),
-        nadac_price=nadac_price,
-    )
-
-
-def _apply_filters(
-    analyses: list[MarginAnalysis],
-    search_query: str = "",
-    show_ira_only: bool = False,
-    hide_penny: bool = True,
-    min_delta: Decimal = Decimal("0"),
-) -> list[MarginAnalysis]:
-    """Apply filters to opportunity list.
-
-    Args:
-        analyses: List of MarginAnalysis objects.
-        search_query: Drug name, NDC, or HCPCS code search.
-        show_ira_only: Show only IRA-affected drugs.
-        hide_penny: Hide penny-priced drugs.
-        min_delta: Minimum margin delta.
-
-    Returns:
-        Filtered list of analyses.
-    """
-    filtered = analyses
-
-    # Search filter - supports drug name, NDC (11-digit or 5-4-2 format), or HCPCS code
-    if search_query:
-        query = search_query.upper()
-        query_ndc = normalize_ndc(search_query)  # Normalize for NDC matching
-        filtered = [
-            a for a in filtered
-            if query in a.drug.drug_name.upper()
-            or query_ndc in a.drug.ndc
-            or query in a.drug.ndc  # Also check raw query for partial matches
-            or (a.drug.hcpcs_code and query == a.drug.hcpcs_code.upper())  # HCPCS match
-        ]
-
-    # IRA filter
-    if show_ira_only:
-        filtered = [a for a in filtered if a.drug.ira_flag]
-
-    # Penny pricing filter
-    if hide_penny:
-        filtered = [a for a in filtered if not a.drug.penny_pricing_flag]
-
-    # Margin delta filter
-    filtered = [a for a in filtered if a.margin_delta >= min_delta]
-
-    return filtered
-
-
 def _apply_filters_with_context(
-    analyses: list[MarginAnalysis],
+    opportunities: pl.DataFrame,
     search_query: str = "",
     show_ira_only: bool = False,
     hide_penny: bool = True,
     min_delta: Decimal = Decimal("0"),
-) -> tuple[list[MarginAnalysis], dict[str, int]]:
+) -> tuple[pl.DataFrame, dict[str, int]]:
     """Apply filters and return context about what was filtered.
 
+    The filters are built as cumulative boolean masks and evaluated in a
+    single pass over the opportunity frame: one select computes all the
+    hidden-by counts from the mask sums, and one filter produces the
+    surviving rows — no intermediate frames per filter stage.
+
     Returns:
-        Tuple of (filtered list, context dict with counts).
+        Tuple of (filtered frame, context dict with counts).
     """
     context: dict[str, int] = {
-        "total": len(analyses),
+        "total": opportunities.height,
         "search_matches": 0,
         "hidden_by_ira": 0,
         "hidden_by_penny": 0,
         "hidden_by_delta": 0,
     }
 
-    filtered = analyses
+    if opportunities.is_empty():
+        return opportunities, context
 
     # Search filter - supports drug name, NDC (11-digit or 5-4-2 format), or HCPCS code
+    mask_search = pl.lit(True)
     if search_query:
         query = search_query.upper()
         query_ndc = normalize_ndc(search_query)  # Normalize for NDC matching
-        search_results = [
-            a for a in filtered
-            if query in a.drug.drug_name.upper()
-            or query_ndc in a.drug.ndc
-            or query in a.drug.ndc  # Also check raw query for partial matches
-            or (a.drug.hcpcs_code and query == a.drug.hcpcs_code.upper())  # HCPCS match
-        ]
-        context["search_matches"] = len(search_results)
-        filtered = search_results
-    else:
-        context["search_matches"] = len(filtered)
+        mask_search = (
+            pl.col("drug_name").str.to_uppercase().str.contains(query, literal=True)
+            | pl.col("ndc").str.contains(query_ndc, literal=True)
+            # Also check raw query for partial matches
+            | pl.col("ndc").str.contains(query, literal=True)
+            # HCPCS match (null codes compare as false)
+            | (pl.col("hcpcs_code").str.to_uppercase() == query).fill_null(False)
+        )
 
-    # IRA filter
-    if show_ira_only:
-        before_ira = len(filtered)
-        filtered = [a for a in filtered if a.drug.ira_flag]
-        context["hidden_by_ira"] = before_ira - len(filtered)
+    # Each stage narrows the previous one, so the counts reflect what each
+    # filter hid from the rows still standing — as the sequential version did
+    mask_ira = mask_search & pl.col("ira_flag") if show_ira_only else mask_search
+    mask_penny = (
+        mask_ira & ~pl.col("penny_pricing_flag") if hide_penny else mask_ira
+    )
+    mask_final = mask_penny & (pl.col("margin_delta") >= float(min_delta))
 
-    # Penny pricing filter
+    # Disabled stages reuse the previous mask, so their counts are implied;
+    # only the active masks are summed (a bare lit(True) would sum to 1)
+    count_exprs: dict[str, pl.Expr] = {"final": mask_final.sum()}
+    if search_query:
+        count_exprs["search"] = mask_search.sum()
+    if show_ira_only:
+        count_exprs["ira"] = mask_ira.sum()
     if hide_penny:
-        before_penny = len(filtered)
-        filtered = [a for a in filtered if not a.drug.penny_pricing_flag]
-        context["hidden_by_penny"] = before_penny - len(filtered)
+        count_exprs["penny"] = mask_penny.sum()
 
-    # Margin delta filter
-    before_delta = len(filtered)
-    filtered = [a for a in filtered if a.margin_delta >= min_delta]
-    context["hidden_by_delta"] = before_delta - len(filtered)
+    counts = opportunities.select(**count_exprs).row(0, named=True)
+    search_count = counts.get("search", context["total"])
+    ira_count = counts.get("ira", search_count)
+    penny_count = counts.get("penny", ira_count)
 
-    return filtered, context
+    context["search_matches"] = search_count
+    context["hidden_by_ira"] = search_count - ira_count
+    context["hidden_by_penny"] = ira_count - penny_count
+    context["hidden_by_delta"] = penny_count - counts["final"]
+
+    return opportunities.filter(mask_final), context
 
 
 def _render_filter_summary(
-    filtered: list[MarginAnalysis],
+    filtered: pl.DataFrame,
     context: dict[str, int],
     search_query: str,
 ) -> None:
@@ -571,7 +735,7 @@ def _render_filter_summary(
     if search_query:
         # Show search-specific context
         matches = context["search_matches"]
-        shown = len(filtered)
+        shown = filtered.height
         hidden = matches - shown
 
         if hidden > 0:
@@ -596,60 +760,77 @@ def _render_filter_summary(
             )
     else:
         # No search - show total context
-        st.markdown(f"**Showing {len(filtered)} of {context['total']} drugs**")
+        st.markdown(f"**Showing {filtered.height} of {context['total']} drugs**")
+
 
+def _format_currency_column(values: pl.Series) -> list[str]:
+    """Format a float margin column for display ($ with thousands grouping).
 
-def _render_opportunity_table(analyses: list[MarginAnalysis]) -> None:
-    """Render the opportunity table with clickable rows."""
-    if not analyses:
+    Thousands grouping is not expressible in pl.format, so this runs as a
+    per-value loop — bounded by the 100-row display limit.
+    """
+    return [f"${v:,.2f}" if v is not None else "N/A" for v in values]
+
+
+def _render_opportunity_table(opportunities: pl.DataFrame) -> None:
+    """Render the opportunity table with clickable rows.
+
+    The display frame is built column-by-column straight from the
+    opportunity frame — no Drug/MarginAnalysis objects and no list of
+    per-row dicts. NDC formatting and risk badges run as vectorized
+    expressions; only the currency strings loop over the 100 shown rows.
+    """
+    if opportunities.is_empty():
         st.info("No opportunities match the current filters.")
         return
 
-    # Prepare data for display
-    table_data = []
-
-    for analysis in analyses[:100]:  # Limit to top 100 for performance
-        drug = analysis.drug
-
-        # Build risk flags as plain text (HTML doesn't render in dataframes)
-        flags = []
-        if drug.ira_flag:
-            flags.append("⚠️ IRA")
-        if drug.penny_pricing_flag:
-            flags.append("💰 Penny")
-        risk_text = " | ".join(flags) if flags else ""
-
-        # Determine best margin
-        best_margin = analysis.retail_net_margin
-        if analysis.commercial_margin and analysis.commercial_margin > best_margin:
-            best_margin = analysis.commercial_margin
-        if analysis.medicare_margin and analysis.medicare_margin > best_margin:
-            best_margin = analysis.medicare_margin
-
-        table_data.append({
-            "Drug": drug.drug_name,
-            "NDC": drug.ndc_formatted,
-            "Best Margin": f"${best_margin:,.2f}",
-            "Retail": f"${analysis.retail_net_margin:,.2f}",
-            "Medicare": (
-                f"${analysis.medicare_margin:,.2f}"
-                if analysis.medicare_margin else "N/A"
-            ),
-            "Commercial": (
-                f"${analysis.commercial_margin:,.2f}"
-                if analysis.commercial_margin else "N/A"
-            ),
-            "Recommendation": analysis.recommended_path.value.replace("_", " "),
-            "Delta": f"${analysis.margin_delta:,.2f}",
-            "Risk": risk_text,
-        })
+    # Top 100 via O(N) partial selection instead of a full sort; only the
+    # 100 selected rows are then sorted for display order
+    top = opportunities.top_k(100, by="margin_delta").sort(
+        "margin_delta", descending=True
+    )
 
-    # Create DataFrame
-    df = pl.DataFrame(table_data)
+    derived = top.select(
+        ndc_formatted=pl.format(
+            "{}-{}-{}",
+            pl.col("ndc_norm").str.slice(0, 5),
+            pl.col("ndc_norm").str.slice(5, 4),
+            pl.col("ndc_norm").str.slice(9, 2),
+        ),
+        best_margin=pl.max_horizontal(
+            "retail_net_margin", "medicare_margin", "commercial_margin"
+        ),
+        # Risk flags as plain text (HTML doesn't render in dataframes);
+        # four possible combinations, folded into one when-chain
+        risk=pl.when(pl.col("ira_flag") & pl.col("penny_pricing_flag"))
+        .then(pl.lit("⚠️ IRA | 💰 Penny"))
+        .when(pl.col("ira_flag"))
+        .then(pl.lit("⚠️ IRA"))
+        .when(pl.col("penny_pricing_flag"))
+        .then(pl.lit("💰 Penny"))
+        .otherwise(pl.lit("")),
+        recommendation=pl.col("recommended_path").str.replace_all("_", " "),
+    )
+
+    df = pl.DataFrame(
+        {
+            "Drug": top["drug_name"],
+            "NDC": derived["ndc_formatted"],
+            "Best Margin": _format_currency_column(derived["best_margin"]),
+            "Retail": _format_currency_column(top["retail_net_margin"]),
+            "Medicare": _format_currency_column(top["medicare_margin"]),
+            "Commercial": _format_currency_column(top["commercial_margin"]),
+            "Recommendation": derived["recommendation"],
+            "Delta": _format_currency_column(top["margin_delta"]),
+            "Risk": derived["risk"],
+        }
+    )
 
-    # Display with st.dataframe for performance
+    # Display with st.dataframe for performance; pyarrow-backed columns
+    # hand the Arrow buffers to pandas zero-copy instead of materializing
+    # NumPy object arrays of strings
     st.dataframe(
-        df.to_pandas(),
+        df.to_pandas(use_pyarrow_extension_array=True),
         width="stretch",
         hide_index=True,
         column_config={
@@ -665,8 +846,9 @@ def _render_opportunity_table(analyses: list[MarginAnalysis]) -> None:
     st.markdown("**View Drug Details** - Select drug, then go to Drug Detail page")
 
     cols = st.columns(5)
-    for i, analysis in enumerate(analyses[:5]):
+    detail_rows = top.select("drug_name", "ndc").head(5)
+    for i, (drug_name, ndc) in enumerate(detail_rows.iter_rows()):
         with cols[i]:
-            if st.button(analysis.drug.drug_name, key=f"detail_{i}"):
-                st.session_state.selected_drug = analysis.drug.ndc
-                st.info(f"Selected {analysis.drug.drug_name}. Go to Drug Detail.")
+            if st.button(drug_name, key=f"detail_{i}"):
+                st.session_state.selected_drug = ndc
+                st.info(f"Selected {drug_name}. Go to Drug Detail.")
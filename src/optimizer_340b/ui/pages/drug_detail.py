@@ -1,25 +1,65 @@
 """Drug detail page for 340B Optimizer - Single drug deep-dive."""
 
 import logging
+import re
+from dataclasses import replace
 from decimal import Decimal
 
-import plotly.graph_objects as go  # type: ignore[import-untyped]
+import numpy as np
+import polars as pl
 import streamlit as st
 
 from optimizer_340b.compute.dosing import apply_loading_dose_logic
 from optimizer_340b.compute.margins import (
+    AWP_BRAND_FACTOR,
+    AWP_GENERIC_FACTOR,
+    MEDICARE_ASP_MULTIPLIER,
     analyze_drug_margin,
     analyze_drug_margin_5pathway,
     calculate_margin_sensitivity,
 )
+from optimizer_340b.compute.retail_pricing import (
+    DrugCategory,
+    classify_drug_category,
+)
 from optimizer_340b.ingest.normalizers import normalize_ndc
 from optimizer_340b.models import Drug, MarginAnalysis
-from optimizer_340b.risk import check_ira_status
+from optimizer_340b.risk import get_ira_risk_status
+from optimizer_340b.risk.penny_pricing import build_nadac_lookup
 from optimizer_340b.ui.components.drug_search import render_drug_search
 from optimizer_340b.ui.components.risk_badge import render_risk_badges
+from optimizer_340b.ui.pages.dashboard import _build_hcpcs_lookup
 
 logger = logging.getLogger(__name__)
 
+# Shape of a parseable price string; checked before Decimal construction so
+# dirty catalog values never pay for exception raising/dispatch
+_NUMERIC_RE = re.compile(r"^-?\d+(\.\d+)?$")
+
+
+def _parse_price(value: object) -> Decimal | None:
+    """Parse a raw catalog price value without raising on dirty data.
+
+    Numeric types convert directly; strings are validated with a
+    precompiled pattern first, so malformed values (e.g. "N/A") return
+    None instead of costing an exception.
+
+    Args:
+        value: Raw cell value from an uploaded frame.
+
+    Returns:
+        Decimal value, or None when the value is missing or unparseable.
+    """
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)  # exact, no string round-trip
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, str) and _NUMERIC_RE.match(value.strip()):
+        return Decimal(value.strip())
+    return None
+
 
 def render_drug_detail_page() -> None:
     """Render the drug detail page.
@@ -48,9 +88,36 @@ def render_drug_detail_page() -> None:
 
     st.markdown("---")
 
-    # Margin Analysis with 5 pathways
+    # Margin Analysis with 5 pathways (parameter-dependent block runs as
+    # an isolated fragment)
     st.markdown("### Margin Analysis")
+    _render_margin_analysis_block(drug)
+
+    st.markdown("---")
+
+    # Sensitivity analysis (uses legacy analysis for now)
+    st.markdown("### Capture Rate Sensitivity")
+    _render_sensitivity_chart(drug)
+
+    st.markdown("---")
+
+    # Loading dose analysis (if biologic)
+    if drug.is_biologic or _has_loading_dose(drug):
+        st.markdown("### Loading Dose Impact")
+        _render_loading_dose_analysis(drug)
+        st.markdown("---")
+
+
+@st.fragment
+def _render_margin_analysis_block(drug: Drug) -> None:
+    """Render the parameter inputs, margin cards, and provenance chain.
 
+    Runs as a fragment: tweaking any of the analysis parameters reruns
+    only this block, so the sensitivity chart, loading-dose section, and
+    search above are untouched by parameter interactions. The provenance
+    chain lives inside the fragment because it displays the same
+    parameters and must stay in sync with them.
+    """
     # Configurable inputs in expander
     with st.expander("Adjust Analysis Parameters", expanded=False):
         param_col1, param_col2, param_col3 = st.columns(3)
@@ -117,18 +184,6 @@ def render_drug_detail_page() -> None:
 
     st.markdown("---")
 
-    # Sensitivity analysis (uses legacy analysis for now)
-    st.markdown("### Capture Rate Sensitivity")
-    _render_sensitivity_chart(drug)
-
-    st.markdown("---")
-
-    # Loading dose analysis (if biologic)
-    if drug.is_biologic or _has_loading_dose(drug):
-        st.markdown("### Loading Dose Impact")
-        _render_loading_dose_analysis(drug, analysis)
-        st.markdown("---")
-
     # Provenance chain
     st.markdown("### Calculation Provenance")
     _render_provenance_chain(
@@ -205,6 +260,56 @@ def _get_or_search_drug() -> Drug | None:
     return None
 
 
+# Built lookups keyed by frame identity with the frame pinned in the
+# value (matching the risk-module caches), so a recycled id() after a
+# re-upload can never alias a new frame
+_NDC_INDEX_CACHE: dict[int, tuple[pl.DataFrame, dict[str, int]]] = {}
+_BIOLOGIC_NAMES_CACHE: dict[int, tuple[pl.DataFrame, tuple[str, ...]]] = {}
+_FRAME_CACHE_MAX = 4
+
+
+def _get_ndc_index(catalog: pl.DataFrame) -> dict[str, int]:
+    """Map normalized NDC to row index for the uploaded catalog.
+
+    Built once per catalog (keyed by frame identity, with the frame
+    pinned in the cache value — uploads are immutable for the session),
+    with normalization running as a single Polars kernel. Lookups
+    afterwards are O(1) dict probes instead of an O(N) per-click scan.
+
+    Args:
+        catalog: Uploaded catalog DataFrame.
+
+    Returns:
+        Dictionary mapping normalized NDC to its first row index.
+    """
+    cached = _NDC_INDEX_CACHE.get(id(catalog))
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+
+    if "ndc_normalized" in catalog.columns:
+        normalized = catalog["ndc_normalized"]
+    else:
+        normalized = (
+            catalog["NDC"]
+            .cast(pl.Utf8)
+            .str.replace_all(r"[^0-9]", "")
+            .str.zfill(11)
+            .str.slice(-11)
+        )
+
+    index: dict[str, int] = {}
+    for i, norm in enumerate(normalized.to_list()):
+        if norm is not None:
+            # First occurrence wins, matching the old scan's first match
+            index.setdefault(norm, i)
+
+    if len(_NDC_INDEX_CACHE) >= _FRAME_CACHE_MAX:
+        _NDC_INDEX_CACHE.pop(next(iter(_NDC_INDEX_CACHE)))
+    _NDC_INDEX_CACHE[id(catalog)] = (catalog, index)
+
+    return index
+
+
 def _lookup_drug_by_ndc(ndc: str) -> Drug | None:
     """Look up drug by NDC from uploaded data.
 
@@ -216,15 +321,13 @@ def _lookup_drug_by_ndc(ndc: str) -> Drug | None:
     if catalog is None:
         return _create_demo_drug("HUMIRA")  # Fallback to demo
 
-    # Normalize input NDC for matching
-    ndc_normalized = normalize_ndc(ndc)
+    # O(1) probe against the cached normalized index
+    row_idx = _get_ndc_index(catalog).get(normalize_ndc(ndc))
 
-    for row in catalog.iter_rows(named=True):
-        row_ndc = normalize_ndc(str(row.get("NDC", "")))
-        if row_ndc == ndc_normalized:
-            return _row_to_drug(row)
+    if row_idx is None:
+        return None
 
-    return None
+    return _row_to_drug(catalog.row(row_idx, named=True))
 
 
 def _search_drug(query: str) -> Drug | None:
@@ -246,24 +349,46 @@ def _search_drug(query: str) -> Drug | None:
     query_upper = query.upper()
     query_ndc = normalize_ndc(query)  # Normalize for NDC matching (handles dashes)
 
-    for row in catalog.iter_rows(named=True):
-        drug_name = str(row.get("Drug Name") or row.get("Trade Name") or "").upper()
-        ndc = str(row.get("NDC", ""))
-        ndc_normalized = normalize_ndc(ndc)
+    # Single vectorized filter over the catalog instead of a per-row loop;
+    # the first match (catalog order) wins, as before
+    name_cols = [c for c in ("Drug Name", "Trade Name") if c in catalog.columns]
+    if name_cols:
+        name_expr = pl.coalesce(
+            [pl.col(c).cast(pl.Utf8) for c in name_cols] + [pl.lit("")]
+        )
+    else:
+        name_expr = pl.lit("")
+
+    if "ndc_normalized" in catalog.columns:
+        ndc_norm_expr = pl.col("ndc_normalized")
+    else:
+        ndc_norm_expr = (
+            pl.col("NDC")
+            .cast(pl.Utf8)
+            .str.replace_all(r"[^0-9]", "")
+            .str.zfill(11)
+            .str.slice(-11)
+        )
 
-        # Match by drug name or normalized NDC
-        if query_upper in drug_name or query_ndc == ndc_normalized:
-            return _row_to_drug(row)
+    mask = (
+        name_expr.str.to_uppercase().str.contains(query_upper, literal=True)
+        | (ndc_norm_expr == query_ndc)
+    )
 
-    return None
+    hit = catalog.lazy().filter(mask).head(1).collect()
+
+    if hit.is_empty():
+        return None
+
+    return _row_to_drug(hit.row(0, named=True))
 
 
 def _row_to_drug(row: dict[str, object]) -> Drug:
-    """Convert catalog row to Drug object."""
-    from optimizer_340b.compute.retail_pricing import DrugCategory, classify_drug_category
-    from optimizer_340b.risk.penny_pricing import build_nadac_lookup
-    from optimizer_340b.ui.pages.dashboard import _build_hcpcs_lookup
+    """Convert catalog row to Drug object.
 
+    The HCPCS and NADAC lookups are memoized per uploaded frame (see
+    their builders), so repeated conversions only pay a cache probe.
+    """
     uploaded = st.session_state.get("uploaded_data", {})
     hcpcs_lookup = _build_hcpcs_lookup(
         uploaded.get("crosswalk"),
@@ -287,13 +412,17 @@ def _row_to_drug(row: dict[str, object]) -> Drug:
         or row.get("Contract Cost")
         or 0
     )
-    contract_cost = Decimal(str(contract_cost_raw) if contract_cost_raw else "0")
-    awp = Decimal(str(row.get("AWP") or row.get("Medispan AWP") or 0))
+    contract_cost = _parse_price(contract_cost_raw) or Decimal("0")
+    awp = _parse_price(row.get("AWP") or row.get("Medispan AWP") or 0) or Decimal(
+        "0"
+    )
 
     hcpcs_info = hcpcs_lookup.get(ndc_normalized, {})
     nadac_info = nadac_lookup.get(ndc_normalized, {})
 
-    ira_status = check_ira_status(str(drug_name))
+    # Memoized frozen status: repeat conversions for the same name skip
+    # the scan and allocate no per-call dict
+    ira_status = get_ira_risk_status(str(drug_name))
 
     hcpcs_code = hcpcs_info.get("hcpcs_code")
     bill_units = hcpcs_info.get("bill_units", 1)
@@ -311,48 +440,57 @@ def _row_to_drug(row: dict[str, object]) -> Drug:
         manufacturer=str(row.get("Manufacturer", "Unknown")),
         contract_cost=contract_cost,
         awp=awp,
-        asp=Decimal(str(hcpcs_info.get("asp"))) if hcpcs_info.get("asp") else None,
+        asp=_parse_price(hcpcs_info.get("asp")) if hcpcs_info.get("asp") else None,
         hcpcs_code=str(hcpcs_code) if hcpcs_code else None,
         bill_units_per_package=int(str(bill_units)) if bill_units else 1,
         is_brand=is_brand,
-        ira_flag=bool(ira_status.get("is_ira_drug", False)),
+        ira_flag=ira_status.is_ira_drug,
         penny_pricing_flag=bool(nadac_info.get("is_penny_priced", False)),
         nadac_price=nadac_price,
     )
 
 
+# Demo drugs built once at import; clicks hand out copies instead of
+# re-parsing a dozen Decimal literals per press
+_DEMO_DRUGS: dict[str, Drug] = {
+    "ENBREL": Drug(
+        ndc="55555555555",  # 11-digit NDC
+        drug_name="ENBREL",
+        manufacturer="AMGEN",
+        contract_cost=Decimal("200.00"),
+        awp=Decimal("7000.00"),
+        asp=Decimal("3000.00"),
+        hcpcs_code="J1438",
+        bill_units_per_package=4,
+        therapeutic_class="TNF Inhibitor",
+        is_biologic=True,
+        ira_flag=True,  # ENBREL is IRA 2026
+        penny_pricing_flag=False,
+    ),
+    "HUMIRA": Drug(
+        ndc="00074433902",  # 11-digit NDC (00074-4339-02)
+        drug_name="HUMIRA",
+        manufacturer="ABBVIE",
+        contract_cost=Decimal("150.00"),
+        awp=Decimal("6500.00"),
+        asp=Decimal("2800.00"),
+        hcpcs_code="J0135",
+        bill_units_per_package=2,
+        therapeutic_class="TNF Inhibitor",
+        is_biologic=True,
+        ira_flag=False,
+        penny_pricing_flag=False,
+    ),
+}
+
+
 def _create_demo_drug(name: str) -> Drug:
-    """Create a demo drug for testing."""
-    if name == "ENBREL":
-        return Drug(
-            ndc="55555555555",  # 11-digit NDC
-            drug_name="ENBREL",
-            manufacturer="AMGEN",
-            contract_cost=Decimal("200.00"),
-            awp=Decimal("7000.00"),
-            asp=Decimal("3000.00"),
-            hcpcs_code="J1438",
-            bill_units_per_package=4,
-            therapeutic_class="TNF Inhibitor",
-            is_biologic=True,
-            ira_flag=True,  # ENBREL is IRA 2026
-            penny_pricing_flag=False,
-        )
-    else:  # HUMIRA
-        return Drug(
-            ndc="00074433902",  # 11-digit NDC (00074-4339-02)
-            drug_name="HUMIRA",
-            manufacturer="ABBVIE",
-            contract_cost=Decimal("150.00"),
-            awp=Decimal("6500.00"),
-            asp=Decimal("2800.00"),
-            hcpcs_code="J0135",
-            bill_units_per_package=2,
-            therapeutic_class="TNF Inhibitor",
-            is_biologic=True,
-            ira_flag=False,
-            penny_pricing_flag=False,
-        )
+    """Return a demo drug for testing.
+
+    Drug is not frozen, so hand out a copy to keep the prototypes
+    pristine if a caller mutates the result.
+    """
+    return replace(_DEMO_DRUGS.get(name, _DEMO_DRUGS["HUMIRA"]))
 
 
 def _render_drug_header(drug: Drug) -> None:
@@ -434,8 +572,9 @@ def _render_drug_header(drug: Drug) -> None:
 
     with price_col5:
         if drug.asp:
-            # Calculate Payment Limit (ASP × 1.06) for display
-            payment_limit = drug.asp * Decimal("1.06")
+            # Payment Limit (ASP × 1.06) is display-only: float math is
+            # ample for a two-decimal format and skips Decimal dispatch
+            payment_limit = float(drug.asp) * 1.06
             st.markdown("**Payment Limit**")
             st.markdown(f"**${payment_limit:,.2f}**")
             st.caption("CMS (ASP × 1.06)")
@@ -586,19 +725,86 @@ def _render_margin_card_single(
         )
 
 
-def _render_sensitivity_chart(drug: Drug) -> None:
-    """Render capture rate sensitivity chart."""
-    sensitivity = calculate_margin_sensitivity(drug)
+@st.cache_data(max_entries=512)
+def _cached_sensitivity(
+    ndc: str,
+    awp: str,
+    contract_cost: str,
+    asp: str | None,
+    bill_units: int,
+) -> list[dict[str, Decimal | str]]:
+    """Memoized capture-rate sensitivity keyed by the scalar pricing fields.
+
+    The sensitivity sweep is independent of every widget on the page, yet
+    Streamlit re-runs the whole script per interaction. Keying on the
+    string forms of the Decimal inputs keeps hashing cheap and exact (no
+    cent-quantization of sub-cent ASP values); a lightweight Drug is
+    rebuilt for the computation.
+
+    Args:
+        ndc: Drug NDC (cache discriminator).
+        awp: AWP as a Decimal string.
+        contract_cost: Contract cost as a Decimal string.
+        asp: ASP as a Decimal string, or None when no medical path.
+        bill_units: Billing units per package.
+
+    Returns:
+        Sensitivity rows from calculate_margin_sensitivity().
+    """
+    drug = Drug(
+        ndc=ndc,
+        drug_name="",
+        manufacturer="",
+        contract_cost=Decimal(contract_cost),
+        awp=Decimal(awp),
+        asp=Decimal(asp) if asp is not None else None,
+        hcpcs_code="J" if asp is not None else None,
+        bill_units_per_package=bill_units,
+    )
+    return calculate_margin_sensitivity(drug)
 
-    if not sensitivity:
-        st.info("Sensitivity analysis not available.")
-        return
 
-    # Extract data for chart
-    capture_rates = [float(s["capture_rate"]) * 100 for s in sensitivity]
-    retail_margins = [float(s["retail_net"]) for s in sensitivity]
-    medicare_margins = [float(s["medicare"]) for s in sensitivity]
-    commercial_margins = [float(s["commercial"]) for s in sensitivity]
+@st.cache_data(max_entries=256)
+def _build_sensitivity_fig_dict(
+    ndc: str,
+    rows: tuple[tuple[float, float, float, float], ...],
+) -> dict[str, object]:
+    """Build the serialized sensitivity figure, cached per drug.
+
+    The figure does not depend on any page widget, so reruns reuse the
+    serialized dict instead of reconstructing and re-serializing the
+    Scatter traces. The key rows are plain float tuples, which hash
+    cheaply.
+
+    Args:
+        ndc: Drug NDC (cache discriminator).
+        rows: (capture_rate_pct, retail, medicare, commercial) per point.
+
+    Returns:
+        Figure as a plain dict (go.Figure(...) re-wraps it on render).
+    """
+    # Plotly is imported lazily: it is heavy to load and only needed once
+    # a sensitivity chart actually renders (sys.modules caches it after)
+    import plotly.graph_objects as go  # type: ignore[import-untyped]
+
+    # Extract all chart series (and the has-positive flags used to gate
+    # the optional traces) in a single pass over the rows
+    capture_rates: list[float] = []
+    retail_margins: list[float] = []
+    medicare_margins: list[float] = []
+    commercial_margins: list[float] = []
+    has_medicare = False
+    has_commercial = False
+
+    for rate, retail, medicare, commercial in rows:
+        capture_rates.append(rate)
+        retail_margins.append(retail)
+
+        medicare_margins.append(medicare)
+        has_medicare |= medicare > 0
+
+        commercial_margins.append(commercial)
+        has_commercial |= commercial > 0
 
     # Create Plotly chart
     fig = go.Figure()
@@ -611,7 +817,7 @@ def _render_sensitivity_chart(drug: Drug) -> None:
         line={"color": "#1f77b4", "width": 2},
     ))
 
-    if any(m > 0 for m in medicare_margins):
+    if has_medicare:
         fig.add_trace(go.Scatter(
             x=capture_rates,
             y=medicare_margins,
@@ -620,7 +826,7 @@ def _render_sensitivity_chart(drug: Drug) -> None:
             line={"color": "#2ca02c", "width": 2},
         ))
 
-    if any(m > 0 for m in commercial_margins):
+    if has_commercial:
         fig.add_trace(go.Scatter(
             x=capture_rates,
             y=commercial_margins,
@@ -637,7 +843,40 @@ def _render_sensitivity_chart(drug: Drug) -> None:
         hovermode="x unified",
     )
 
-    st.plotly_chart(fig, width="stretch")
+    fig_dict: dict[str, object] = fig.to_dict()
+    return fig_dict
+
+
+def _render_sensitivity_chart(drug: Drug) -> None:
+    """Render capture rate sensitivity chart."""
+    sensitivity = _cached_sensitivity(
+        drug.ndc,
+        str(drug.awp),
+        str(drug.contract_cost),
+        str(drug.asp) if drug.has_medical_path() else None,
+        drug.bill_units_per_package,
+    )
+
+    if not sensitivity:
+        st.info("Sensitivity analysis not available.")
+        return
+
+    import plotly.graph_objects as go
+
+    rows = tuple(
+        (
+            float(s["capture_rate"]) * 100,
+            float(s["retail_net"]),
+            float(s["medicare"]),
+            float(s["commercial"]),
+        )
+        for s in sensitivity
+    )
+
+    st.plotly_chart(
+        go.Figure(_build_sensitivity_fig_dict(drug.ndc, rows)),
+        width="stretch",
+    )
 
     # Crossover point analysis
     _analyze_crossover_points(sensitivity)
@@ -646,31 +885,81 @@ def _render_sensitivity_chart(drug: Drug) -> None:
 def _analyze_crossover_points(
     sensitivity: list[dict[str, Decimal | str]],
 ) -> None:
-    """Analyze where retail becomes better/worse than medical."""
-    for i, s in enumerate(sensitivity):
-        retail = float(str(s["retail_net"]))
-        commercial = float(str(s["commercial"]))
-
-        if i > 0 and commercial > 0:
-            prev = sensitivity[i - 1]
-            prev_retail = float(str(prev["retail_net"]))
-            prev_commercial = float(str(prev["commercial"]))
-
-            # Check for crossover
-            if (prev_retail < prev_commercial) and (retail >= commercial):
-                rate = float(str(s["capture_rate"])) * 100
-                st.info(
-                    f"**Crossover Point:** At {rate:.0f}% capture rate, "
-                    "retail becomes more profitable than medical billing."
-                )
-                return
-            elif (prev_retail >= prev_commercial) and (retail < commercial):
-                rate = float(str(s["capture_rate"])) * 100
-                st.info(
-                    f"**Crossover Point:** Below {rate:.0f}% capture rate, "
-                    "medical billing becomes more profitable than retail."
-                )
-                return
+    """Analyze where retail becomes better/worse than medical.
+
+    The retail-vs-commercial difference is computed once as a vector and
+    the first sign flip located with a single comparison scan, replacing
+    the per-index branching (which also re-converted each row's Decimals
+    on every iteration).
+    """
+    n = len(sensitivity)
+    if n < 2:
+        return
+
+    retail = np.fromiter(
+        (float(s["retail_net"]) for s in sensitivity), np.float64, count=n
+    )
+    commercial = np.fromiter(
+        (float(s["commercial"]) for s in sensitivity), np.float64, count=n
+    )
+
+    # Sign of (retail - commercial); points without a positive commercial
+    # margin can't host a crossover, as before
+    retail_ahead = (retail - commercial) >= 0
+    valid = commercial[1:] > 0
+    crossed_up = ~retail_ahead[:-1] & retail_ahead[1:] & valid
+    crossed_down = retail_ahead[:-1] & ~retail_ahead[1:] & valid
+
+    flips = np.flatnonzero(crossed_up | crossed_down)
+    if flips.size == 0:
+        return
+
+    i = int(flips[0]) + 1
+    rate = float(sensitivity[i]["capture_rate"]) * 100
+
+    if crossed_up[i - 1]:
+        st.info(
+            f"**Crossover Point:** At {rate:.0f}% capture rate, "
+            "retail becomes more profitable than medical billing."
+        )
+    else:
+        st.info(
+            f"**Crossover Point:** Below {rate:.0f}% capture rate, "
+            "medical billing becomes more profitable than retail."
+        )
+
+
+# Common biologics with loading doses, used when no grid is uploaded
+_LOADING_DOSE_FALLBACK = frozenset({"COSENTYX", "STELARA", "SKYRIZI", "TREMFYA"})
+
+
+def _biologic_names_upper(biologics: pl.DataFrame) -> tuple[str, ...]:
+    """Uppercased biologics-grid drug names, built once per upload.
+
+    Keyed by frame identity with the frame pinned in the cache value;
+    uppercasing runs as one Polars kernel instead of per row on every
+    page render.
+    """
+    cached = _BIOLOGIC_NAMES_CACHE.get(id(biologics))
+    if cached is not None and cached[0] is biologics:
+        return cached[1]
+
+    if "Drug Name" not in biologics.columns:
+        names: tuple[str, ...] = ()
+    else:
+        names = tuple(
+            biologics["Drug Name"]
+            .cast(pl.Utf8)
+            .str.to_uppercase()
+            .drop_nulls()
+            .to_list()
+        )
+
+    if len(_BIOLOGIC_NAMES_CACHE) >= _FRAME_CACHE_MAX:
+        _BIOLOGIC_NAMES_CACHE.pop(next(iter(_BIOLOGIC_NAMES_CACHE)))
+    _BIOLOGIC_NAMES_CACHE[id(biologics)] = (biologics, names)
+
+    return names
 
 
 def _has_loading_dose(drug: Drug) -> bool:
@@ -678,31 +967,31 @@ def _has_loading_dose(drug: Drug) -> bool:
     uploaded = st.session_state.get("uploaded_data", {})
     biologics = uploaded.get("biologics")
 
+    name_upper = drug.drug_name.upper()
+
     if biologics is None:
         # Check common biologics
-        loading_drugs = ["COSENTYX", "STELARA", "SKYRIZI", "TREMFYA"]
-        return drug.drug_name.upper() in loading_drugs
-
-    # Check biologics grid
-    for row in biologics.iter_rows(named=True):
-        if drug.drug_name.upper() in str(row.get("Drug Name", "")).upper():
-            return True
+        return name_upper in _LOADING_DOSE_FALLBACK
 
-    return False
+    # Check biologics grid; containment (not equality) is preserved so
+    # entries like "COSENTYX (secukinumab)" still match
+    return any(name_upper in name for name in _biologic_names_upper(biologics))
 
 
-def _render_loading_dose_analysis(drug: Drug, analysis: MarginAnalysis) -> None:
+def _render_loading_dose_analysis(drug: Drug) -> None:
     """Render loading dose impact analysis."""
     uploaded = st.session_state.get("uploaded_data", {})
     biologics = uploaded.get("biologics")
 
+    name_upper = drug.drug_name.upper()
+
     profile = None
     if biologics is not None:
         profile = apply_loading_dose_logic(drug.drug_name, biologics)
 
     if profile is None:
         # Use default profile for demo
-        if drug.drug_name.upper() == "COSENTYX":
+        if name_upper == "COSENTYX":
             st.markdown("""
             **Cosentyx Loading Dose Pattern:**
             - Year 1: 17 fills (5 loading doses + 12 monthly)
@@ -730,11 +1019,15 @@ def _render_loading_dose_analysis(drug: Drug, analysis: MarginAnalysis) -> None:
         )
 
     with col3:
-        delta_pct = (
-            (profile.year_1_fills - profile.year_2_plus_fills)
-            / profile.year_2_plus_fills
-            * 100
-        )
+        # Guard against profiles with no maintenance fills
+        if profile.year_2_plus_fills:
+            delta_pct = (
+                (profile.year_1_fills - profile.year_2_plus_fills)
+                / profile.year_2_plus_fills
+                * 100
+            )
+        else:
+            delta_pct = 0.0
         st.metric(
             "Year 1 Uplift",
             f"+{delta_pct:.0f}%",
@@ -742,139 +1035,221 @@ def _render_loading_dose_analysis(drug: Drug, analysis: MarginAnalysis) -> None:
         )
 
 
-def _render_provenance_chain(
-    drug: Drug,
-    analysis: MarginAnalysis,
-    capture_rate: Decimal = Decimal("1.0"),
-    dispense_fee: Decimal = Decimal("0"),
-    medicaid_markup_pct: Decimal = Decimal("0"),
-    commercial_asp_pct: Decimal = Decimal("0.15"),
-) -> None:
-    """Render calculation provenance for all 5 pathways."""
-    st.markdown(
-        "Every calculated margin has a complete audit trail. "
-        "Click to expand each calculation."
-    )
+@st.cache_data(max_entries=256)
+def _provenance_sections(
+    ndc: str,
+    nadac_price: str | None,
+    contract_cost: str,
+    awp: str,
+    asp: str | None,
+    bill_units: int,
+    is_brand: bool,
+    capture_rate: str,
+    dispense_fee: str,
+    medicaid_markup_pct: str,
+    commercial_asp_pct: str,
+) -> tuple[str | None, str, str | None, str | None, str | None]:
+    """Render the five pathway provenance bodies, cached per inputs.
+
+    The expanders are collapsed by default, so the ~40 Decimal multiplies
+    and format operations behind them are wasted on most reruns; caching
+    by the scalar inputs (Decimal values in string form for cheap, exact
+    hashing) makes repeat renders a lookup. None entries mean the pathway
+    is unavailable and the caller shows the warning instead.
+
+    Args:
+        ndc: Drug NDC (cache discriminator).
+        nadac_price: NADAC price string, or None if unavailable.
+        contract_cost: Contract cost string.
+        awp: AWP string.
+        asp: ASP string, or None when no medical path.
+        bill_units: Billing units per package.
+        is_brand: Whether the drug prices as brand (85% AWP) vs generic.
+        capture_rate: Capture rate string (fraction).
+        dispense_fee: Medicaid dispense fee string.
+        medicaid_markup_pct: Medicaid markup string (fraction).
+        commercial_asp_pct: Commercial ASP markup string (fraction).
+
+    Returns:
+        Tuple of markdown bodies for the five pathways.
+    """
+    cc = Decimal(contract_cost)
+    awp_d = Decimal(awp)
+    asp_d = Decimal(asp) if asp is not None else None
+    rate = Decimal(capture_rate)
+    fee = Decimal(dispense_fee)
+    markup = Decimal(medicaid_markup_pct)
+    commercial_pct = Decimal(commercial_asp_pct)
 
     # 1. Pharmacy - Medicaid
-    with st.expander("1. Pharmacy - Medicaid"):
-        if drug.nadac_price is not None:
-            base = drug.nadac_price + dispense_fee
-            revenue = base * (Decimal("1") + medicaid_markup_pct)
-            margin = (revenue * capture_rate) - drug.contract_cost
-            st.markdown(f"""
+    if nadac_price is not None:
+        nadac = Decimal(nadac_price)
+        base = nadac + fee
+        revenue = base * (Decimal("1") + markup)
+        margin = (revenue * rate) - cc
+        pharmacy_medicaid: str | None = f"""
             **Formula:** (NADAC + Dispense Fee) × (1 + Markup%) × Capture Rate - Contract Cost
 
             **Inputs:**
-            - NADAC: ${drug.nadac_price:,.2f}
-            - Dispense Fee: ${dispense_fee:,.2f}
-            - Markup: {medicaid_markup_pct:.0%}
-            - Capture Rate: {capture_rate:.0%}
-            - Contract Cost: ${drug.contract_cost:,.2f}
+            - NADAC: ${nadac:,.2f}
+            - Dispense Fee: ${fee:,.2f}
+            - Markup: {markup:.0%}
+            - Capture Rate: {rate:.0%}
+            - Contract Cost: ${cc:,.2f}
 
             **Calculation:**
-            1. Base = ${drug.nadac_price:,.2f} + ${dispense_fee:,.2f} = ${base:,.2f}
-            2. Revenue = ${base:,.2f} × (1 + {medicaid_markup_pct:.0%}) = ${revenue:,.2f}
-            3. Adjusted Revenue = ${revenue:,.2f} × {capture_rate:.0%} = ${revenue * capture_rate:,.2f}
-            4. Margin = ${revenue * capture_rate:,.2f} - ${drug.contract_cost:,.2f} = ${margin:,.2f}
+            1. Base = ${nadac:,.2f} + ${fee:,.2f} = ${base:,.2f}
+            2. Revenue = ${base:,.2f} × (1 + {markup:.0%}) = ${revenue:,.2f}
+            3. Adjusted Revenue = ${revenue:,.2f} × {rate:.0%} = ${revenue * rate:,.2f}
+            4. Margin = ${revenue * rate:,.2f} - ${cc:,.2f} = ${margin:,.2f}
 
             **Result:** ${margin:,.2f}
-            """)
-        else:
-            st.warning("NADAC price not available for this drug.")
+            """
+    else:
+        pharmacy_medicaid = None
 
     # 2. Pharmacy - Medicare/Commercial
-    with st.expander("2. Pharmacy - Medicare/Commercial"):
-        awp_factor = Decimal("0.85") if drug.is_brand else Decimal("0.20")
-        factor_label = "85% (Brand)" if drug.is_brand else "20% (Generic)"
-        revenue = drug.awp * awp_factor
-        margin = (revenue * capture_rate) - drug.contract_cost
-        st.markdown(f"""
+    awp_factor = AWP_BRAND_FACTOR if is_brand else AWP_GENERIC_FACTOR
+    factor_label = "85% (Brand)" if is_brand else "20% (Generic)"
+    revenue = awp_d * awp_factor
+    margin = (revenue * rate) - cc
+    pharmacy_medicare = f"""
         **Formula:** AWP × {factor_label} × Capture Rate - Contract Cost
 
         **Inputs:**
-        - AWP: ${drug.awp:,.2f}
+        - AWP: ${awp_d:,.2f}
         - AWP Factor: {factor_label}
-        - Capture Rate: {capture_rate:.0%}
-        - Contract Cost: ${drug.contract_cost:,.2f}
+        - Capture Rate: {rate:.0%}
+        - Contract Cost: ${cc:,.2f}
 
         **Calculation:**
-        1. Revenue = ${drug.awp:,.2f} × {awp_factor} = ${revenue:,.2f}
-        2. Adjusted Revenue = ${revenue:,.2f} × {capture_rate:.0%} = ${revenue * capture_rate:,.2f}
-        3. Margin = ${revenue * capture_rate:,.2f} - ${drug.contract_cost:,.2f} = ${margin:,.2f}
+        1. Revenue = ${awp_d:,.2f} × {awp_factor} = ${revenue:,.2f}
+        2. Adjusted Revenue = ${revenue:,.2f} × {rate:.0%} = ${revenue * rate:,.2f}
+        3. Margin = ${revenue * rate:,.2f} - ${cc:,.2f} = ${margin:,.2f}
 
         **Result:** ${margin:,.2f}
-        """)
+        """
+
+    if asp_d is None:
+        return pharmacy_medicaid, pharmacy_medicare, None, None, None
 
     # 3. Medical - Medicaid
-    with st.expander("3. Medical - Medicaid"):
-        if drug.has_medical_path() and drug.asp is not None:
-            revenue = drug.asp * Decimal("1.04") * drug.bill_units_per_package
-            margin = revenue - drug.contract_cost
-            st.markdown(f"""
+    revenue = asp_d * Decimal("1.04") * bill_units
+    margin = revenue - cc
+    medical_medicaid = f"""
             **Formula:** ASP × 1.04 × Bill Units - Contract Cost
 
             **Inputs:**
-            - ASP: ${drug.asp:,.2f}
+            - ASP: ${asp_d:,.2f}
             - Multiplier: 1.04 (ASP + 4%)
-            - Bill Units per Package: {drug.bill_units_per_package}
-            - Contract Cost: ${drug.contract_cost:,.2f}
+            - Bill Units per Package: {bill_units}
+            - Contract Cost: ${cc:,.2f}
 
             **Calculation:**
-            1. Revenue = ${drug.asp:,.2f} × 1.04 × {drug.bill_units_per_package} = ${revenue:,.2f}
-            2. Margin = ${revenue:,.2f} - ${drug.contract_cost:,.2f} = ${margin:,.2f}
+            1. Revenue = ${asp_d:,.2f} × 1.04 × {bill_units} = ${revenue:,.2f}
+            2. Margin = ${revenue:,.2f} - ${cc:,.2f} = ${margin:,.2f}
 
             **Result:** ${margin:,.2f}
-            """)
-        else:
-            st.warning("No ASP/HCPCS mapping available for medical billing.")
+            """
 
     # 4. Medical - Medicare
-    with st.expander("4. Medical - Medicare"):
-        if drug.has_medical_path() and drug.asp is not None:
-            revenue = drug.asp * Decimal("1.06") * drug.bill_units_per_package
-            margin = revenue - drug.contract_cost
-            st.markdown(f"""
+    revenue = asp_d * MEDICARE_ASP_MULTIPLIER * bill_units
+    margin = revenue - cc
+    medical_medicare = f"""
             **Formula:** ASP × 1.06 × Bill Units - Contract Cost
 
             **Inputs:**
-            - ASP: ${drug.asp:,.2f}
+            - ASP: ${asp_d:,.2f}
             - Multiplier: 1.06 (ASP + 6%)
-            - Bill Units per Package: {drug.bill_units_per_package}
-            - Contract Cost: ${drug.contract_cost:,.2f}
+            - Bill Units per Package: {bill_units}
+            - Contract Cost: ${cc:,.2f}
 
             **Calculation:**
-            1. Revenue = ${drug.asp:,.2f} × 1.06 × {drug.bill_units_per_package} = ${revenue:,.2f}
-            2. Margin = ${revenue:,.2f} - ${drug.contract_cost:,.2f} = ${margin:,.2f}
+            1. Revenue = ${asp_d:,.2f} × 1.06 × {bill_units} = ${revenue:,.2f}
+            2. Margin = ${revenue:,.2f} - ${cc:,.2f} = ${margin:,.2f}
 
             **Result:** ${margin:,.2f}
-            """)
-        else:
-            st.warning("No ASP/HCPCS mapping available for medical billing.")
+            """
 
     # 5. Medical - Commercial
-    with st.expander("5. Medical - Commercial"):
-        if drug.has_medical_path() and drug.asp is not None:
-            multiplier = Decimal("1") + commercial_asp_pct
-            revenue = drug.asp * multiplier * drug.bill_units_per_package
-            margin = revenue - drug.contract_cost
-            st.markdown(f"""
+    multiplier = Decimal("1") + commercial_pct
+    revenue = asp_d * multiplier * bill_units
+    margin = revenue - cc
+    medical_commercial = f"""
             **Formula:** ASP × (1 + Markup%) × Bill Units - Contract Cost
 
             **Inputs:**
-            - ASP: ${drug.asp:,.2f}
-            - Markup: {commercial_asp_pct:.0%} (Multiplier: {multiplier})
-            - Bill Units per Package: {drug.bill_units_per_package}
-            - Contract Cost: ${drug.contract_cost:,.2f}
+            - ASP: ${asp_d:,.2f}
+            - Markup: {commercial_pct:.0%} (Multiplier: {multiplier})
+            - Bill Units per Package: {bill_units}
+            - Contract Cost: ${cc:,.2f}
 
             **Calculation:**
-            1. Revenue = ${drug.asp:,.2f} × {multiplier} × {drug.bill_units_per_package} = ${revenue:,.2f}
-            2. Margin = ${revenue:,.2f} - ${drug.contract_cost:,.2f} = ${margin:,.2f}
+            1. Revenue = ${asp_d:,.2f} × {multiplier} × {bill_units} = ${revenue:,.2f}
+            2. Margin = ${revenue:,.2f} - ${cc:,.2f} = ${margin:,.2f}
 
             **Result:** ${margin:,.2f}
-            """)
-        else:
-            st.warning("No ASP/HCPCS mapping available for medical billing.")
+            """
+
+    return (
+        pharmacy_medicaid,
+        pharmacy_medicare,
+        medical_medicaid,
+        medical_medicare,
+        medical_commercial,
+    )
+
+
+def _render_provenance_chain(
+    drug: Drug,
+    analysis: MarginAnalysis,
+    capture_rate: Decimal = Decimal("1.0"),
+    dispense_fee: Decimal = Decimal("0"),
+    medicaid_markup_pct: Decimal = Decimal("0"),
+    commercial_asp_pct: Decimal = Decimal("0.15"),
+) -> None:
+    """Render calculation provenance for all 5 pathways."""
+    st.markdown(
+        "Every calculated margin has a complete audit trail. "
+        "Click to expand each calculation."
+    )
+
+    has_asp = drug.has_medical_path() and drug.asp is not None
+    sections = _provenance_sections(
+        drug.ndc,
+        str(drug.nadac_price) if drug.nadac_price is not None else None,
+        str(drug.contract_cost),
+        str(drug.awp),
+        str(drug.asp) if has_asp else None,
+        drug.bill_units_per_package,
+        drug.is_brand,
+        str(capture_rate),
+        str(dispense_fee),
+        str(medicaid_markup_pct),
+        str(commercial_asp_pct),
+    )
+
+    titles = (
+        "1. Pharmacy - Medicaid",
+        "2. Pharmacy - Medicare/Commercial",
+        "3. Medical - Medicaid",
+        "4. Medical - Medicare",
+        "5. Medical - Commercial",
+    )
+    warnings = (
+        "NADAC price not available for this drug.",
+        "",
+        "No ASP/HCPCS mapping available for medical billing.",
+        "No ASP/HCPCS mapping available for medical billing.",
+        "No ASP/HCPCS mapping available for medical billing.",
+    )
+
+    for title, body, warning in zip(titles, sections, warnings, strict=True):
+        with st.expander(title):
+            if body is not None:
+                st.markdown(body)
+            else:
+                st.warning(warning)
 
     # Recommendation Summary
     with st.expander("Recommendation Logic", expanded=True):
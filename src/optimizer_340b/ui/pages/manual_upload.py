@@ -7,21 +7,22 @@ For quick testing, use the main Upload Data page with sample data.
 from __future__ import annotations
 
 import logging
-import tempfile
-from pathlib import Path
 from typing import Any
 
-import pandas as pd
 import polars as pl
 import streamlit as st
 
-from optimizer_340b.ingest.loaders import load_csv_to_polars, load_excel_to_polars
+from optimizer_340b.ingest.loaders import (
+    load_csv_to_polars,
+    load_excel_to_polars,
+    load_ravenswood_workbook,
+)
 from optimizer_340b.ingest.normalizers import (
     normalize_catalog,
     normalize_crosswalk,
     normalize_noc_crosswalk,
     normalize_noc_pricing,
-    preprocess_cms_csv,
+    preprocess_cms_bytes,
 )
 from optimizer_340b.ingest.validators import (
     ValidationResult,
@@ -38,15 +39,12 @@ logger = logging.getLogger(__name__)
 
 
 def _load_cms_csv_with_skip(uploaded_file: Any, skip_rows: int = 8) -> pl.DataFrame:
-    """Load CMS CSV file, skipping header metadata rows."""
-    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
-        tmp.write(uploaded_file.getvalue())
-        tmp_path = tmp.name
+    """Load CMS CSV file, skipping header metadata rows.
 
-    try:
-        return preprocess_cms_csv(tmp_path, skip_rows=skip_rows)
-    finally:
-        Path(tmp_path).unlink(missing_ok=True)
+    Streams the upload bytes straight to the CMS preprocessor — no
+    temp-file round trip to disk.
+    """
+    return preprocess_cms_bytes(uploaded_file.getvalue(), skip_rows=skip_rows)
 
 
 def render_manual_upload_page() -> None:
@@ -358,14 +356,9 @@ def _render_ravenswood_upload() -> None:
     if uploaded_file is not None:
         with st.spinner("Loading AWP matrix..."):
             try:
-                df_categories = load_excel_to_polars(
-                    uploaded_file, sheet_name="Drug Categories"
-                )
+                # Single workbook open for both sheets (calamine engine)
+                df_categories, df_summary = load_ravenswood_workbook(uploaded_file)
                 st.session_state.uploaded_data["ravenswood_categories"] = df_categories
-
-                uploaded_file.seek(0)
-                pdf_summary = pd.read_excel(uploaded_file, sheet_name="Summary")
-                df_summary = pl.from_pandas(pdf_summary.astype(str))
                 st.session_state.uploaded_data["ravenswood_summary"] = df_summary
 
                 st.success(
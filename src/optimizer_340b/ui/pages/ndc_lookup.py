@@ -4,35 +4,49 @@ Upload a CSV with drug names and NDC codes, validate matches against
 product catalog, and output pharmacy channel margins.
 """
 
-import io
 import logging
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
+from functools import lru_cache
 
 import pandas as pd
 import polars as pl
 import streamlit as st
+from rapidfuzz import fuzz
 
 logger = logging.getLogger(__name__)
 
-# AWP multipliers by drug type
-AWP_MULTIPLIERS = {
-    "BRAND": Decimal("0.85"),
-    "SPECIALTY": Decimal("0.85"),
-    "GENERIC": Decimal("0.20"),
-}
+# Minimum token_set_ratio score for the fuzzy match fallback
+FUZZY_MATCH_THRESHOLD = 85
+
+# Static page copy, built once at import rather than per rerun
+_PAGE_INTRO_MD = """
+Upload a CSV with drug names and NDC codes to:
+- Validate drug name matches against the product catalog
+- Calculate pharmacy channel margins (Medicaid & Medicare/Commercial)
+- Download results with match status and margins
+"""
+
+_CSV_FORMAT_HELP_MD = """
+**Required columns (in order):**
+1. `Drug Description` - Your drug name/description
+2. `NDC11` - NDC code (will be left-padded to 11 digits)
+3. `Type` - BRAND, SPECIALTY, or GENERIC
+4. `Product Description` - Expected catalog description (optional)
+5. `HCPCS` - HCPCS/J-code (optional)
+
+**Example:**
+```
+Drug Description,NDC11,Type,Product Description,HCPCS
+HUMIRA PEN 40 MG/0.8ML,74433902,SPECIALTY,HUMIRA PEN KT 40MG/0.8ML 2,J0135
+ELIQUIS 5 MG TABLET,3089421,BRAND,ELIQUIS TB 5MG 60,
+```
+"""
 
 
 def render_ndc_lookup_page() -> None:
     """Render the NDC Lookup page for batch margin analysis."""
     st.title("NDC Lookup & Margin Calculator")
-    st.markdown(
-        """
-        Upload a CSV with drug names and NDC codes to:
-        - Validate drug name matches against the product catalog
-        - Calculate pharmacy channel margins (Medicaid & Medicare/Commercial)
-        - Download results with match status and margins
-        """
-    )
+    st.markdown(_PAGE_INTRO_MD)
 
     # Check if catalog is loaded
     uploaded = st.session_state.get("uploaded_data", {})
@@ -115,23 +129,7 @@ def render_ndc_lookup_page() -> None:
 
     # File format instructions
     with st.expander("CSV Format Requirements", expanded=False):
-        st.markdown(
-            """
-            **Required columns (in order):**
-            1. `Drug Description` - Your drug name/description
-            2. `NDC11` - NDC code (will be left-padded to 11 digits)
-            3. `Type` - BRAND, SPECIALTY, or GENERIC
-            4. `Product Description` - Expected catalog description (optional)
-            5. `HCPCS` - HCPCS/J-code (optional)
-
-            **Example:**
-            ```
-            Drug Description,NDC11,Type,Product Description,HCPCS
-            HUMIRA PEN 40 MG/0.8ML,74433902,SPECIALTY,HUMIRA PEN KT 40MG/0.8ML 2,J0135
-            ELIQUIS 5 MG TABLET,3089421,BRAND,ELIQUIS TB 5MG 60,
-            ```
-            """
-        )
+        st.markdown(_CSV_FORMAT_HELP_MD)
 
     # File upload
     uploaded_file = st.file_uploader(
@@ -175,13 +173,26 @@ def render_ndc_lookup_page() -> None:
                     # Summary metrics
                     _render_summary_metrics(results_df)
 
-                    # Results table
-                    st.dataframe(results_df, use_container_width=True)
+                    # Results table; money columns stay numeric and are
+                    # formatted (and sortable) by the column config
+                    money_columns = (
+                        "Contract Cost",
+                        "AWP",
+                        "Pharmacy Medicaid Margin",
+                        "Pharmacy Medicare/Commercial Margin",
+                    )
+                    st.dataframe(
+                        results_df,
+                        use_container_width=True,
+                        column_config={
+                            c: st.column_config.NumberColumn(format="dollar")
+                            for c in money_columns
+                        },
+                    )
 
-                    # Download button
-                    csv_buffer = io.StringIO()
-                    results_df.to_csv(csv_buffer, index=False)
-                    csv_data = csv_buffer.getvalue()
+                    # Download button (single-pass Rust CSV writer, no
+                    # pandas/StringIO round-trip)
+                    csv_data = results_df.write_csv()
 
                     st.download_button(
                         label="Download Results CSV",
@@ -195,10 +206,12 @@ def render_ndc_lookup_page() -> None:
             st.error(f"Error processing file: {e}")
 
 
-def _parse_input_csv(uploaded_file) -> pd.DataFrame | None:
-    """Parse the uploaded CSV file.
+def _parse_input_csv(uploaded_file) -> pl.DataFrame | None:
+    """Parse the uploaded CSV file with the Polars reader.
 
-    Expected columns: Drug Description, NDC11, Type, Product Description, HCPCS (optional)
+    Thin wrapper over the bytes-keyed cached parser, so Streamlit reruns
+    with the same upload (every widget interaction re-executes the page)
+    reuse the parsed frame instead of re-reading the CSV.
 
     Args:
         uploaded_file: Streamlit uploaded file object.
@@ -206,40 +219,65 @@ def _parse_input_csv(uploaded_file) -> pd.DataFrame | None:
     Returns:
         DataFrame with standardized columns, or None if parsing fails.
     """
-    try:
-        # Try reading with different options
-        content = uploaded_file.getvalue().decode("utf-8")
+    return _parse_input_bytes(uploaded_file.getvalue())
+
 
-        # Check if it has headers
-        first_line = content.split("\n")[0].strip().upper()
+@st.cache_data(max_entries=8)
+def _parse_input_bytes(raw: bytes) -> pl.DataFrame | None:
+    """Parse an uploaded CSV payload, cached per content.
+
+    The raw bytes go straight to pl.read_csv (multi-threaded Rust parser,
+    no Python-level UTF-8 decode of the whole file — only the first line
+    is decoded for header sniffing). Everything reads as strings so NDC
+    leading zeros survive and no float round-trip artifacts appear.
+
+    Expected columns: Drug Description, NDC11, Type, Product Description,
+    HCPCS (optional).
+
+    Args:
+        raw: Raw CSV bytes from the upload.
+
+    Returns:
+        DataFrame with standardized columns, or None if parsing fails.
+    """
+    # Standard column names (5 columns)
+    standard_cols = ["Drug Description", "NDC11", "Type", "Product Description", "HCPCS"]
+
+    try:
+        # Sniff the header from the first line only
+        first_line = (
+            raw.split(b"\n", 1)[0].decode("utf-8", errors="replace").strip().upper()
+        )
 
         # Common header keywords that indicate row is a header
         header_keywords = [
             "DRUG", "DESC", "NDC", "TYPE", "PRODUCT", "MED_DESC", "NAME", "HCPCS"
         ]
 
-        # Standard column names (5 columns)
-        standard_cols = ["Drug Description", "NDC11", "Type", "Product Description", "HCPCS"]
+        def assign_standard(df: pl.DataFrame) -> pl.DataFrame:
+            return df.rename(
+                dict(zip(df.columns, standard_cols, strict=False))
+            )
 
         # If no comma in first line, try tab-separated
         if "," not in first_line:
-            df = pd.read_csv(
-                io.StringIO(content),
-                sep="\t",
-                header=None,
-                names=standard_cols[:4],
+            df = assign_standard(
+                pl.read_csv(
+                    raw, separator="\t", has_header=False, infer_schema_length=0
+                )
             )
         elif any(kw in first_line for kw in header_keywords):
             # Has headers - read with header row
-            df = pd.read_csv(io.StringIO(content))
+            df = pl.read_csv(raw, infer_schema_length=0)
         else:
             # No headers, assign column names based on number of columns
-            df = pd.read_csv(io.StringIO(content), header=None)
-            df.columns = standard_cols[: len(df.columns)]
+            df = assign_standard(
+                pl.read_csv(raw, has_header=False, infer_schema_length=0)
+            )
 
         # Standardize column names if they don't match expected
         if len(df.columns) >= 4 and "Drug Description" not in df.columns:
-            df.columns = standard_cols[: len(df.columns)]
+            df = assign_standard(df)
 
         # Ensure we have at least the required columns
         if len(df.columns) < 2:
@@ -248,11 +286,11 @@ def _parse_input_csv(uploaded_file) -> pd.DataFrame | None:
 
         # Add missing columns if needed
         if "Type" not in df.columns:
-            df["Type"] = "BRAND"
+            df = df.with_columns(Type=pl.lit("BRAND"))
         if "Product Description" not in df.columns:
-            df["Product Description"] = ""
+            df = df.with_columns(pl.lit("").alias("Product Description"))
         if "HCPCS" not in df.columns:
-            df["HCPCS"] = ""
+            df = df.with_columns(HCPCS=pl.lit(""))
 
         return df
 
@@ -261,125 +299,22 @@ def _parse_input_csv(uploaded_file) -> pd.DataFrame | None:
         return None
 
 
-def _normalize_ndc(ndc: str | int | float) -> str:
-    """Normalize NDC to 11 digits with left-padding.
-
-    Args:
-        ndc: NDC value (may be numeric or string).
-
-    Returns:
-        11-digit NDC string with leading zeros.
-    """
-    if pd.isna(ndc):
-        return ""
-
-    # Convert to string and clean
-    ndc_str = str(ndc).strip()
-
-    # Remove any non-numeric characters
-    ndc_clean = "".join(c for c in ndc_str if c.isdigit())
-
-    # Left-pad to 11 digits
-    return ndc_clean.zfill(11)
-
-
-def _names_match(str1: str, str2: str) -> bool:
-    """Check if two drug names match (case-insensitive).
-
-    Args:
-        str1: First drug name.
-        str2: Second drug name.
-
-    Returns:
-        True if names match (case-insensitive).
-    """
-    if not str1 or not str2:
-        return False
-
-    # Normalize strings: uppercase and strip whitespace
-    s1 = str1.upper().strip()
-    s2 = str2.upper().strip()
-
-    return s1 == s2
-
-
-def _extract_first_word(description: str) -> str:
-    """Extract the first word (trade name) from drug description.
-
-    Args:
-        description: Full drug description.
-
-    Returns:
-        First word (trade name) in uppercase.
-    """
-    if not description:
-        return ""
-
-    # Get the first word - this is the trade name
-    desc_upper = description.upper().strip()
-
-    # Split on whitespace and take first word
-    words = desc_upper.split()
-    if words:
-        return words[0]
-
-    return ""
-
-
-def _determine_match_status(
-    input_name: str,
-    catalog_name: str | None,
-    generic_name: str | None,
-    ndc_found: bool,
-) -> tuple[str, bool]:
-    """Determine match status based on drug name comparison.
-
-    Checks input name against both Product Description and Generic Name.
-
-    Args:
-        input_name: User's drug name.
-        catalog_name: Catalog Product Description (None if NDC not found).
-        generic_name: Catalog Generic Name (None if not available).
-        ndc_found: Whether NDC was found in catalog.
-
-    Returns:
-        Tuple of (status_string, is_match).
-    """
-    if not ndc_found:
-        return "NDC NOT FOUND", False
-
-    if not catalog_name and not generic_name:
-        return "NO CATALOG NAME", False
-
-    # Extract first word (trade name) for comparison
-    input_trade = _extract_first_word(input_name)
-
-    # Check against Product Description
-    if catalog_name:
-        catalog_trade = _extract_first_word(catalog_name)
-        if _names_match(input_trade, catalog_trade):
-            return "MATCH", True
-
-    # Check against Generic Name
-    if generic_name:
-        generic_trade = _extract_first_word(generic_name)
-        if _names_match(input_trade, generic_trade):
-            return "MATCH (GENERIC)", True
-
-    return "MISMATCH - VERIFY", False
-
-
 def _process_ndc_lookup(
-    input_df: pd.DataFrame,
+    input_df: pl.DataFrame | pd.DataFrame,
     catalog: pl.DataFrame,
     nadac: pl.DataFrame | None = None,
     dispense_fee: Decimal = Decimal("0"),
     medicaid_markup: Decimal = Decimal("0"),
     awp_discount: Decimal = Decimal("0.15"),
     capture_rate: Decimal = Decimal("1"),
-) -> pd.DataFrame:
+) -> pl.DataFrame:
     """Process NDC lookup and calculate margins.
 
+    Runs as a vectorized Polars pipeline: the input is converted once,
+    NDCs normalize columnwise, catalog and NADAC resolve via left joins
+    on normalized NDC, and the match status and both margins compute as
+    column expressions. Only the final currency formatting walks rows.
+
     Args:
         input_df: Input DataFrame with drug list.
         catalog: Product catalog DataFrame.
@@ -390,102 +325,174 @@ def _process_ndc_lookup(
         capture_rate: Capture rate as decimal (default 1.0 = 100%).
 
     Returns:
-        Results DataFrame with match status and margins.
+        Results DataFrame (Polars) with match status and numeric margin
+        columns; money columns are formatted only at display time.
     """
-    # Build catalog lookup by NDC
-    catalog_lookup = _build_catalog_lookup(catalog)
+    catalog_frame = _build_catalog_frame(catalog)
+    nadac_frame = _build_nadac_frame(nadac) if nadac is not None else None
 
-    # Build NADAC lookup if available
-    nadac_lookup = _build_nadac_lookup(nadac) if nadac is not None else {}
+    input_lf = (
+        input_df.lazy()
+        if isinstance(input_df, pl.DataFrame)
+        else pl.from_pandas(input_df).lazy()
+    )
 
-    results = []
+    def text(col: str, default: str = "") -> pl.Expr:
+        if col not in input_df.columns:
+            return pl.lit(default)
+        return pl.col(col).cast(pl.Utf8).fill_null(default).str.strip_chars()
 
-    for _, row in input_df.iterrows():
-        input_name = str(row.get("Drug Description", "")).strip()
-        raw_ndc = row.get("NDC11", "")
-        drug_type = str(row.get("Type", "BRAND")).upper().strip()
-        expected_desc = str(row.get("Product Description", "")).strip()
-        hcpcs = str(row.get("HCPCS", "")).strip() if pd.notna(row.get("HCPCS")) else ""
+    raw_ndc = (
+        pl.col("NDC11").cast(pl.Utf8).fill_null("")
+        if "NDC11" in input_df.columns
+        else pl.lit("")
+    )
 
+    lf = (
+        input_lf
+        .select(
+            input_name=text("Drug Description"),
+            raw_ndc=raw_ndc.str.strip_chars().str.to_uppercase(),
+            # Small fixed alphabet (BRAND/SPECIALTY/GENERIC): categorical
+            # storage dedupes the strings and downstream comparisons run
+            # on integer codes
+            drug_type=text("Type", "BRAND").str.to_uppercase()
+            .cast(pl.Categorical),
+            hcpcs=text("HCPCS"),
+        )
         # Skip header-like rows (NDC contains no digits or is a column name)
-        raw_ndc_str = str(raw_ndc).upper().strip()
-        if not any(c.isdigit() for c in raw_ndc_str) or raw_ndc_str in (
-            "NDC", "NDC11", "NDC_CODE", "NDC CODE"
-        ):
-            logger.debug(f"Skipping header-like row: {raw_ndc_str}")
-            continue
+        .filter(
+            pl.col("raw_ndc").str.contains(r"[0-9]")
+            & ~pl.col("raw_ndc").is_in(["NDC", "NDC11", "NDC_CODE", "NDC CODE"])
+        )
+        .with_columns(
+            ndc11=pl.col("raw_ndc").str.replace_all(r"[^0-9]", "").str.zfill(11)
+        )
+        .join(catalog_frame.lazy(), on="ndc11", how="left")
+    )
 
-        # Normalize NDC
-        ndc11 = _normalize_ndc(raw_ndc)
+    if nadac_frame is not None:
+        lf = lf.join(nadac_frame.lazy(), on="ndc11", how="left")
+    else:
+        lf = lf.with_columns(nadac_price=pl.lit(None, dtype=pl.Float64))
 
-        # Look up in catalog
-        catalog_data = catalog_lookup.get(ndc11)
+    # Match status from first-word (trade name) comparison. The catalog
+    # and generic trade names come precomputed from the cached catalog
+    # frame; only the input side is extracted per batch.
+    input_trade = (
+        pl.col("input_name").str.to_uppercase().str.extract(r"^(\S+)", 1)
+    )
+    catalog_trade = pl.col("catalog_trade")
+    generic_trade = pl.col("generic_trade")
+    ndc_found = pl.col("catalog_name").is_not_null()
+    trade_matches = (
+        input_trade.is_not_null() & (input_trade == catalog_trade)
+    ).fill_null(False)
+    generic_matches = (
+        input_trade.is_not_null() & (input_trade == generic_trade)
+    ).fill_null(False)
+
+    match_status = (
+        pl.when(~ndc_found)
+        .then(pl.lit("NDC NOT FOUND"))
+        .when(
+            (pl.col("catalog_name").fill_null("") == "")
+            & (pl.col("generic_name").fill_null("") == "")
+        )
+        .then(pl.lit("NO CATALOG NAME"))
+        .when(trade_matches)
+        .then(pl.lit("MATCH"))
+        .when(generic_matches)
+        .then(pl.lit("MATCH (GENERIC)"))
+        .otherwise(pl.lit("MISMATCH - VERIFY"))
+    )
 
-        # Look up NADAC price
-        nadac_price = nadac_lookup.get(ndc11)
+    # Pharmacy margins as float64 expressions.
+    # Medicaid: ((NADAC x Pkg Size) + Dispense Fee) x (1 + Markup%) x Capture - Cost
+    # Medicare/Commercial: AWP x (1 - Discount%) x Capture - Cost
+    # NADAC is per-unit; Contract Cost is per-package.
+    fee = float(dispense_fee)
+    markup = 1.0 + float(medicaid_markup)
+    awp_multiplier = 1.0 - float(awp_discount)
+    capture = float(capture_rate)
+
+    medicaid_margin = (
+        (pl.col("nadac_price") * pl.col("package_size") + fee) * markup * capture
+        - pl.col("contract_cost")
+    )
+    medicare_margin = (
+        pl.col("awp") * awp_multiplier * capture - pl.col("contract_cost")
+    )
 
-        if catalog_data:
-            catalog_name = catalog_data.get("drug_name", "")
-            generic_name = catalog_data.get("generic_name", "")
-            contract_cost = catalog_data.get("contract_cost")
-            awp = catalog_data.get("awp")
-            package_size = catalog_data.get("package_size", Decimal("1"))
+    result = lf.with_columns(
+        match_status=match_status,
+        medicaid_margin=medicaid_margin,
+        medicare_margin=medicare_margin,
+    ).collect()
+
+    # Fuzzy fallback for the (small) mismatch subset: token_set_ratio
+    # tolerates word reordering and packaging suffixes that trip the exact
+    # trade-name compare ("HUMIRA PEN 40MG" vs "HUMIRA PEN KT 40MG/0.8ML")
+    statuses = result["match_status"].to_list()
+    if "MISMATCH - VERIFY" in statuses:
+        # Only the mismatch rows leave the frame; large clean batches
+        # don't pay for whole-column list conversions
+        mismatch_rows = (
+            result.with_row_index()
+            .filter(pl.col("match_status") == "MISMATCH - VERIFY")
+            .select("index", "input_name", "catalog_name", "generic_name")
+        )
 
-            # Determine match status (checks both Product Description and Generic Name)
-            match_status, is_match = _determine_match_status(
-                input_name, catalog_name, generic_name, True
+        for idx, input_name, catalog_name, generic_name in (
+            mismatch_rows.iter_rows()
+        ):
+            query = input_name.upper()
+            score = max(
+                fuzz.token_set_ratio(query, (catalog_name or "").upper()),
+                fuzz.token_set_ratio(query, (generic_name or "").upper()),
             )
+            if score >= FUZZY_MATCH_THRESHOLD:
+                statuses[idx] = "MATCH (FUZZY)"
+
+    result = result.with_columns(match_status=pl.Series(statuses))
+
+    # Floor negative/missing Medicaid margins to $0.00 only when the
+    # Medicare/Commercial margin is available, as before — but keep the
+    # columns numeric; currency formatting happens at display time
+    medicaid_out = (
+        pl.when(pl.col("medicare_margin").is_not_null())
+        .then(pl.col("medicaid_margin").fill_null(0.0).clip(lower_bound=0.0))
+        .otherwise(pl.col("medicaid_margin"))
+    )
 
-            # Calculate margins if we have pricing
-            # Note: NADAC is per-unit, so multiply by package_size for per-package comparison
-            medicaid_margin, medicare_commercial_margin = _calculate_pharmacy_margins(
-                contract_cost=contract_cost,
-                awp=awp,
-                nadac_price=nadac_price,
-                drug_type=drug_type,
-                package_size=package_size,
-                dispense_fee=dispense_fee,
-                medicaid_markup=medicaid_markup,
-                awp_discount=awp_discount,
-                capture_rate=capture_rate,
-            )
-        else:
-            catalog_name = ""
-            contract_cost = None
-            awp = None
-            match_status, is_match = _determine_match_status(
-                input_name, None, None, False
-            )
-            medicaid_margin = None
-            medicare_commercial_margin = None
+    return result.select(
+        pl.col("input_name").alias("Input Drug Name"),
+        pl.col("ndc11").alias("NDC11"),
+        pl.col("hcpcs").alias("HCPCS"),
+        pl.col("match_status").alias("Match Status"),
+        pl.col("catalog_name").fill_null("").alias("Catalog Description"),
+        pl.col("drug_type").alias("Type"),
+        pl.col("contract_cost").round(2).alias("Contract Cost"),
+        pl.col("awp").round(2).alias("AWP"),
+        medicaid_out.round(2).alias("Pharmacy Medicaid Margin"),
+        pl.col("medicare_margin")
+        .round(2)
+        .alias("Pharmacy Medicare/Commercial Margin"),
+    )
 
-        # Floor negative/N/A Medicaid margins to $0.00 only if Medicare/Commercial is available
-        if medicare_commercial_margin is not None:
-            medicaid_display = _format_currency_floor_zero(medicaid_margin)
-        else:
-            medicaid_display = _format_currency(medicaid_margin)
-
-        results.append({
-            "Input Drug Name": input_name,
-            "NDC11": ndc11,
-            "HCPCS": hcpcs,
-            "Match Status": match_status,
-            "Catalog Description": catalog_name,
-            "Type": drug_type,
-            "Contract Cost": _format_currency(contract_cost),
-            "AWP": _format_currency(awp),
-            "Pharmacy Medicaid Margin": medicaid_display,
-            "Pharmacy Medicare/Commercial Margin": _format_currency(
-                medicare_commercial_margin
-            ),
-        })
-
-    return pd.DataFrame(results)
+
+@lru_cache(maxsize=32)
+def _casefolded_columns(columns: tuple[str, ...]) -> dict[str, str]:
+    """Uppercase-to-original column mapping, shared across _find_column calls."""
+    return {c.upper(): c for c in columns}
 
 
 def _find_column(columns: list[str], *candidates: str) -> str | None:
     """Find a column name from a list of candidates (case-insensitive).
 
+    The case-folded mapping is memoized per column tuple, so the many
+    _find_column calls against the same frame share one dict build.
+
     Args:
         columns: List of available column names.
         candidates: Possible column names to search for.
@@ -493,23 +500,54 @@ def _find_column(columns: list[str], *candidates: str) -> str | None:
     Returns:
         Matching column name or None.
     """
-    columns_upper = {c.upper(): c for c in columns}
+    columns_upper = _casefolded_columns(tuple(columns))
     for candidate in candidates:
         if candidate.upper() in columns_upper:
             return columns_upper[candidate.upper()]
     return None
 
 
-def _build_catalog_lookup(catalog: pl.DataFrame) -> dict[str, dict]:
-    """Build lookup dictionary from catalog by NDC.
+# Built join sides keyed by frame identity with the frame pinned in the
+# value (the pattern used by the risk-module caches), so repeated
+# "Calculate Margins" clicks reuse them for unchanged uploads
+_CATALOG_FRAME_CACHE: dict[int, tuple[pl.DataFrame, pl.DataFrame]] = {}
+_NADAC_FRAME_CACHE: dict[int, tuple[pl.DataFrame, pl.DataFrame]] = {}
+_FRAME_CACHE_MAX = 4
+
+
+def _build_catalog_frame(catalog: pl.DataFrame) -> pl.DataFrame:
+    """Build the catalog side of the lookup join, one row per NDC.
+
+    Column detection stays case-insensitive via _find_column; NDC
+    normalization and the numeric coercions run columnwise, and the
+    "keep the lowest contract cost" dedup from the old dict builder is a
+    stable sort (nulls last) plus unique keep-first, so ties keep the
+    earliest catalog row. The result is memoized per catalog identity.
 
     Args:
         catalog: Product catalog DataFrame.
 
     Returns:
-        Dictionary mapping NDC11 to catalog data.
+        DataFrame with columns ndc11, catalog_name, generic_name,
+        catalog_trade, generic_trade, contract_cost, awp, package_size
+        (floats; one row per NDC11).
     """
-    lookup = {}
+    cached = _CATALOG_FRAME_CACHE.get(id(catalog))
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+
+    empty = pl.DataFrame(
+        schema={
+            "ndc11": pl.Utf8,
+            "catalog_name": pl.Utf8,
+            "generic_name": pl.Utf8,
+            "catalog_trade": pl.Utf8,
+            "generic_trade": pl.Utf8,
+            "contract_cost": pl.Float64,
+            "awp": pl.Float64,
+            "package_size": pl.Float64,
+        }
+    )
 
     # Find column names (case-insensitive)
     ndc_col = _find_column(catalog.columns, "NDC", "NDC11", "NDC Code")
@@ -521,85 +559,80 @@ def _build_catalog_lookup(catalog: pl.DataFrame) -> dict[str, dict]:
 
     if not ndc_col:
         logger.error(f"NDC column not found in catalog. Available: {catalog.columns}")
-        return lookup
+        return empty
 
     logger.info(f"Using columns: NDC={ndc_col}, Name={name_col}, Generic={generic_col}, Cost={cost_col}, AWP={awp_col}, PkgSize={pkg_size_col}")
 
-    for row in catalog.iter_rows(named=True):
-        raw_ndc = row.get(ndc_col, "")
-        ndc11 = _normalize_ndc(raw_ndc)
-
-        if not ndc11:
-            continue
-
-        # Get values
-        drug_name = str(row.get(name_col, "")) if name_col else ""
-        generic_name = str(row.get(generic_col, "")) if generic_col else ""
-        contract_cost = row.get(cost_col) if cost_col else None
-        awp = row.get(awp_col) if awp_col else None
-        package_size = row.get(pkg_size_col) if pkg_size_col else None
-
-        # Convert to Decimal if numeric
-        if contract_cost is not None:
-            try:
-                contract_cost = Decimal(str(contract_cost))
-            except (ValueError, TypeError, InvalidOperation):
-                contract_cost = None
-
-        if awp is not None:
-            try:
-                awp = Decimal(str(awp))
-            except (ValueError, TypeError, InvalidOperation):
-                awp = None
-
-        if package_size is not None:
-            try:
-                package_size = Decimal(str(package_size))
-                if package_size <= 0:
-                    package_size = Decimal("1")
-            except (ValueError, TypeError, InvalidOperation):
-                package_size = Decimal("1")
-        else:
-            package_size = Decimal("1")
-
-        # Store first occurrence (or best price)
-        if ndc11 not in lookup:
-            lookup[ndc11] = {
-                "drug_name": drug_name,
-                "generic_name": generic_name,
-                "contract_cost": contract_cost,
-                "awp": awp,
-                "package_size": package_size,
-            }
-        else:
-            # Keep the one with lower contract cost (best 340B price)
-            existing_cost = lookup[ndc11].get("contract_cost")
-            if (
-                contract_cost is not None
-                and (existing_cost is None or contract_cost < existing_cost)
-            ):
-                lookup[ndc11] = {
-                    "drug_name": drug_name,
-                    "generic_name": generic_name,
-                    "contract_cost": contract_cost,
-                    "awp": awp,
-                    "package_size": package_size,
-                }
-
-    logger.info(f"Built catalog lookup with {len(lookup)} unique NDCs")
-    return lookup
-
-
-def _build_nadac_lookup(nadac: pl.DataFrame) -> dict[str, Decimal]:
-    """Build NADAC price lookup by NDC.
+    def text(col: str | None) -> pl.Expr:
+        if col is None:
+            return pl.lit("")
+        return pl.col(col).cast(pl.Utf8).fill_null("")
+
+    def numeric(col: str | None) -> pl.Expr:
+        if col is None:
+            return pl.lit(None, dtype=pl.Float64)
+        return pl.col(col).cast(pl.Float64, strict=False)
+
+    frame = (
+        catalog.lazy()
+        .select(
+            ndc11=pl.col(ndc_col)
+            .cast(pl.Utf8)
+            .str.replace_all(r"[^0-9]", "")
+            .str.zfill(11),
+            catalog_name=text(name_col),
+            generic_name=text(generic_col),
+            contract_cost=numeric(cost_col),
+            awp=numeric(awp_col),
+            package_size=numeric(pkg_size_col),
+        )
+        .filter(pl.col("ndc11").is_not_null() & (pl.col("ndc11") != ""))
+        .with_columns(
+            package_size=pl.when(
+                pl.col("package_size").is_null() | (pl.col("package_size") <= 0)
+            )
+            .then(1.0)
+            .otherwise(pl.col("package_size")),
+            # Trade names (first word) precomputed once per catalog so the
+            # per-batch match only extracts the input side
+            catalog_trade=pl.col("catalog_name")
+            .str.strip_chars()
+            .str.to_uppercase()
+            .str.extract(r"^(\S+)", 1),
+            generic_trade=pl.col("generic_name")
+            .str.strip_chars()
+            .str.to_uppercase()
+            .str.extract(r"^(\S+)", 1),
+        )
+        # Keep the best 340B price per NDC (lowest contract cost)
+        .sort("contract_cost", nulls_last=True, maintain_order=True)
+        .unique(subset="ndc11", keep="first", maintain_order=True)
+        .collect()
+    )
+
+    logger.info(f"Built catalog frame with {frame.height} unique NDCs")
+
+    if len(_CATALOG_FRAME_CACHE) >= _FRAME_CACHE_MAX:
+        _CATALOG_FRAME_CACHE.pop(next(iter(_CATALOG_FRAME_CACHE)))
+    _CATALOG_FRAME_CACHE[id(catalog)] = (catalog, frame)
+
+    return frame
+
+
+def _build_nadac_frame(nadac: pl.DataFrame) -> pl.DataFrame:
+    """Build the NADAC side of the join: NDC11 to per-unit price.
 
     Args:
         nadac: NADAC pricing DataFrame.
 
     Returns:
-        Dictionary mapping NDC11 to NADAC price.
+        DataFrame with columns ndc11, nadac_price (float64).
     """
-    lookup = {}
+    cached = _NADAC_FRAME_CACHE.get(id(nadac))
+    if cached is not None and cached[0] is nadac:
+        return cached[1]
+
+    empty = pl.DataFrame(schema={"ndc11": pl.Utf8, "nadac_price": pl.Float64})
 
     logger.info(f"NADAC columns available: {nadac.columns}")
 
@@ -621,143 +654,70 @@ def _build_nadac_lookup(nadac: pl.DataFrame) -> dict[str, Decimal]:
     if not ndc_col or not price_col:
         logger.warning(f"NADAC columns not found. NDC col: {ndc_col}, Price col: {price_col}")
         logger.warning(f"Available columns: {nadac.columns}")
-        return lookup
+        return empty
 
     logger.info(f"Using NADAC columns: NDC={ndc_col}, Price={price_col}")
 
-    for row in nadac.iter_rows(named=True):
-        raw_ndc = row.get(ndc_col, "")
-        ndc11 = _normalize_ndc(raw_ndc)
-
-        if not ndc11:
-            continue
-
-        price = row.get(price_col)
-        if price is not None:
-            try:
-                lookup[ndc11] = Decimal(str(price))
-            except (ValueError, TypeError, InvalidOperation):
-                continue
-
-    logger.info(f"Built NADAC lookup with {len(lookup)} NDCs")
-    return lookup
-
-
-def _calculate_pharmacy_margins(
-    contract_cost: Decimal | None,
-    awp: Decimal | None,
-    nadac_price: Decimal | None,
-    drug_type: str,
-    package_size: Decimal = Decimal("1"),
-    dispense_fee: Decimal = Decimal("0"),
-    medicaid_markup: Decimal = Decimal("0"),
-    awp_discount: Decimal = Decimal("0.15"),
-    capture_rate: Decimal = Decimal("1"),
-) -> tuple[Decimal | None, Decimal | None]:
-    """Calculate pharmacy channel margins.
-
-    Pharmacy Medicaid: ((NADAC × Pkg Size) + Dispense Fee) × (1 + Markup%) × Capture Rate - Contract Cost
-    Pharmacy Medicare/Commercial: AWP × (1 - Discount%) × Capture Rate - Contract Cost
-
-    Note: NADAC is per-unit price, Contract Cost is per-package.
-    We multiply NADAC by package_size to get per-package NADAC.
-
-    Args:
-        contract_cost: 340B acquisition cost (per package).
-        awp: Average Wholesale Price (per package).
-        nadac_price: NADAC price per unit.
-        drug_type: BRAND, SPECIALTY, or GENERIC.
-        package_size: Number of units per package (default 1).
-        dispense_fee: Dispense fee to add (default $0).
-        medicaid_markup: Medicaid markup as decimal (default 0).
-        awp_discount: AWP discount as decimal (default 0.15 = 15%).
-        capture_rate: Capture rate as decimal (default 1.0 = 100%).
-
-    Returns:
-        Tuple of (medicaid_margin, medicare_commercial_margin).
-    """
-    # Pharmacy Medicaid: ((NADAC × Pkg Size) + Dispense Fee) × (1 + Markup%) × Capture Rate - Contract Cost
-    if contract_cost is not None and nadac_price is not None:
-        nadac_per_package = nadac_price * package_size
-        base = nadac_per_package + dispense_fee
-        revenue = base * (Decimal("1") + medicaid_markup)
-        medicaid_margin = (revenue * capture_rate) - contract_cost
-    else:
-        medicaid_margin = None
-
-    # Pharmacy Medicare/Commercial: AWP × (1 - Discount%) × Capture Rate - Contract Cost
-    if contract_cost is not None and awp is not None:
-        # Apply AWP discount (e.g., 15% discount = multiply by 0.85)
-        awp_multiplier = Decimal("1") - awp_discount
-        revenue = awp * awp_multiplier
-        medicare_commercial_margin = (revenue * capture_rate) - contract_cost
-    else:
-        medicare_commercial_margin = None
-
-    return medicaid_margin, medicare_commercial_margin
-
-
-def _format_currency(value: Decimal | None) -> str:
-    """Format value as currency string.
-
-    Args:
-        value: Decimal value or None.
-
-    Returns:
-        Formatted string like "$1,234.56" or "N/A".
-    """
-    if value is None:
-        return "N/A"
-
-    try:
-        return f"${float(value):,.2f}"
-    except (ValueError, TypeError):
-        return "N/A"
-
-
-def _format_currency_floor_zero(value: Decimal | None) -> str:
-    """Format value as currency, flooring negative/None to $0.00.
+    frame = (
+        nadac.lazy()
+        .select(
+            ndc11=pl.col(ndc_col)
+            .cast(pl.Utf8)
+            .str.replace_all(r"[^0-9]", "")
+            .str.zfill(11),
+            nadac_price=pl.col(price_col).cast(pl.Float64, strict=False),
+        )
+        .filter(
+            pl.col("ndc11").is_not_null()
+            & (pl.col("ndc11") != "")
+            & pl.col("nadac_price").is_not_null()
+        )
+        # Later rows win, matching the dict-overwrite the loop had
+        .unique(subset="ndc11", keep="last", maintain_order=True)
+        .collect()
+    )
 
-    Args:
-        value: Decimal value or None.
+    logger.info(f"Built NADAC frame with {frame.height} NDCs")
 
-    Returns:
-        Formatted string like "$1,234.56" or "$0.00" if negative/None.
-    """
-    if value is None or value < 0:
-        return "$0.00"
+    if len(_NADAC_FRAME_CACHE) >= _FRAME_CACHE_MAX:
+        _NADAC_FRAME_CACHE.pop(next(iter(_NADAC_FRAME_CACHE)))
+    _NADAC_FRAME_CACHE[id(nadac)] = (nadac, frame)
 
-    try:
-        return f"${float(value):,.2f}"
-    except (ValueError, TypeError):
-        return "$0.00"
+    return frame
 
 
-def _render_summary_metrics(results_df: pd.DataFrame) -> None:
+def _render_summary_metrics(results_df: pl.DataFrame) -> None:
     """Render summary metrics for the results.
 
+    One value_counts pass over Match Status feeds both status metrics,
+    and the margin count comes from the column's null count — no
+    per-metric boolean-mask filters.
+
     Args:
         results_df: Results DataFrame.
     """
     col1, col2, col3, col4 = st.columns(4)
 
-    total = len(results_df)
+    total = results_df.height
+    status_counts: dict[str, int] = dict(
+        results_df["Match Status"].value_counts().iter_rows()
+    )
 
     with col1:
         st.metric("Total Drugs", total)
 
     with col2:
-        matches = len(results_df[results_df["Match Status"] == "MATCH"])
-        st.metric("Matches", matches)
+        st.metric("Matches", status_counts.get("MATCH", 0))
 
     with col3:
-        mismatches = len(
-            results_df[results_df["Match Status"].str.contains("MISMATCH|NOT FOUND")]
+        # Exact status membership, not a substring regex
+        mismatches = status_counts.get("MISMATCH - VERIFY", 0) + status_counts.get(
+            "NDC NOT FOUND", 0
         )
         st.metric("Mismatches", mismatches)
 
     with col4:
-        has_margin = len(
-            results_df[results_df["Pharmacy Medicare/Commercial Margin"] != "N/A"]
-        )
+        has_margin = total - results_df[
+            "Pharmacy Medicare/Commercial Margin"
+        ].null_count()
         st.metric("With Margins", has_margin)
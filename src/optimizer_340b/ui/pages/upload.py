@@ -9,10 +9,13 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-import polars as pl
 import streamlit as st
 
-from optimizer_340b.ingest.loaders import load_csv_to_polars, load_excel_to_polars
+from optimizer_340b.ingest.loaders import (
+    load_csv_to_polars,
+    load_excel_to_polars,
+    load_ravenswood_workbook,
+)
 from optimizer_340b.ingest.normalizers import (
     normalize_catalog,
     normalize_crosswalk,
@@ -107,17 +110,9 @@ def _load_sample_data() -> None:
     ravenswood_path = SAMPLE_DATA_DIR / "Ravenswood_AWP_Reimbursement_Matrix.xlsx"
     if ravenswood_path.exists():
         try:
-            # Load Drug Categories sheet
-            import pandas as pd
-
-            df_categories = load_excel_to_polars(
-                str(ravenswood_path), sheet_name="Drug Categories"
-            )
+            # Load both sheets from a single workbook open (calamine)
+            df_categories, df_summary = load_ravenswood_workbook(ravenswood_path)
             st.session_state.uploaded_data["ravenswood_categories"] = df_categories
-
-            # Load Summary sheet
-            pdf_summary = pd.read_excel(ravenswood_path, sheet_name="Summary")
-            df_summary = pl.from_pandas(pdf_summary.astype(str))
             st.session_state.uploaded_data["ravenswood_summary"] = df_summary
             logger.info(f"Loaded Ravenswood matrix: {df_categories.height} categories")
         except Exception as e:
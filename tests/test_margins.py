@@ -8,6 +8,8 @@ These tests implement the Gatekeeper Tests from the Project Charter:
 
 from decimal import Decimal
 
+import pytest
+
 from optimizer_340b.compute.margins import (
     AWP_DISCOUNT_FACTOR,
     COMMERCIAL_ASP_MULTIPLIER,
@@ -16,9 +18,12 @@ from optimizer_340b.compute.margins import (
     analyze_drug_margin,
     analyze_drug_with_payer,
     calculate_commercial_margin,
+    calculate_commercial_margin_fast,
     calculate_margin_sensitivity,
     calculate_medicare_margin,
+    calculate_medicare_margin_fast,
     calculate_retail_margin,
+    calculate_retail_margin_fast,
     determine_recommendation,
 )
 from optimizer_340b.models import Drug, RecommendedPath
@@ -185,6 +190,33 @@ class TestCommercialMargin:
         assert result is None
 
 
+class TestFastScalarKernels:
+    """Tests for the float fast-path margin kernels."""
+
+    def test_retail_fast_matches_decimal(self, sample_drug: Drug) -> None:
+        """Float retail kernel should match the Decimal path."""
+        _, net = calculate_retail_margin(sample_drug, Decimal("0.45"))
+        fast = calculate_retail_margin_fast(6500.00, 150.00, 0.45)
+
+        assert fast == pytest.approx(float(net))
+
+    def test_medicare_fast_matches_decimal(self, sample_drug: Drug) -> None:
+        """Float Medicare kernel should match the Decimal path."""
+        expected = calculate_medicare_margin(sample_drug)
+        fast = calculate_medicare_margin_fast(2800.00, 150.00, 2)
+
+        assert expected is not None
+        assert fast == pytest.approx(float(expected))
+
+    def test_commercial_fast_matches_decimal(self, sample_drug: Drug) -> None:
+        """Float Commercial kernel should match the Decimal path."""
+        expected = calculate_commercial_margin(sample_drug)
+        fast = calculate_commercial_margin_fast(2800.00, 150.00, 2)
+
+        assert expected is not None
+        assert fast == pytest.approx(float(expected))
+
+
 class TestRecommendation:
     """Tests for pathway recommendation logic."""
 
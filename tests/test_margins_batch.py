@@ -0,0 +1,129 @@
+"""Tests for the vectorized batch margin engine."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from optimizer_340b.compute.margins import analyze_drug_margin
+from optimizer_340b.compute.margins_batch import (
+    MARGIN_DTYPE,
+    analyze_drugs_vectorized,
+    recommended_path_for_row,
+)
+from optimizer_340b.models import Drug, RecommendedPath
+
+
+class TestAnalyzeDrugsVectorized:
+    """Tests for analyze_drugs_vectorized()."""
+
+    def test_empty_input(self) -> None:
+        """Empty drug list should return an empty structured array."""
+        result = analyze_drugs_vectorized([])
+
+        assert result.dtype == MARGIN_DTYPE
+        assert len(result) == 0
+
+    def test_matches_decimal_path(self, sample_drug: Drug) -> None:
+        """Batch margins should match the Decimal engine to the cent.
+
+        HUMIRA test data:
+        Retail net = $6500 × 0.85 - $150 = $5375
+        Medicare = $2800 × 1.06 × 2 - $150 = $5786
+        Commercial = $2800 × 1.15 × 2 - $150 = $6290
+        """
+        result = analyze_drugs_vectorized([sample_drug])
+
+        assert result[0]["ndc"] == sample_drug.ndc
+        assert result[0]["retail_net"] == 5375.00
+        assert result[0]["medicare"] == 5786.00
+        assert result[0]["commercial"] == 6290.00
+
+    def test_retail_only_drug_has_nan_medical(
+        self, sample_drug_retail_only: Drug
+    ) -> None:
+        """Drugs without medical path should have NaN medical margins."""
+        result = analyze_drugs_vectorized([sample_drug_retail_only])
+
+        assert np.isnan(result[0]["medicare"])
+        assert np.isnan(result[0]["commercial"])
+        assert recommended_path_for_row(result[0]) == RecommendedPath.RETAIL
+
+    def test_recommendation_matches_per_drug_engine(
+        self, sample_drug: Drug, sample_drug_retail_only: Drug
+    ) -> None:
+        """Batch recommendation should agree with analyze_drug_margin()."""
+        drugs = [sample_drug, sample_drug_retail_only]
+        result = analyze_drugs_vectorized(drugs)
+
+        for row, drug in zip(result, drugs, strict=True):
+            expected = analyze_drug_margin(drug).recommended_path
+            assert recommended_path_for_row(row) == expected
+
+    def test_capture_rate_scales_retail(self, sample_drug: Drug) -> None:
+        """Retail net margin should scale linearly with capture rate."""
+        full = analyze_drugs_vectorized([sample_drug], capture_rate=1.0)
+        partial = analyze_drugs_vectorized([sample_drug], capture_rate=0.40)
+
+        assert partial[0]["retail_net"] == round(full[0]["retail_net"] * 0.40, 2)
+
+    def test_low_capture_rate_flips_recommendation(self, sample_drug: Drug) -> None:
+        """At 45% capture the commercial pathway should win for HUMIRA."""
+        result = analyze_drugs_vectorized([sample_drug], capture_rate=0.45)
+
+        assert recommended_path_for_row(result[0]) == (
+            RecommendedPath.COMMERCIAL_MEDICAL
+        )
+
+    def test_bulk_consistency(self) -> None:
+        """A mixed batch should produce one row per drug, in input order."""
+        drugs = [
+            Drug(
+                ndc=f"000000000{i:02d}",
+                drug_name=f"DRUG_{i}",
+                manufacturer="TEST",
+                contract_cost=Decimal("100.00"),
+                awp=Decimal(str(1000 + i * 100)),
+                asp=Decimal("500.00") if i % 2 == 0 else None,
+                hcpcs_code="J9999" if i % 2 == 0 else None,
+                bill_units_per_package=1,
+            )
+            for i in range(10)
+        ]
+
+        result = analyze_drugs_vectorized(drugs)
+
+        assert len(result) == 10
+        assert list(result["ndc"]) == [d.ndc for d in drugs]
+        # Odd-indexed drugs are retail-only
+        assert np.isnan(result["medicare"][1::2]).all()
+        assert np.isfinite(result["medicare"][::2]).all()
+
+
+class TestNumbaKernel:
+    """Tests for the optional fused numba kernel."""
+
+    def test_kernel_matches_numpy_path(self) -> None:
+        """Fused kernel should agree with the pure-NumPy formulas."""
+        margins_numba = pytest.importorskip(
+            "optimizer_340b.compute.margins_numba"
+        )
+
+        awp = np.array([6500.0, 100.0, 1000.0])
+        asp = np.array([2800.0, np.nan, 500.0])
+        contract_cost = np.array([150.0, 10.0, 100.0])
+        bill_units = np.array([2.0, 1.0, 10.0])
+
+        retail, medicare, commercial, recommended = margins_numba.batch_margins(
+            awp, asp, contract_cost, bill_units, 0.45
+        )
+
+        np.testing.assert_allclose(retail, (awp * 0.85 - contract_cost) * 0.45)
+        np.testing.assert_allclose(
+            medicare, asp * 1.06 * bill_units - contract_cost
+        )
+        np.testing.assert_allclose(
+            commercial, asp * 1.15 * bill_units - contract_cost
+        )
+        # Commercial wins where a medical path exists; retail otherwise
+        assert list(recommended) == [2, 0, 2]
@@ -0,0 +1,104 @@
+"""Tests for the Polars lazy margin pipeline."""
+
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.margins import analyze_drug_margin
+from optimizer_340b.compute.margins_pl import compute_margins_lazy
+from optimizer_340b.models import Drug
+
+
+def _catalog_frame(drugs: list[Drug]) -> pl.LazyFrame:
+    """Build a catalog LazyFrame from drugs for pipeline tests."""
+    return pl.LazyFrame(
+        {
+            "ndc": [d.ndc for d in drugs],
+            "awp": [float(d.awp) for d in drugs],
+            "contract_cost": [float(d.contract_cost) for d in drugs],
+            "asp": [
+                float(d.asp) if d.has_medical_path() else None for d in drugs
+            ],
+            "bill_units": [float(d.bill_units_per_package) for d in drugs],
+        }
+    )
+
+
+class TestComputeMarginsLazy:
+    """Tests for compute_margins_lazy()."""
+
+    def test_matches_scalar_engine(
+        self, sample_drug: Drug, sample_drug_retail_only: Drug
+    ) -> None:
+        """Pipeline margins should match analyze_drug_margin() per row."""
+        drugs = [sample_drug, sample_drug_retail_only]
+        result = compute_margins_lazy(_catalog_frame(drugs)).collect()
+
+        for row, drug in zip(result.iter_rows(named=True), drugs, strict=True):
+            expected = analyze_drug_margin(drug)
+            assert row["retail_net_margin"] == pytest.approx(
+                float(expected.retail_net_margin)
+            )
+            if expected.medicare_margin is None:
+                assert row["medicare_margin"] is None
+                assert row["commercial_margin"] is None
+            else:
+                assert row["medicare_margin"] == pytest.approx(
+                    float(expected.medicare_margin)
+                )
+                assert row["commercial_margin"] == pytest.approx(
+                    float(expected.commercial_margin)  # type: ignore[arg-type]
+                )
+            assert row["recommended_path"] == expected.recommended_path.value
+            assert row["margin_delta"] == pytest.approx(
+                float(expected.margin_delta)
+            )
+
+    def test_capture_rate_applied(self, sample_drug: Drug) -> None:
+        """Retail margin should scale with the capture rate."""
+        lf = _catalog_frame([sample_drug])
+        full = compute_margins_lazy(lf, capture_rate=1.0).collect()
+        partial = compute_margins_lazy(lf, capture_rate=0.40).collect()
+
+        assert partial["retail_net_margin"][0] == pytest.approx(
+            full["retail_net_margin"][0] * 0.40
+        )
+
+    def test_retail_only_recommends_retail(
+        self, sample_drug_retail_only: Drug
+    ) -> None:
+        """Rows without a medical path should recommend retail.
+
+        Delta falls back to the retail margin itself, matching
+        determine_recommendation().
+        """
+        result = compute_margins_lazy(
+            _catalog_frame([sample_drug_retail_only])
+        ).collect()
+
+        assert result["recommended_path"][0] == "RETAIL"
+        assert result["margin_delta"][0] == pytest.approx(
+            result["retail_net_margin"][0]
+        )
+
+    def test_streaming_collect(self) -> None:
+        """Pipeline should collect under the streaming engine."""
+        drugs = [
+            Drug(
+                ndc=f"000000000{i:02d}",
+                drug_name=f"DRUG_{i}",
+                manufacturer="TEST",
+                contract_cost=Decimal("100.00"),
+                awp=Decimal(str(1000 + i)),
+                asp=Decimal("500.00"),
+                hcpcs_code="J9999",
+            )
+            for i in range(50)
+        ]
+
+        result = compute_margins_lazy(_catalog_frame(drugs)).collect(
+            engine="streaming"
+        )
+
+        assert result.height == 50
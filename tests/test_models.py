@@ -2,9 +2,12 @@
 
 from decimal import Decimal
 
+import numpy as np
+
 from optimizer_340b.models import (
     DosingProfile,
     Drug,
+    DrugCatalog,
     MarginAnalysis,
     RecommendedPath,
     RiskLevel,
@@ -114,6 +117,37 @@ class TestDrug:
         assert drug.penny_pricing_flag is False
 
 
+class TestDrugCatalog:
+    """Tests for the structure-of-arrays catalog container."""
+
+    def test_from_drugs_packs_parallel_arrays(
+        self, sample_drug: Drug, sample_drug_retail_only: Drug
+    ) -> None:
+        """Catalog arrays should line up with input drugs in order."""
+        catalog = DrugCatalog.from_drugs([sample_drug, sample_drug_retail_only])
+
+        assert len(catalog) == 2
+        assert list(catalog.ndc) == [sample_drug.ndc, sample_drug_retail_only.ndc]
+        assert catalog.awp[0] == 6500.00
+        assert catalog.contract_cost[1] == 10.00
+        assert catalog.bill_units[0] == 2
+
+    def test_missing_medical_path_is_nan(
+        self, sample_drug_retail_only: Drug
+    ) -> None:
+        """Drugs without ASP/HCPCS should get NaN ASP and False flag."""
+        catalog = DrugCatalog.from_drugs([sample_drug_retail_only])
+
+        assert np.isnan(catalog.asp[0])
+        assert not catalog.has_medical_path[0]
+
+    def test_empty_catalog(self) -> None:
+        """Empty drug list should produce a zero-length catalog."""
+        catalog = DrugCatalog.from_drugs([])
+
+        assert len(catalog) == 0
+
+
 class TestDosingProfile:
     """Tests for DosingProfile model."""
 
@@ -244,6 +278,26 @@ class TestMarginAnalysis:
         assert result["asp"] is None
 
 
+class TestBatchToRecords:
+    """Tests for columnar bulk serialization of analyses."""
+
+    def test_batch_matches_display_dict(
+        self, sample_margin_analysis: MarginAnalysis
+    ) -> None:
+        """Batch table rows should match to_display_dict() output."""
+        df = MarginAnalysis.batch_to_records([sample_margin_analysis])
+
+        expected = sample_margin_analysis.to_display_dict()
+        assert df.height == 1
+        assert df.row(0, named=True) == expected
+
+    def test_batch_empty_list(self) -> None:
+        """Empty input should produce an empty DataFrame."""
+        df = MarginAnalysis.batch_to_records([])
+
+        assert df.height == 0
+
+
 class TestEnums:
     """Tests for enum types."""
 
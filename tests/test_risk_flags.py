@@ -405,3 +405,29 @@ class TestEdgeCases:
 
         # Should find the normalized version 0074433902
         assert status.ndc == "0074-4339-02"
+
+
+class TestFilterTopOpportunitiesDf:
+    """Tests for the frame-native opportunity filter."""
+
+    def test_excludes_by_flag_and_set(self) -> None:
+        """Should exclude rows by penny flag or NDC membership."""
+        from optimizer_340b.risk.penny_pricing import filter_top_opportunities_df
+
+        opportunities = pl.DataFrame({
+            "ndc": ["AAA", "BBB", "CCC"],
+            "margin": [1000, 5000, 2000],
+            "penny_pricing": [False, True, False],
+        })
+
+        filtered = filter_top_opportunities_df(opportunities, {"CCC"})
+
+        assert filtered["ndc"].to_list() == ["AAA"]
+
+    def test_empty_frame_passthrough(self) -> None:
+        """Empty input frame should be returned unchanged."""
+        from optimizer_340b.risk.penny_pricing import filter_top_opportunities_df
+
+        empty = pl.DataFrame({"ndc": [], "margin": []})
+
+        assert filter_top_opportunities_df(empty).is_empty()